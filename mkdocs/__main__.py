@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import contextlib
 import logging
 import os
 import shutil
@@ -12,7 +13,8 @@ import warnings
 
 import click
 
-from mkdocs import __version__, config, utils
+from mkdocs import __version__, config, livereload, utils
+from mkdocs.utils import profiling
 
 if sys.platform.startswith("win"):
     try:
@@ -117,10 +119,47 @@ strict_help = "Enable strict mode. This will cause MkDocs to abort the build on
 theme_help = "The theme to use when building your documentation."
 theme_choices = sorted(utils.get_theme_names())
 site_dir_help = "The directory to output the result of the documentation build."
+jobs_help = (
+    "The number of processes to use for rendering the Markdown of pages, "
+    "and of threads for copying static files (default: 1)."
+)
+profile_help = (
+    "Measure how long each phase of the build, each plugin and each page takes. "
+    "Print a summary and write the full report as JSON to the given file."
+)
+trace_help = (
+    "Write the timeline of the build to the given file, in the Trace Event Format "
+    "that can be viewed in https://ui.perfetto.dev/ or chrome://tracing."
+)
+render_cache_help = (
+    "Keep the rendered Markdown of pages in '.cache/mkdocs/render/' and reuse it "
+    "for pages that didn't change since a previous build. Not used with Markdown extensions "
+    "that include other files, such as pymdownx.snippets."
+)
+write_if_changed_help = (
+    "Don't remove old files from the site_dir, and only write the files whose content changed. "
+    "Unchanged files keep their modification time."
+)
+copy_strategy_help = (
+    "How to copy static files to the site_dir: a regular copy, a reflink (copy-on-write clone) "
+    "or a hard link, falling back to a copy when not supported (overrides the config)."
+)
+prune_help = (
+    "Don't remove old files from the site_dir before building, but remove the files "
+    "that the build didn't produce or modify after it finishes."
+)
+template_cache_help = (
+    "Keep the compiled theme templates in '.cache/mkdocs/templates/' and reuse them "
+    "in the next builds (this is the default)."
+)
+low_memory_help = (
+    "Keep the Markdown and the HTML of pages in a temporary file instead of in memory, "
+    "for sites too large to build otherwise."
+)
 use_directory_urls_help = "Use directory URLs when building pages (the default)."
 reload_help = "Enable the live reloading in the development server (this is the default)"
 no_reload_help = "Disable the live reloading in the development server."
-serve_dirty_help = "Only re-build files that have changed."
+serve_dirty_help = "Only re-build the pages that are affected by the changed files."
 serve_clean_help = (
     "Build the site without any effects of `mkdocs serve` - pure `mkdocs build`, then serve."
 )
@@ -146,6 +185,14 @@ watch_theme_help = (
 )
 shell_help = "Use the shell when invoking Git."
 watch_help = "A directory or file to watch for live reloading. Can be supplied multiple times."
+serve_in_memory_help = (
+    "Keep the built site in memory and serve it from there, instead of writing it to a "
+    "temporary directory."
+)
+watcher_help = (
+    "How to detect file changes: native events where they are reliable, polling elsewhere "
+    "(the default), native events everywhere, or polling everywhere."
+)
 projects_file_help = (
     "URL or local path of the registry file that declares all known MkDocs-related projects."
 )
@@ -262,6 +309,10 @@ def cli():
 @click.option(
     '-w', '--watch', help=watch_help, type=click.Path(exists=True), multiple=True, default=[]
 )
+@click.option(
+    '--watcher', type=click.Choice(livereload.WATCHERS), default='auto', help=watcher_help
+)
+@click.option('--in-memory', is_flag=True, help=serve_in_memory_help)
 @common_config_options
 @common_options
 def serve_command(**kwargs):
@@ -276,18 +327,60 @@ def serve_command(**kwargs):
 @click.option('-c', '--clean/--dirty', is_flag=True, default=True, help=clean_help)
 @common_config_options
 @click.option('-d', '--site-dir', type=click.Path(), help=site_dir_help)
+@click.option('-j', '--jobs', type=click.IntRange(min=1), default=1, help=jobs_help)
+@click.option('--render-cache', is_flag=True, help=render_cache_help)
+@click.option(
+    '--profile', 'profile_file', type=click.Path(dir_okay=False), metavar='FILE', help=profile_help
+)
+@click.option(
+    '--trace', 'trace_file', type=click.Path(dir_okay=False), metavar='FILE', help=trace_help
+)
+@click.option('--write-if-changed', is_flag=True, help=write_if_changed_help)
+@click.option('--prune', is_flag=True, help=prune_help)
+@click.option('--template-cache/--no-template-cache', default=True, help=template_cache_help)
+@click.option('--low-memory', is_flag=True, help=low_memory_help)
+@click.option(
+    '--copy-strategy', type=click.Choice(utils.filecopy.COPY_STRATEGIES), help=copy_strategy_help
+)
 @common_options
-def build_command(clean, **kwargs):
+def build_command(
+    clean,
+    jobs,
+    render_cache,
+    profile_file,
+    trace_file,
+    write_if_changed,
+    prune,
+    template_cache,
+    low_memory,
+    **kwargs,
+):
     """Build the MkDocs documentation."""
     from mkdocs.commands import build
 
     _enable_warnings()
-    cfg = config.load_config(**kwargs)
+    profiler = profiling.Profiler() if profile_file or trace_file else None
+    with profiler.span('phase', 'load_config') if profiler else contextlib.nullcontext():
+        cfg = config.load_config(**kwargs)
     cfg.plugins.on_startup(command='build', dirty=not clean)
     try:
-        build.build(cfg, dirty=not clean)
+        build.build(
+            cfg,
+            dirty=not clean,
+            jobs=jobs,
+            render_cache=render_cache,
+            profiler=profiler,
+            write_if_changed=write_if_changed,
+            prune=prune,
+            template_cache=template_cache,
+            low_memory=low_memory,
+        )
     finally:
         cfg.plugins.on_shutdown()
+    if profile_file:
+        profiling.save_report(profiler, profile_file)
+    if trace_file:
+        profiling.save_trace(profiler, trace_file)
 
 
 @cli.command(name="gh-deploy")
@@ -299,11 +392,21 @@ def build_command(clean, **kwargs):
 @click.option('--no-history', is_flag=True, help=no_history_help)
 @click.option('--ignore-version', is_flag=True, help=ignore_version_help)
 @click.option('--shell', is_flag=True, help=shell_help)
+@click.option('--template-cache/--no-template-cache', default=True, help=template_cache_help)
 @common_config_options
 @click.option('-d', '--site-dir', type=click.Path(), help=site_dir_help)
 @common_options
 def gh_deploy_command(
-    clean, message, remote_branch, remote_name, force, no_history, ignore_version, shell, **kwargs
+    clean,
+    message,
+    remote_branch,
+    remote_name,
+    force,
+    no_history,
+    ignore_version,
+    shell,
+    template_cache,
+    **kwargs,
 ):
     """Deploy your documentation to GitHub Pages."""
     from mkdocs.commands import build, gh_deploy
@@ -312,7 +415,7 @@ def gh_deploy_command(
     cfg = config.load_config(remote_branch=remote_branch, remote_name=remote_name, **kwargs)
     cfg.plugins.on_startup(command='gh-deploy', dirty=not clean)
     try:
-        build.build(cfg, dirty=not clean)
+        build.build(cfg, dirty=not clean, template_cache=template_cache)
     finally:
         cfg.plugins.on_shutdown()
     gh_deploy.gh_deploy(
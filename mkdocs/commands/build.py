@@ -1,13 +1,24 @@
 from __future__ import annotations
 
+import collections
+import concurrent.futures
+import contextlib
+import copy
 import gzip
+import hashlib
+import io
+import json
 import logging
 import os
+import pickle
+import tempfile
+import threading
 import time
-from typing import TYPE_CHECKING, Sequence
+from typing import TYPE_CHECKING, Any, Callable, Collection, ContextManager, Iterator, Sequence
 from urllib.parse import urljoin, urlsplit
 
 import jinja2
+import markdown
 from jinja2.exceptions import TemplateNotFound
 
 import mkdocs
@@ -16,11 +27,17 @@ from mkdocs.exceptions import Abort, BuildError
 from mkdocs.structure.files import File, Files, InclusionLevel, get_files, set_exclusions
 from mkdocs.structure.nav import Navigation, get_navigation
 from mkdocs.structure.pages import Page
+from mkdocs.structure.toc import AnchorLink, get_toc
 from mkdocs.utils import DuplicateFilter  # noqa: F401 - legacy re-export
 from mkdocs.utils import templates
+from mkdocs.utils.cache import get_project_cache_dir
+from mkdocs.utils.output import OutputManifest
+from mkdocs.utils.yaml import _DirPlaceholder
 
 if TYPE_CHECKING:
     from mkdocs.config.defaults import MkDocsConfig
+    from mkdocs.structure import StructureItem
+    from mkdocs.utils.profiling import Profiler
 
 
 log = logging.getLogger(__name__)
@@ -34,32 +51,89 @@ def get_context(
     base_url: str = '',
 ) -> templates.TemplateContext:
     """Return the template context for a given page or template."""
-    if page is not None:
-        base_url = utils.get_relative_url('.', page.url)
+    return _SiteContext(nav, files, config).get_context(page, base_url)
+
+
+class _SiteContext:
+    """
+    The values of the template context that are the same for every page of a build.
+
+    They're computed once, and `get_context` only adds the values specific to each page. The
+    relative URLs of `extra_css` and `extra_javascript` are computed once for each group of pages
+    that get the same ones, which is usually all the pages at the same directory depth.
+    """
+
+    def __init__(
+        self, nav: Navigation, files: Sequence[File] | Files, config: MkDocsConfig
+    ) -> None:
+        self.nav = nav
+        self.pages = files.documentation_pages() if isinstance(files, Files) else files
+        self.config = config
+        self.build_date_utc = utils.get_build_datetime()
+        self._extra_urls: dict[tuple, tuple[list[str], list[str]]] = {}
+        # For each position, the path components that relative extra URLs have there. When
+        # computing a relative URL, only those components of the page's URL can match (see
+        # `utils.get_relative_url`), so the others don't change the result.
+        self._extra_parts: list[set[str]] = []
+        for path in (*map(str, config.extra_javascript), *config.extra_css):
+            norm_path, relative_level = utils._get_norm_url(path)
+            if relative_level != -1:
+                for i, part in enumerate(utils._norm_parts(norm_path)):
+                    if i == len(self._extra_parts):
+                        self._extra_parts.append(set())
+                    self._extra_parts[i].add(part)
+
+    def _extra_urls_key(self, page: Page | None, base_url: str) -> tuple:
+        if page is None:
+            return (None, base_url)
+        dirname, _, basename = page.url.rpartition('/')
+        parts = utils._norm_parts(dirname if '.' in basename else page.url)
+        return len(parts), tuple(
+            part if part in extra_parts else None
+            for part, extra_parts in zip(parts, self._extra_parts)
+        )
 
-    extra_javascript = [
-        utils.normalize_url(str(script), page, base_url) for script in config.extra_javascript
-    ]
-    extra_css = [utils.normalize_url(path, page, base_url) for path in config.extra_css]
-
-    if isinstance(files, Files):
-        files = files.documentation_pages()
-
-    return templates.TemplateContext(
-        nav=nav,
-        pages=files,
-        base_url=base_url,
-        extra_css=extra_css,
-        extra_javascript=extra_javascript,
-        mkdocs_version=mkdocs.__version__,
-        build_date_utc=utils.get_build_datetime(),
-        config=config,
-        page=page,
-    )
+    def get_context(
+        self, page: Page | None = None, base_url: str = ''
+    ) -> templates.TemplateContext:
+        """Return the template context for a given page or template."""
+        if page is not None:
+            base_url = utils.get_relative_url('.', page.url)
+
+        key = self._extra_urls_key(page, base_url)
+        try:
+            extra_javascript, extra_css = self._extra_urls[key]
+        except KeyError:
+            extra_javascript = [
+                utils.normalize_url(str(script), page, base_url)
+                for script in self.config.extra_javascript
+            ]
+            extra_css = [
+                utils.normalize_url(path, page, base_url) for path in self.config.extra_css
+            ]
+            self._extra_urls[key] = extra_javascript, extra_css
+
+        return templates.TemplateContext(
+            nav=self.nav,
+            pages=self.pages,
+            base_url=base_url,
+            # Copied, in case a plugin or a template modifies them.
+            extra_css=list(extra_css),
+            extra_javascript=list(extra_javascript),
+            mkdocs_version=mkdocs.__version__,
+            build_date_utc=self.build_date_utc,
+            config=self.config,
+            page=page,
+        )
 
 
 def _build_template(
-    name: str, template: jinja2.Template, files: Files, config: MkDocsConfig, nav: Navigation
+    name: str,
+    template: jinja2.Template,
+    files: Files,
+    config: MkDocsConfig,
+    nav: Navigation,
+    site_context: _SiteContext | None = None,
 ) -> str:
     """Return rendered output for given template as a string."""
     # Run `pre_template` plugin events.
@@ -75,7 +149,10 @@ def _build_template(
     else:
         base_url = utils.get_relative_url('.', name)
 
-    context = get_context(nav, files, config, base_url=base_url)
+    if site_context is not None:
+        context = site_context.get_context(base_url=base_url)
+    else:
+        context = get_context(nav, files, config, base_url=base_url)
 
     # Run `template_context` plugin events.
     context = config.plugins.on_template_context(context, template_name=name, config=config)
@@ -89,7 +166,12 @@ def _build_template(
 
 
 def _build_theme_template(
-    template_name: str, env: jinja2.Environment, files: Files, config: MkDocsConfig, nav: Navigation
+    template_name: str,
+    env: jinja2.Environment,
+    files: Files,
+    config: MkDocsConfig,
+    nav: Navigation,
+    site_context: _SiteContext | None = None,
 ) -> None:
     """Build a template using the theme environment."""
     log.debug(f"Building theme template: {template_name}")
@@ -100,7 +182,7 @@ def _build_theme_template(
         log.warning(f"Template skipped: '{template_name}' not found in theme directories.")
         return
 
-    output = _build_template(template_name, template, files, config, nav)
+    output = _build_template(template_name, template, files, config, nav, site_context)
 
     if output.strip():
         output_path = os.path.join(config.site_dir, template_name)
@@ -109,19 +191,26 @@ def _build_theme_template(
         if template_name == 'sitemap.xml':
             log.debug(f"Gzipping template: {template_name}")
             gz_filename = f'{output_path}.gz'
-            with open(gz_filename, 'wb') as f:
-                timestamp = utils.get_build_timestamp(
-                    pages=[f.page for f in files.documentation_pages() if f.page is not None]
-                )
-                with gzip.GzipFile(
-                    fileobj=f, filename=gz_filename, mode='wb', mtime=timestamp
-                ) as gz_buf:
-                    gz_buf.write(output.encode('utf-8'))
+            gz_output = io.BytesIO()
+            timestamp = utils.get_build_timestamp(
+                pages=[f.page for f in files.documentation_pages() if f.page is not None]
+            )
+            with gzip.GzipFile(
+                fileobj=gz_output, filename=gz_filename, mode='wb', mtime=timestamp
+            ) as gz_buf:
+                gz_buf.write(output.encode('utf-8'))
+            utils.write_file(gz_output.getvalue(), gz_filename)
     else:
         log.info(f"Template skipped: '{template_name}' generated empty output.")
 
 
-def _build_extra_template(template_name: str, files: Files, config: MkDocsConfig, nav: Navigation):
+def _build_extra_template(
+    template_name: str,
+    files: Files,
+    config: MkDocsConfig,
+    nav: Navigation,
+    site_context: _SiteContext | None = None,
+):
     """Build user templates which are not part of the theme."""
     log.debug(f"Building extra template: {template_name}")
 
@@ -136,7 +225,7 @@ def _build_extra_template(template_name: str, files: Files, config: MkDocsConfig
         log.warning(f"Error reading template '{template_name}': {e}")
         return
 
-    output = _build_template(template_name, template, files, config, nav)
+    output = _build_template(template_name, template, files, config, nav, site_context)
 
     if output.strip():
         utils.write_file(output.encode('utf-8'), file.abs_dest_path)
@@ -144,7 +233,13 @@ def _build_extra_template(template_name: str, files: Files, config: MkDocsConfig
         log.info(f"Template skipped: '{template_name}' generated empty output.")
 
 
-def _populate_page(page: Page, config: MkDocsConfig, files: Files, dirty: bool = False) -> None:
+def _populate_page(
+    page: Page,
+    config: MkDocsConfig,
+    files: Files,
+    dirty: bool = False,
+    cache: _RenderCache | None = None,
+) -> None:
     """Read page content from docs_dir and render Markdown."""
     config._current_page = page
     try:
@@ -153,33 +248,533 @@ def _populate_page(page: Page, config: MkDocsConfig, files: Files, dirty: bool =
         if dirty and not page.file.is_modified():
             return
 
-        # Run the `pre_page` plugin event
-        page = config.plugins.on_pre_page(page, config=config, files=files)
+        profiler, src_uri = config.plugins._profiler, page.file.src_uri
+        with _span(profiler, 'page', 'read', page=src_uri):
+            page = _read_page(page, config, files)
 
-        page.read_source(config)
-        assert page.markdown is not None
+        with _span(profiler, 'page', 'render', page=src_uri):
+            if cache is not None:
+                cache.render(page, config, files)
+            else:
+                page.render(config, files)
 
-        # Run `page_markdown` plugin events.
-        page.markdown = config.plugins.on_page_markdown(
-            page.markdown, page=page, config=config, files=files
-        )
+        with _span(profiler, 'page', 'page_content', page=src_uri):
+            _post_render_page(page, config, files)
+    except Exception as e:
+        _log_page_error("Error reading page", page, e)
+        raise
+    finally:
+        config._current_page = None
+
+
+def _read_page(page: Page, config: MkDocsConfig, files: Files) -> Page:
+    """Run the plugin events and the reading that happen before a page is rendered."""
+    # Run the `pre_page` plugin event
+    page = config.plugins.on_pre_page(page, config=config, files=files)
+
+    page.read_source(config)
+    assert page.markdown is not None
+
+    # Run `page_markdown` plugin events.
+    page.markdown = config.plugins.on_page_markdown(
+        page.markdown, page=page, config=config, files=files
+    )
+    return page
+
+
+def _post_render_page(page: Page, config: MkDocsConfig, files: Files) -> None:
+    """Run the plugin events that happen after a page is rendered."""
+    assert page.content is not None
+
+    # Run `page_content` plugin events.
+    page.content = config.plugins.on_page_content(
+        page.content, page=page, config=config, files=files
+    )
 
-        page.render(config, files)
-        assert page.content is not None
 
-        # Run `page_content` plugin events.
-        page.content = config.plugins.on_page_content(
-            page.content, page=page, config=config, files=files
+def _log_page_error(prefix: str, page: Page, e: Exception) -> None:
+    message = f"{prefix} '{page.file.src_uri}':"
+    # Prevent duplicated the error message because it will be printed immediately afterwards.
+    if not isinstance(e, BuildError):
+        message += f" {e}"
+    log.error(message)
+
+
+class _WorkerConfig:
+    """
+    The subset of the config that `Page.render` needs, in a form that can be sent to a subprocess.
+
+    The full config can't be pickled, as it holds plugins, the theme, and references to itself.
+    """
+
+    def __init__(self, config: MkDocsConfig) -> None:
+        self.docs_dir = config.docs_dir
+        self.config_file_path = config.config_file_path
+        self.use_directory_urls = config.use_directory_urls
+        self.validation = config.validation
+        self._current_page: Page | None = None
+        self.markdown_extensions = config.markdown_extensions
+        # Any `!relative` placeholders have to point to this object instead of the full config.
+        self.mdx_configs = copy.deepcopy(config.mdx_configs, {id(config): self})
+
+    def __getitem__(self, key: str) -> Any:
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+
+def _get_worker_files(files: Files) -> Files:
+    """Return a copy of the collection with just enough info about each file to resolve links."""
+    worker_files = []
+    for f in files:
+        wf = File(
+            f.src_uri,
+            None,
+            f.dest_dir,
+            f.use_directory_urls,
+            dest_uri=f.dest_uri,
+            inclusion=f.inclusion,
         )
-    except Exception as e:
-        message = f"Error reading page '{page.file.src_uri}':"
-        # Prevent duplicated the error message because it will be printed immediately afterwards.
-        if not isinstance(e, BuildError):
-            message += f" {e}"
-        log.error(message)
-        raise
+        wf.url = f.url
+        worker_files.append(wf)
+    return Files(worker_files)
+
+
+class _LogCollector(logging.Handler):
+    """Store log messages emitted in a subprocess, so they can be re-emitted in the main process."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: list[tuple[str, int, str]] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append((record.name, record.levelno, record.getMessage()))
+
+
+class _RenderWorker:
+    """The state of a subprocess that renders pages, set up by `_init_render_worker`."""
+
+    config: _WorkerConfig
+    files: Files
+    logs: _LogCollector
+
+
+def _init_render_worker(config: _WorkerConfig, files: Files, log_level: int) -> None:
+    _RenderWorker.config = config
+    _RenderWorker.files = files
+    _RenderWorker.logs = _LogCollector()
+    logger = logging.getLogger('mkdocs')
+    logger.handlers = [_RenderWorker.logs]
+    logger.propagate = False
+    logger.setLevel(log_level)
+
+
+def _render_page_in_worker(item: tuple[str, str]) -> dict[str, Any]:
+    """Render the Markdown of one page in a subprocess and return everything that the page gained."""
+    config, files, collector = _RenderWorker.config, _RenderWorker.files, _RenderWorker.logs
+    src_uri, markdown = item
+    file = files.get_file_from_path(src_uri)
+    assert file is not None
+
+    collector.records = []
+    page = Page(None, file, config)  # type: ignore[arg-type]
+    page.markdown = markdown
+    config._current_page = page
+    start = time.perf_counter()
+    try:
+        page.render(config, files)  # type: ignore[arg-type]
     finally:
         config._current_page = None
+        file.page = None
+    duration = time.perf_counter() - start
+
+    return dict(
+        content=page.content,
+        toc=page.toc,
+        title_from_render=page._title_from_render,
+        present_anchor_ids=page.present_anchor_ids,
+        links_to_anchors=(
+            None
+            if page.links_to_anchors is None
+            else {f.src_uri: links for f, links in page.links_to_anchors.items()}
+        ),
+        link_targets={path: f and f.src_uri for path, f in (page._link_targets or {}).items()},
+        logs=collector.records,
+        timing=(start, duration, os.getpid(), threading.get_ident()),
+    )
+
+
+def _apply_render_result(page: Page, result: dict[str, Any], files: Files) -> None:
+    for name, level, msg in result['logs']:
+        logging.getLogger(name).log(level, msg)
+    page.content = result['content']
+    page.toc = result['toc']
+    page._title_from_render = result['title_from_render']
+    page.present_anchor_ids = result['present_anchor_ids']
+    if result['links_to_anchors'] is not None:
+        page.links_to_anchors = {}
+        for src_uri, links in result['links_to_anchors'].items():
+            target = files.get_file_from_path(src_uri)
+            assert target is not None
+            page.links_to_anchors[target] = links
+    page._link_targets = {
+        path: src_uri and files.get_file_from_path(src_uri)
+        for path, src_uri in result['link_targets'].items()
+    }
+
+
+def _stable_repr(value: Any) -> str:
+    """Return a representation of a config value that is the same across processes."""
+    if isinstance(value, dict):
+        return '{' + ', '.join(f'{k!r}: {_stable_repr(v)}' for k, v in sorted(value.items())) + '}'
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = sorted(value, key=repr) if isinstance(value, (set, frozenset)) else value
+        return '[' + ', '.join(map(_stable_repr, items)) + ']'
+    if isinstance(value, _DirPlaceholder):
+        # Resolves differently for each page, but the page and the dirs are part of the key anyway.
+        return f'{type(value).__name__}({value.suffix!r})'
+    if isinstance(value, markdown.Extension):
+        return f'{type(value).__module__}.{type(value).__qualname__}({_stable_repr(value.getConfigs())})'
+    if callable(value):
+        return f'{getattr(value, "__module__", "")}.{getattr(value, "__qualname__", repr(value))}'
+    return repr(value)
+
+
+# Markdown extensions that read other files while rendering, e.g. to include snippets.
+_EXTERNAL_INPUT_EXTENSIONS = frozenset(
+    ('pymdownx.snippets', 'markdown_include.include', 'mdx_include', 'markdown_include_lines')
+)
+
+
+def _external_input_extensions(config: MkDocsConfig) -> list[str]:
+    """Return the names of the enabled `_EXTERNAL_INPUT_EXTENSIONS`."""
+    return [
+        name
+        for name in config.markdown_extensions
+        if isinstance(name, str) and name.partition(':')[0] in _EXTERNAL_INPUT_EXTENSIONS
+    ]
+
+
+class _RenderCache:
+    """
+    A persistent cache of the results of `Page.render`, stored as JSON files in `.cache/mkdocs/render/`.
+
+    An entry is keyed by the Markdown of the page (after the `page_markdown` event), its location,
+    and the config that affects rendering. It also records which paths the links in the page were
+    looked up as, and it's used only if all of those still resolve to the same files.
+
+    Files that Markdown extensions read by themselves can't be tracked, so the cache isn't used at
+    all when one of the `_EXTERNAL_INPUT_EXTENSIONS` is enabled. Entries that a full build didn't
+    use are removed by `prune`.
+    """
+
+    def __init__(self, config: MkDocsConfig) -> None:
+        self.cache_dir = get_project_cache_dir(config.config_file_path, 'render')
+        self.hits = self.misses = 0
+        self._used: set[str] = set()
+        self.external_inputs = _external_input_extensions(config)
+        self._config_key = _stable_repr(
+            dict(
+                mkdocs=mkdocs.__version__,
+                markdown=markdown.__version__,
+                docs_dir=config.docs_dir,
+                config_file_path=config.config_file_path,
+                use_directory_urls=config.use_directory_urls,
+                validation_links=dict(config.validation.links),
+                markdown_extensions=config.markdown_extensions,
+                mdx_configs=config.mdx_configs,
+            )
+        )
+
+    def _key(self, page: Page) -> str:
+        assert page.markdown is not None
+        log_level = logging.getLogger('mkdocs.structure.pages').getEffectiveLevel()
+        parts = (
+            self._config_key,
+            str(log_level),
+            page.file.src_uri,
+            page.file.url,
+            page.file.inclusion.name,
+            page.markdown,
+        )
+        return hashlib.sha256('\0'.join(parts).encode('utf-8', errors='surrogatepass')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f'{key}.json')
+
+    def can_cache(self, page: Page) -> bool:
+        # Subclasses of `Page` could be customizing the rendering.
+        return not self.external_inputs and type(page).render is Page.render
+
+    def load(self, page: Page, files: Files) -> bool:
+        """If a valid entry exists for the page, apply it to the page and return True."""
+        if not self.can_cache(page):
+            return False
+        key = self._key(page)
+        try:
+            with open(self._path(key), encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return False
+
+        link_targets: dict[str, File | None] = {}
+        for path, dep in entry['link_targets'].items():
+            target = files.get_file_from_path(path)
+            if (target and [target.url, target.inclusion.name]) != dep:
+                self.misses += 1
+                return False
+            link_targets[path] = target
+
+        log.debug(f"Using the cached render of '{page.file.src_uri}'")
+        self.hits += 1
+        self._used.add(key)
+        for name, level, msg in entry['logs']:
+            logging.getLogger(name).log(level, msg)
+        page.content = entry['content']
+        page.toc = get_toc(entry['toc'])
+        page._title_from_render = entry['title']
+        page.present_anchor_ids = set(entry['present_anchor_ids'])
+        if entry['links_to_anchors'] is not None:
+            page.links_to_anchors = {}
+            for src_uri, links in entry['links_to_anchors'].items():
+                target = files.get_file_from_path(src_uri)
+                assert target is not None
+                page.links_to_anchors[target] = links
+        page._link_targets = link_targets
+        return True
+
+    def store(self, page: Page, logs: Sequence[tuple[str, int, str]]) -> None:
+        """Save the result of rendering the page, together with the messages that it logged."""
+        if not self.can_cache(page) or page._link_targets is None:
+            return
+        entry = dict(
+            content=page.content,
+            toc=[_toc_token(item) for item in page.toc],
+            title=page._title_from_render,
+            present_anchor_ids=sorted(page.present_anchor_ids or ()),
+            links_to_anchors=(
+                None
+                if page.links_to_anchors is None
+                else {f.src_uri: links for f, links in page.links_to_anchors.items()}
+            ),
+            link_targets={
+                path: f and [f.url, f.inclusion.name] for path, f in page._link_targets.items()
+            },
+            logs=list(logs),
+        )
+        key = self._key(page)
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(f'{path}.tmp', 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(f'{path}.tmp', path)
+        except OSError as e:
+            log.debug(f"Couldn't write the render cache of '{page.file.src_uri}': {e}")
+        else:
+            self._used.add(key)
+
+    def prune(self) -> int:
+        """Remove the entries that weren't loaded or stored since the cache was created. Return their number."""
+        removed = 0
+        try:
+            subdirs = os.listdir(self.cache_dir)
+        except OSError:
+            return 0
+        for subdir in subdirs:
+            dirpath = os.path.join(self.cache_dir, subdir)
+            try:
+                names = os.listdir(dirpath)
+            except OSError:
+                continue
+            for name in names:
+                if name.endswith('.json') and name[: -len('.json')] in self._used:
+                    continue
+                try:
+                    os.unlink(os.path.join(dirpath, name))
+                except OSError:
+                    continue
+                removed += 1
+            try:
+                os.rmdir(dirpath)
+            except OSError:
+                pass  # Not empty.
+        return removed
+
+    def render(self, page: Page, config: MkDocsConfig, files: Files) -> None:
+        """Same as `page.render(config, files)`, but reuses or populates the cache."""
+        if self.load(page, files):
+            return
+        collector = _LogCollector()
+        logger = logging.getLogger('mkdocs')
+        logger.addHandler(collector)
+        try:
+            page.render(config, files)
+        finally:
+            logger.removeHandler(collector)
+        self.store(page, collector.records)
+
+
+def _toc_token(item: AnchorLink) -> dict[str, Any]:
+    return dict(
+        level=item.level,
+        id=item.id,
+        name=item.title,
+        children=[_toc_token(child) for child in item.children],
+    )
+
+
+def _populate_pages_in_parallel(
+    pages: Sequence[Page],
+    config: MkDocsConfig,
+    files: Files,
+    dirty: bool,
+    jobs: int,
+    cache: _RenderCache | None = None,
+    spill: _PageSpill | None = None,
+) -> None:
+    """
+    Same as calling `_populate_page` for each page, but the Markdown is rendered in a process pool.
+
+    All plugin events still run in this process. For each page they keep their relative order,
+    but the `page_content` events run only after the `pre_page` and `page_markdown` events of
+    all pages.
+
+    If `spill` is passed, each page is released into it after its `page_content` event. Then only
+    a few pages per job are read ahead of the ones whose rendering is finished, so that the
+    Markdown of all pages isn't in memory at once. So the `page_content` events of the first
+    pages run before the other pages are read.
+    """
+    profiler = config.plugins._profiler
+    executor: concurrent.futures.ProcessPoolExecutor | None = None
+    use_workers = True
+
+    def read(page: Page) -> tuple[Page, bool]:
+        """Read the page and try the cache. Return the page and whether it's rendered already."""
+        config._current_page = page
+        try:
+            with _span(profiler, 'page', 'read', page=page.file.src_uri):
+                page = _read_page(page, config, files)
+            if cache is None:
+                return page, False
+            with _span(profiler, 'page', 'render', page=page.file.src_uri):
+                return page, cache.load(page, files)
+        except Exception as e:
+            _log_page_error("Error reading page", page, e)
+            raise
+        finally:
+            config._current_page = None
+
+    def start_executor(
+        stack: contextlib.ExitStack,
+    ) -> concurrent.futures.ProcessPoolExecutor | None:
+        nonlocal executor, use_workers
+        if executor is None and use_workers:
+            try:
+                initargs = (
+                    _WorkerConfig(config),
+                    _get_worker_files(files),
+                    logging.getLogger('mkdocs.structure.pages').getEffectiveLevel(),
+                )
+                pickle.dumps(initargs)
+            except Exception as e:
+                log.warning(
+                    "Rendering pages one at a time, because the config can't be passed "
+                    f"to subprocesses: {e}"
+                )
+                use_workers = False
+            else:
+                executor = stack.enter_context(
+                    concurrent.futures.ProcessPoolExecutor(
+                        max_workers=jobs, initializer=_init_render_worker, initargs=initargs
+                    )
+                )
+        return executor
+
+    def finish(page: Page, rendered: bool, result: dict[str, Any] | None) -> None:
+        """Apply the result of rendering the page, or render it here, and run the rest of its events."""
+        config._current_page = page
+        try:
+            src_uri = page.file.src_uri
+            if result is not None:
+                if profiler is not None:
+                    start, duration, pid, tid = result['timing']
+                    profiler.add(
+                        'page',
+                        'render',
+                        start,
+                        duration,
+                        process_id=pid,
+                        thread_id=tid,
+                        page=src_uri,
+                    )
+                with _span(profiler, 'page', 'apply_render', page=src_uri):
+                    _apply_render_result(page, result, files)
+                    if cache is not None:
+                        cache.store(page, result['logs'])
+            elif not rendered:
+                with _span(profiler, 'page', 'render', page=src_uri):
+                    if cache is not None:
+                        cache.render(page, config, files)
+                    else:
+                        page.render(config, files)
+            with _span(profiler, 'page', 'page_content', page=src_uri):
+                _post_render_page(page, config, files)
+            if spill is not None:
+                spill.release(page)
+        except Exception as e:
+            _log_page_error("Error reading page", page, e)
+            raise
+        finally:
+            config._current_page = None
+
+    def in_worker(page: Page) -> bool:
+        # Subclasses of `Page` could be customizing the rendering, keep those in this process.
+        return type(page).render is Page.render
+
+    pages = [page for page in pages if not (dirty and not page.file.is_modified())]
+    with contextlib.ExitStack() as stack:
+        if spill is not None:
+            # (page, whether it's rendered already, the render in a worker)
+            pending: collections.deque[
+                tuple[Page, bool, concurrent.futures.Future[dict[str, Any]] | None]
+            ] = collections.deque()
+
+            def finish_next() -> None:
+                page, rendered, future = pending.popleft()
+                finish(page, rendered, future.result() if future is not None else None)
+
+            for page in pages:
+                page, rendered = read(page)
+                future = None
+                if not rendered and in_worker(page) and (pool := start_executor(stack)):
+                    assert page.markdown is not None
+                    future = pool.submit(_render_page_in_worker, (page.file.src_uri, page.markdown))
+                pending.append((page, rendered, future))
+                if len(pending) > 2 * jobs:
+                    finish_next()
+            while pending:
+                finish_next()
+            return
+
+        to_render = [read(page) for page in pages]
+        in_workers = [page for page, rendered in to_render if not rendered and in_worker(page)]
+        results: Iterator[dict[str, Any]] = iter(())
+        if in_workers and (pool := start_executor(stack)):
+            results = pool.map(
+                _render_page_in_worker,
+                [(page.file.src_uri, page.markdown) for page in in_workers],
+                chunksize=max(1, len(in_workers) // (jobs * 4)),
+            )
+        else:
+            in_workers = []
+
+        rendered_in_worker = set(map(id, in_workers))
+        for page, rendered in to_render:
+            result = next(results) if id(page) in rendered_in_worker else None
+            finish(page, rendered, result)
 
 
 def _build_page(
@@ -190,8 +785,15 @@ def _build_page(
     env: jinja2.Environment,
     dirty: bool = False,
     excluded: bool = False,
+    up_to_date: bool = False,
+    site_context: _SiteContext | None = None,
 ) -> None:
-    """Pass a Page to theme template and write output to site_dir."""
+    """
+    Pass a Page to theme template and write output to site_dir.
+
+    If `up_to_date` is true, the output of the page from the previous build is known to be
+    still valid. Then only the `page_context` event runs (so that plugins still see the page).
+    """
     config._current_page = page
     try:
         # When --dirty is used, only build the page if the file has been modified since the
@@ -200,17 +802,26 @@ def _build_page(
             return
 
         log.debug(f"Building page {page.file.src_uri}")
+        profiler, src_uri = config.plugins._profiler, page.file.src_uri
 
         # Activate page. Signals to theme that this is the current page.
         page.active = True
 
-        context = get_context(nav, doc_files, config, page)
+        with _span(profiler, 'page', 'context', page=src_uri):
+            if site_context is not None:
+                context = site_context.get_context(page)
+            else:
+                context = get_context(nav, doc_files, config, page)
 
-        # Allow 'template:' override in md source files.
-        template = env.get_template(page.meta.get('template', 'main.html'))
+            if up_to_date:
+                config.plugins.on_page_context(context, page=page, config=config, nav=nav)
+                return
 
-        # Run `page_context` plugin events.
-        context = config.plugins.on_page_context(context, page=page, config=config, nav=nav)
+            # Allow 'template:' override in md source files.
+            template = env.get_template(page.meta.get('template', 'main.html'))
+
+            # Run `page_context` plugin events.
+            context = config.plugins.on_page_context(context, page=page, config=config, nav=nav)
 
         if excluded:
             page.content = (
@@ -219,17 +830,19 @@ def _build_page(
                 '</div>' + (page.content or '')
             )
 
-        # Render the template.
-        output = template.render(context)
+        with _span(profiler, 'page', 'template', page=src_uri):
+            # Render the template.
+            output = template.render(context)
 
-        # Run `post_page` plugin events.
-        output = config.plugins.on_post_page(output, page=page, config=config)
+            # Run `post_page` plugin events.
+            output = config.plugins.on_post_page(output, page=page, config=config)
 
         # Write the output file.
         if output.strip():
-            utils.write_file(
-                output.encode('utf-8', errors='xmlcharrefreplace'), page.file.abs_dest_path
-            )
+            with _span(profiler, 'page', 'write', page=src_uri):
+                utils.write_file(
+                    output.encode('utf-8', errors='xmlcharrefreplace'), page.file.abs_dest_path
+                )
         else:
             log.info(f"Page skipped: '{page.file.src_uri}'. Generated empty output.")
 
@@ -246,8 +859,261 @@ def _build_page(
         config._current_page = None
 
 
-def build(config: MkDocsConfig, *, serve_url: str | None = None, dirty: bool = False) -> None:
-    """Perform a full site build."""
+def _span(profiler: Profiler | None, category: str, name: str, **args: str) -> ContextManager:
+    """Measure the body of the `with` statement, if profiling is enabled."""
+    if profiler is None:
+        return contextlib.nullcontext()
+    return profiler.span(category, name, **args)
+
+
+def _nav_signature(items: Sequence[StructureItem]) -> list:
+    """Return everything about the navigation that can affect the output of every page."""
+    return [
+        (
+            type(item).__name__,
+            item.title,
+            getattr(item, 'url', None),
+            _nav_signature(getattr(item, 'children', None) or []),
+        )
+        for item in items
+    ]
+
+
+class _BuildState:
+    """
+    What the previous build produced, so that the next build can update only what changed.
+
+    This is how `mkdocs serve --dirty` works. Before each build, `changed_paths` has to be set to
+    the files that changed since the previous build. The site is updated instead of being
+    rebuilt if all of them are sources of documentation pages, otherwise (or if `changed_paths`
+    is None) it's rebuilt fully.
+
+    A page is rendered again only if its source changed or if any of its links now resolve to
+    a different file. For pages that aren't rendered again, the plugin events up to and
+    including `page_content` don't run, and the result of the previous build is reused.
+    The HTML of all pages is written again only if the navigation changed, otherwise only
+    the HTML of the rendered pages is.
+
+    Other files that a page is made from, such as snippets that a Markdown extension includes,
+    can't be tracked. That's why any other changed file means a full rebuild, and the site is
+    always rebuilt fully if one of the `_EXTERNAL_INPUT_EXTENSIONS` is enabled.
+    """
+
+    def __init__(self) -> None:
+        self.changed_paths: Collection[str] | None = None
+        self._changed_abs_paths: set[str] = set()
+        self._pages: dict[str, dict[str, Any]] = {}
+        self._nav_signature: list = []
+        self._dest_paths: set[str] = set()
+        self._page_paths: set[str] = set()
+        self._built = False
+
+    def clear(self) -> None:
+        """Make the next build a full build."""
+        self._pages = {}
+        self._nav_signature = []
+        self._built = False
+
+    def prepare_update(self, config: MkDocsConfig) -> bool:
+        """Return True if the site can be updated instead of being fully rebuilt."""
+        if not self._built or self.changed_paths is None:
+            return False
+        if _external_input_extensions(config):
+            return False
+        self._changed_abs_paths = {os.path.abspath(path) for path in self.changed_paths}
+        docs_dir = os.path.join(os.path.abspath(config.docs_dir), '')
+        return all(path.startswith(docs_dir) for path in self._changed_abs_paths)
+
+    def changes_only_pages(self, files: Files, inclusion: Callable[[InclusionLevel], bool]) -> bool:
+        """Return True if each changed file is the source of a built page, now or previously."""
+        page_paths = {
+            os.path.abspath(file.abs_src_path)
+            for file in files.documentation_pages(inclusion=inclusion)
+            if file.abs_src_path is not None
+        }
+        return self._changed_abs_paths <= page_paths | self._page_paths
+
+    def restore_page(self, page: Page, files: Files) -> bool:
+        """If the page isn't affected by the changes, restore its previous render and return True."""
+        snapshot = self._pages.get(page.file.src_uri)
+        if (
+            snapshot is None
+            or snapshot['link_targets'] is None
+            or snapshot['inclusion'] != page.file.inclusion
+            # Files generated by plugins have no source path, their content can't be tracked.
+            or page.file.abs_src_path is None
+            or os.path.abspath(page.file.abs_src_path) in self._changed_abs_paths
+        ):
+            return False
+        link_targets: dict[str, File | None] = {}
+        for path, dep in snapshot['link_targets'].items():
+            target = files.get_file_from_path(path)
+            if (target and (target.url, target.inclusion)) != dep:
+                return False
+            link_targets[path] = target
+
+        page.markdown = snapshot['markdown']
+        page.meta = snapshot['meta']
+        page.content = snapshot['content']
+        page.toc = snapshot['toc']
+        page._title_from_render = snapshot['title_from_render']
+        page.present_anchor_ids = snapshot['present_anchor_ids']
+        if snapshot['links_to_anchors'] is not None:
+            page.links_to_anchors = {}
+            for src_uri, links in snapshot['links_to_anchors'].items():
+                target = files.get_file_from_path(src_uri)
+                assert target is not None
+                page.links_to_anchors[target] = links
+        page._link_targets = link_targets
+        return True
+
+    def record(self, nav: Navigation, pages: Sequence[Page]) -> bool:
+        """Save the rendered pages and return True if the navigation changed since the previous build."""
+        self._pages = {
+            page.file.src_uri: dict(
+                inclusion=page.file.inclusion,
+                markdown=page.markdown,
+                meta=page.meta,
+                content=page.content,
+                toc=page.toc,
+                title_from_render=page._title_from_render,
+                present_anchor_ids=page.present_anchor_ids,
+                links_to_anchors=(
+                    None
+                    if page.links_to_anchors is None
+                    else {f.src_uri: links for f, links in page.links_to_anchors.items()}
+                ),
+                link_targets=(
+                    None
+                    if page._link_targets is None
+                    else {
+                        path: f and (f.url, f.inclusion) for path, f in page._link_targets.items()
+                    }
+                ),
+            )
+            for page in pages
+        }
+        self._page_paths = {
+            os.path.abspath(page.file.abs_src_path)
+            for page in pages
+            if page.file.abs_src_path is not None
+        }
+        nav_signature = [_nav_signature(nav.items), sorted(self._pages)]
+        nav_changed = nav_signature != self._nav_signature
+        self._nav_signature = nav_signature
+        self._built = True
+        return nav_changed
+
+    def remove_deleted_files(self, files: Files) -> None:
+        """Delete the output of files that existed in the previous build but don't anymore."""
+        dest_paths = {file.abs_dest_path for file in files}
+        for path in self._dest_paths - dest_paths:
+            log.debug(f"Removing '{path}'")
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+        self._dest_paths = dest_paths
+
+
+class _PageSpill:
+    """
+    Keeps the Markdown and the rendered HTML of pages in a temporary file instead of in memory.
+
+    This is how `build(low_memory=True)` works. After a page is rendered, `release` writes its
+    `markdown` and `content` to the file and sets them to None. The title of the page is fixed
+    first, as it's derived from them. Everything else about the page, including its TOC, stays
+    in memory. `restore` reads them back for when the page's template is rendered, after which
+    the build drops them again.
+    """
+
+    def __init__(self) -> None:
+        self._file = tempfile.TemporaryFile()
+        self._spans: dict[str, tuple[int, int, int]] = {}
+
+    def release(self, page: Page) -> None:
+        if page.markdown is None and page.content is None:
+            return
+        page.title = page.title
+        offset = self._file.seek(0, os.SEEK_END)
+        sizes = []
+        for text in page.markdown, page.content:
+            if text is None:
+                sizes.append(-1)
+            else:
+                sizes.append(self._file.write(text.encode('utf-8', errors='surrogatepass')))
+        self._spans[page.file.src_uri] = (offset, sizes[0], sizes[1])
+        page.markdown = page.content = None
+
+    def restore(self, page: Page) -> None:
+        try:
+            offset, *sizes = self._spans.pop(page.file.src_uri)
+        except KeyError:
+            return
+        self._file.seek(offset)
+        page.markdown, page.content = (
+            None if size < 0 else self._file.read(size).decode('utf-8', errors='surrogatepass')
+            for size in sizes
+        )
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def build(
+    config: MkDocsConfig,
+    *,
+    serve_url: str | None = None,
+    dirty: bool = False,
+    jobs: int = 1,
+    render_cache: bool = False,
+    state: _BuildState | None = None,
+    profiler: Profiler | None = None,
+    write_if_changed: bool = False,
+    prune: bool = False,
+    template_cache: bool = False,
+    low_memory: bool = False,
+    output: OutputManifest | None = None,
+) -> None:
+    """
+    Perform a full site build.
+
+    If `jobs` is greater than 1, the Markdown of pages is rendered in that many subprocesses,
+    and static files are copied by that many threads.
+
+    If `render_cache` is true, the rendered Markdown of pages is stored in `.cache/mkdocs/render/`
+    next to the config file, and pages that didn't change since a previous build aren't rendered again.
+    The cache isn't used with Markdown extensions that include other files, see `_RenderCache`.
+
+    If `state` is passed, it's used to only update the pages affected by changes since the previous
+    build with the same `state`, see `_BuildState`.
+
+    If `profiler` is passed, the time taken by each phase of the build, by each plugin event
+    handler and by each page is recorded into it.
+
+    If `write_if_changed` is true, the site directory isn't cleaned before the build, and files
+    whose content didn't change aren't written again. The size, modification time and hash of the
+    written files are kept in `.cache/mkdocs/output.json` next to the config file.
+
+    If `prune` is true, the site directory isn't cleaned before the build either, but after the
+    build the files in it that the build didn't produce are removed.
+
+    If `template_cache` is true, the compiled theme templates are kept in
+    `.cache/mkdocs/templates/` next to the config file, and reused by the next builds.
+    The `build`, `serve` and `gh-deploy` commands turn it on unless `--no-template-cache` is
+    given, but it's off by default here, so that calling this function doesn't write a cache.
+
+    If `low_memory` is true, the Markdown and the HTML of each page are kept in a temporary file
+    from the moment the page is rendered, except while its template is rendered, see `_PageSpill`.
+    Peak memory use then doesn't grow with the size of the pages. Outside of the `page_content`,
+    `page_context` and `post_page` events of a page, its `markdown` and `content` are None.
+    It can't be combined with `state`.
+
+    If `output` is passed, the files that the build produces go through it, instead of being
+    written to `site_dir` directly, see `mkdocs.utils.output.MemoryOutput`. Then `write_if_changed`
+    and `prune` have no effect.
+    """
+    if low_memory and state is not None:
+        raise ValueError("A low-memory build can't be combined with `state`")
+
     logger = logging.getLogger('mkdocs')
 
     # Add CountHandler for strict mode
@@ -257,19 +1123,49 @@ def build(config: MkDocsConfig, *, serve_url: str | None = None, dirty: bool = F
         logging.getLogger('mkdocs').addHandler(warning_counter)
 
     inclusion = InclusionLevel.is_in_serve if serve_url else InclusionLevel.is_included
+    config.plugins._profiler = profiler
+    output_manifest = None
+    spill = _PageSpill() if low_memory else None
 
     try:
         start = time.monotonic()
 
-        # Run `config` plugin events.
-        config = config.plugins.on_config(config)
-
-        # Run `pre_build` plugin events.
-        config.plugins.on_pre_build(config=config)
-
-        if not dirty:
+        with _span(profiler, 'phase', 'config'):
+            # Run `config` plugin events.
+            config = config.plugins.on_config(config)
+            config._markdown_pool = None
+
+        with _span(profiler, 'phase', 'pre_build'):
+            # Run `pre_build` plugin events.
+            config.plugins.on_pre_build(config=config)
+
+        update = state is not None and state.prepare_update(config)
+        if output is not None:
+            output_manifest = output
+            write_if_changed = prune = False
+            output_manifest.activate()
+        elif write_if_changed or prune:
+            output_manifest = OutputManifest(
+                config.site_dir,
+                (
+                    get_project_cache_dir(config.config_file_path, 'output.json')
+                    if write_if_changed
+                    else None
+                ),
+            )
+            if prune:
+                output_manifest.snapshot()
+            output_manifest.activate()
+        if update:
+            log.debug("Updating only the pages affected by the changes")
+        elif write_if_changed:
+            log.info("Writing only the files that changed to the site directory")
+        elif prune:
+            log.info("Stale files will be removed from the site directory after the build")
+        elif not dirty:
             log.info("Cleaning site directory")
-            utils.clean_directory(config.site_dir)
+            with _span(profiler, 'phase', 'clean'):
+                utils.clean_directory(config.site_dir)
         else:  # pragma: no cover
             # Warn user about problems that may occur with --dirty option
             log.warning(
@@ -284,30 +1180,68 @@ def build(config: MkDocsConfig, *, serve_url: str | None = None, dirty: bool = F
 
         # First gather all data from all files/pages to ensure all data is consistent across all pages.
 
-        files = get_files(config)
-        env = config.theme.get_env()
-        files.add_files_from_theme(env, config)
+        with _span(profiler, 'phase', 'get_files'):
+            files = get_files(config)
+        with _span(profiler, 'phase', 'theme'):
+            env = config.theme.get_env(
+                bytecode_cache_dir=(
+                    get_project_cache_dir(config.config_file_path, 'templates')
+                    if template_cache
+                    else None
+                )
+            )
+            files.add_files_from_theme(env, config)
+
+        with _span(profiler, 'phase', 'files'):
+            # Run `files` plugin events.
+            files = config.plugins.on_files(files, config=config)
+            # If plugins have added files but haven't set their inclusion level, calculate it again.
+            set_exclusions(files, config)
 
-        # Run `files` plugin events.
-        files = config.plugins.on_files(files, config=config)
-        # If plugins have added files but haven't set their inclusion level, calculate it again.
-        set_exclusions(files, config)
+        if update and state is not None and not state.changes_only_pages(files, inclusion):
+            log.debug("Rebuilding all pages, as a changed file isn't the source of a page")
+            update = False
 
-        nav = get_navigation(files, config)
+        with _span(profiler, 'phase', 'nav'):
+            nav = get_navigation(files, config)
 
-        # Run `nav` plugin events.
-        nav = config.plugins.on_nav(nav, config=config, files=files)
+            # Run `nav` plugin events.
+            nav = config.plugins.on_nav(nav, config=config, files=files)
 
         log.debug("Reading markdown pages.")
+        cache = _RenderCache(config) if render_cache else None
+        if cache is not None and cache.external_inputs:
+            log.info(
+                f"The render cache is not used, because the Markdown extension "
+                f"'{cache.external_inputs[0]}' reads files that the cache can't keep track of."
+            )
         excluded = []
-        for file in files.documentation_pages(inclusion=inclusion):
-            log.debug(f"Reading: {file.src_uri}")
-            if file.page is None and file.inclusion.is_not_in_nav():
-                if serve_url and file.inclusion.is_excluded():
-                    excluded.append(urljoin(serve_url, file.url))
-                Page(None, file, config)
-            assert file.page is not None
-            _populate_page(file.page, config, files, dirty)
+        pages = []
+        restored = set()
+        with _span(profiler, 'phase', 'populate_pages'):
+            for file in files.documentation_pages(inclusion=inclusion):
+                log.debug(f"Reading: {file.src_uri}")
+                if file.page is None and file.inclusion.is_not_in_nav():
+                    if serve_url and file.inclusion.is_excluded():
+                        excluded.append(urljoin(serve_url, file.url))
+                    Page(None, file, config)
+                assert file.page is not None
+                if update and state is not None and state.restore_page(file.page, files):
+                    restored.add(file.src_uri)
+                elif jobs > 1:
+                    pages.append(file.page)
+                else:
+                    _populate_page(file.page, config, files, dirty, cache)
+                    if spill is not None:
+                        spill.release(file.page)
+            if pages:
+                _populate_pages_in_parallel(pages, config, files, dirty, jobs, cache, spill)
+        if cache is not None:
+            log.debug(f"Render cache: {cache.hits} hits, {cache.misses} misses.")
+            # Only a build that went through all pages knows which entries are still needed.
+            if not dirty and not restored and not cache.external_inputs:
+                if unused := cache.prune():
+                    log.debug(f"Removed {unused} unused entries from the render cache.")
         if excluded:
             log.info(
                 "The following pages are being built only for the preview "
@@ -315,36 +1249,89 @@ def build(config: MkDocsConfig, *, serve_url: str | None = None, dirty: bool = F
                 + "\n  - ".join(excluded)
             )
 
-        # Run `env` plugin events.
-        env = config.plugins.on_env(env, config=config, files=files)
+        doc_files = files.documentation_pages(inclusion=inclusion)
+        nav_changed = True
+        if state is not None:
+            nav_changed = state.record(
+                nav, [file.page for file in doc_files if file.page is not None]
+            )
+
+        with _span(profiler, 'phase', 'env'):
+            # Run `env` plugin events.
+            env = config.plugins.on_env(env, config=config, files=files)
 
         # Start writing files to site_dir now that all data is gathered. Note that order matters. Files
         # with lower precedence get written first so that files with higher precedence can overwrite them.
 
+        if state is not None:
+            state.remove_deleted_files(files)
+
         log.debug("Copying static assets.")
-        files.copy_static_files(dirty=dirty, inclusion=inclusion)
+        with _span(profiler, 'phase', 'copy_static_files'):
+            files.copy_static_files(
+                dirty=dirty or update,
+                inclusion=inclusion,
+                copy_strategy=config.copy_strategy,
+                jobs=jobs,
+            )
 
-        for template in config.theme.static_templates:
-            _build_theme_template(template, env, files, config, nav)
+        with _span(profiler, 'phase', 'static_templates'):
+            template_context = _SiteContext(nav, files, config)
+            for template in config.theme.static_templates:
+                _build_theme_template(template, env, files, config, nav, template_context)
 
-        for template in config.extra_templates:
-            _build_extra_template(template, files, config, nav)
+            for template in config.extra_templates:
+                _build_extra_template(template, files, config, nav, template_context)
 
         log.debug("Building markdown pages.")
-        doc_files = files.documentation_pages(inclusion=inclusion)
-        for file in doc_files:
-            assert file.page is not None
-            _build_page(
-                file.page, config, doc_files, nav, env, dirty, excluded=file.inclusion.is_excluded()
-            )
-
-        log_level = config.validation.links.anchors
-        for file in doc_files:
-            assert file.page is not None
-            file.page.validate_anchor_links(files=files, log_level=log_level)
+        with _span(profiler, 'phase', 'build_pages'):
+            page_context = _SiteContext(nav, doc_files, config)
+            for file in doc_files:
+                assert file.page is not None
+                if spill is not None:
+                    spill.restore(file.page)
+                _build_page(
+                    file.page,
+                    config,
+                    doc_files,
+                    nav,
+                    env,
+                    dirty,
+                    excluded=file.inclusion.is_excluded(),
+                    up_to_date=(
+                        not nav_changed
+                        and file.src_uri in restored
+                        and os.path.isfile(file.abs_dest_path)
+                    ),
+                    site_context=page_context,
+                )
+                if spill is not None:
+                    file.page.markdown = file.page.content = None
+
+        with _span(profiler, 'phase', 'validate_anchors'):
+            log_level = config.validation.links.anchors
+            for file in doc_files:
+                assert file.page is not None
+                file.page.validate_anchor_links(files=files, log_level=log_level)
+
+        with _span(profiler, 'phase', 'post_build'):
+            # Run `post_build` plugin events.
+            config.plugins.on_post_build(config=config)
+
+        if prune and output_manifest is not None:
+            with _span(profiler, 'phase', 'prune'):
+                removed = output_manifest.prune(
+                    keep=[file.abs_dest_path for file in files if inclusion(file.inclusion)]
+                )
+            for path in removed:
+                log.debug(f"Removed stale file: '{path}'")
+            log.info(f"Removed {len(removed)} stale files from the site directory")
 
-        # Run `post_build` plugin events.
-        config.plugins.on_post_build(config=config)
+        if write_if_changed and output_manifest is not None:
+            log.info(
+                f"Wrote {output_manifest.written} changed files, "
+                f"{output_manifest.unchanged} files were unchanged"
+            )
 
         if counts := warning_counter.get_counts():
             msg = ', '.join(f'{v} {k.lower()}s' for k, v in counts)
@@ -353,6 +1340,8 @@ def build(config: MkDocsConfig, *, serve_url: str | None = None, dirty: bool = F
         log.info(f'Documentation built in {time.monotonic() - start:.2f} seconds')
 
     except Exception as e:
+        if state is not None:
+            state.clear()
         # Run `build_error` plugin events.
         config.plugins.on_build_error(error=e)
         if isinstance(e, BuildError):
@@ -361,6 +1350,11 @@ def build(config: MkDocsConfig, *, serve_url: str | None = None, dirty: bool = F
         raise
 
     finally:
+        if output_manifest is not None:
+            output_manifest.close()
+        if spill is not None:
+            spill.close()
+        config.plugins._profiler = None
         logger.removeHandler(warning_counter)
 
 
@@ -3,13 +3,14 @@ from __future__ import annotations
 import logging
 import shutil
 import tempfile
-from os.path import isdir, isfile, join
+from os.path import isdir
 from typing import TYPE_CHECKING
 from urllib.parse import urlsplit
 
-from mkdocs.commands.build import build
+from mkdocs.commands.build import _BuildState, build
 from mkdocs.config import load_config
 from mkdocs.livereload import LiveReloadServer, _serve_url
+from mkdocs.utils.output import MemoryOutput
 
 if TYPE_CHECKING:
     from mkdocs.config.defaults import MkDocsConfig
@@ -25,6 +26,8 @@ def serve(
     watch: list[str] = [],
     *,
     open_in_browser: bool = False,
+    watcher: str = 'auto',
+    in_memory: bool = False,
     **kwargs,
 ) -> None:
     """
@@ -32,7 +35,10 @@ def serve(
 
     By default it will serve the documentation on http://localhost:8000/ and
     it will rebuild the documentation and refresh the page automatically
-    whenever a file is edited.
+    whenever a file is edited. `watcher` chooses how edits are detected, see `LiveReloadServer`.
+
+    If `in_memory` is true, the site is kept in memory and served from there, instead of being
+    written to a temporary directory, see `mkdocs.utils.output.MemoryOutput`.
     """
     # Create a temporary build directory, and set some options to serve it
     # PY2 returns a byte string by default. The Unicode prefix ensures a Unicode
@@ -58,24 +64,40 @@ def serve(
     mount_path = urlsplit(config.site_url or '/').path
     config.site_url = serve_url = _serve_url(host, port, mount_path)
 
+    # With --dirty, keep track of what each build produced and only update the affected pages.
+    state = _BuildState() if is_dirty else None
+
     def builder(config: MkDocsConfig | None = None):
         log.info("Building documentation...")
         if config is None:
             config = get_config()
             config.site_url = serve_url
 
-        build(config, serve_url=None if is_clean else serve_url, dirty=is_dirty)
+        if state is not None:
+            state.changed_paths = server._build_changed_paths
+        output = MemoryOutput(site_dir) if in_memory else None
+        build(
+            config,
+            serve_url=None if is_clean else serve_url,
+            state=state,
+            template_cache=True,
+            output=output,
+        )
+        if output is not None:
+            server.set_site_files(output.files)
 
     server = LiveReloadServer(
-        builder=builder, host=host, port=port, root=site_dir, mount_path=mount_path
+        builder=builder,
+        host=host,
+        port=port,
+        root=site_dir,
+        mount_path=mount_path,
+        watcher=watcher,
     )
 
     def error_handler(code) -> bytes | None:
         if code in (404, 500):
-            error_page = join(site_dir, f'{code}.html')
-            if isfile(error_page):
-                with open(error_page, 'rb') as f:
-                    return f.read()
+            return server.read_site_file(f'{code}.html')
         return None
 
     server.error_handler = error_handler
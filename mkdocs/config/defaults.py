@@ -5,7 +5,8 @@ from typing import IO, Dict, Mapping
 
 from mkdocs.config import base
 from mkdocs.config import config_options as c
-from mkdocs.structure.pages import Page, _AbsoluteLinksValidationValue
+from mkdocs.structure.pages import Page, _AbsoluteLinksValidationValue, _MarkdownPool
+from mkdocs.utils.filecopy import COPY_STRATEGIES
 from mkdocs.utils.yaml import get_yaml_loader, yaml_load
 
 
@@ -51,6 +52,9 @@ class MkDocsConfig(base.Config):
     exclude_docs = c.Optional(c.PathSpec())
     """Gitignore-like patterns of files (relative to docs dir) to exclude from the site."""
 
+    prune_excluded_docs = c.Type(bool, default=False)
+    """Don't scan directories that `exclude_docs` excludes as a whole, so their files are unknown."""
+
     draft_docs = c.Optional(c.PathSpec())
     """Gitignore-like patterns of files (relative to docs dir) to mark as draft."""
 
@@ -79,6 +83,9 @@ class MkDocsConfig(base.Config):
     site_dir = c.SiteDir(default='site')
     """The directory where the site will be built to"""
 
+    copy_strategy = c.Choice(COPY_STRATEGIES, default='copy')
+    """How static files are copied to `site_dir`: a regular copy, a reflink or a hard link."""
+
     copyright = c.Optional(c.Type(str))
     """A copyright notice to add to the footer of documentation."""
 
@@ -202,6 +209,9 @@ class MkDocsConfig(base.Config):
     """The currently rendered page. Please do not access this and instead
     rely on the `page` argument to event handlers."""
 
+    _markdown_pool: _MarkdownPool | None = None
+    """The `Markdown` instances that are reused for rendering pages within one build."""
+
     def load_dict(self, patch: dict) -> None:
         super().load_dict(patch)
         if 'config_file_path' in patch:
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import functools
-import io
+import hashlib
 import ipaddress
 import logging
 import mimetypes
@@ -21,14 +21,52 @@ import urllib.parse
 import webbrowser
 import wsgiref.simple_server
 import wsgiref.util
-from typing import Any, BinaryIO, Callable, Iterable
+import zlib
+from typing import Any, BinaryIO, Callable, Iterable, Mapping
 
 import watchdog.events
+import watchdog.observers
 import watchdog.observers.polling
 
+WATCHERS = ('auto', 'native', 'polling')
+
+# File systems where changes made from another machine (or from the host of a VM or container)
+# don't produce inotify events, so `auto` polls them instead.
+_REMOTE_FILESYSTEMS = frozenset(
+    {
+        '9p',
+        'afs',
+        'ceph',
+        'cifs',
+        'fuse.grpcfuse',
+        'fuse.osxfs',
+        'fuse.sshfs',
+        'nfs',
+        'nfs4',
+        'smb3',
+        'smbfs',
+        'vboxsf',
+        'virtiofs',
+    }
+)
+
+# Responses with these content types (or any `text/` type) are compressed if the browser accepts
+# gzip and they're at least `_GZIP_MIN_SIZE` bytes.
+_COMPRESSIBLE_TYPES = frozenset(
+    {
+        'application/javascript',
+        'application/json',
+        'application/manifest+json',
+        'application/xml',
+        'image/svg+xml',
+    }
+)
+_GZIP_MIN_SIZE = 1024
+_GZIP_LEVEL = 6
+
 _SCRIPT_TEMPLATE_STR = """
 var livereload = function(epoch, requestId) {
-    var req, timeout;
+    var req, timeout, source;
 
     var poll = function() {
         req = new XMLHttpRequest();
@@ -43,24 +81,45 @@ var livereload = function(epoch, requestId) {
         req.send();
     }
 
+    var listen = function() {
+        source = new EventSource("/livereload/events/" + epoch + "/" + requestId);
+        source.onmessage = function(event) {
+            if (parseFloat(event.data) > epoch) {
+                location.reload();
+            }
+        };
+    }
+
+    var start = function() {
+        stop();
+        if (window.EventSource) {
+            listen();
+        } else {
+            poll();
+        }
+    };
+
     var stop = function() {
+        if (source) {
+            source.close();
+        }
         if (req) {
             req.abort();
         }
         if (timeout) {
             clearTimeout(timeout);
         }
-        req = timeout = undefined;
+        req = timeout = source = undefined;
     };
 
     window.addEventListener("load", function() {
         if (document.visibilityState === "visible") {
-            poll();
+            start();
         }
     });
     window.addEventListener("visibilitychange", function() {
         if (document.visibilityState === "visible") {
-            poll();
+            start();
         } else {
             stop();
         }
@@ -94,6 +153,7 @@ def _serve_url(host: str, port: int, path: str) -> str:
 class LiveReloadServer(socketserver.ThreadingMixIn, wsgiref.simple_server.WSGIServer):
     daemon_threads = True
     poll_response_timeout = 60
+    events_keepalive_interval = 30
 
     def __init__(
         self,
@@ -104,7 +164,19 @@ class LiveReloadServer(socketserver.ThreadingMixIn, wsgiref.simple_server.WSGISe
         mount_path: str = "/",
         polling_interval: float = 0.5,
         shutdown_delay: float = 0.25,
+        watcher: str = 'auto',
     ) -> None:
+        """
+        `watcher` chooses how file changes are detected, one of `WATCHERS`.
+
+        * `auto`: native events (inotify on Linux), but paths on network file systems are polled,
+          and so are paths that contain symlinks, as native events don't follow them. All paths
+          are polled if native events can't be used.
+        * `native`: native events for all paths, polling only if they can't be used.
+        * `polling`: check all watched files for changes every `polling_interval` seconds.
+        """
+        if watcher not in WATCHERS:
+            raise ValueError(f"Unknown watcher {watcher!r}, expected one of {WATCHERS}")
         self.builder = builder
         try:
             if isinstance(ipaddress.ip_address(host), ipaddress.IPv6Address):
@@ -127,14 +199,38 @@ class LiveReloadServer(socketserver.ThreadingMixIn, wsgiref.simple_server.WSGISe
         self._epoch_cond = threading.Condition()  # Must be held when accessing _visible_epoch.
 
         self._want_rebuild: bool = False
-        self._rebuild_cond = threading.Condition()  # Must be held when accessing _want_rebuild.
+        self._changed_paths: set[str] = set()  # Files that changed since the latest build started.
+        self._rebuild_cond = threading.Condition()  # Must be held when accessing the two above.
+        # The files that changed before the current build started, or None before the first rebuild.
+        self._build_changed_paths: frozenset[str] | None = None
+
+        # The connections of browsers that listen for events, and the thread that sends them.
+        # Must hold _epoch_cond when accessing these.
+        self._event_clients: set[socket.socket] = set()
+        self._events_thread: threading.Thread | None = None
 
         self._shutdown = False
         self.serve_thread = threading.Thread(target=lambda: self.serve_forever(shutdown_delay))
-        self.observer = watchdog.observers.polling.PollingObserver(timeout=polling_interval)
+        self.watcher = watcher
+        # Paths that can't be watched by `observer` are polled by `_polling_observer`.
+        self._polling_observer = watchdog.observers.polling.PollingObserver(
+            timeout=polling_interval
+        )
+        self.observer = (
+            self._polling_observer if watcher == 'polling' else watchdog.observers.Observer()
+        )
+
+        # Compressed responses of the current version of the site, see `_gzip`.
+        self._gzip_cache: dict[tuple[str, str, bool], tuple[bytes, Any, bytes]] = {}
+        self._gzip_epoch = self._visible_epoch
+        self._gzip_lock = threading.Lock()
+
+        # Set by `set_site_files`, for each path relative to `root`.
+        self._site_files: dict[str, _SiteFile] | None = None
 
         self._watched_paths: dict[str, int] = {}
-        self._watch_refs: dict[str, Any] = {}
+        # For each watched path: the observer, the watch and the handler.
+        self._watch_refs: dict[str, tuple[Any, Any, watchdog.events.FileSystemEventHandler]] = {}
 
     def watch(self, path: str, func: None = None, *, recursive: bool = True) -> None:
         """Add the 'path' to watched paths, call the function and reload when any file changes under it."""
@@ -147,18 +243,52 @@ class LiveReloadServer(socketserver.ThreadingMixIn, wsgiref.simple_server.WSGISe
             return
         self._watched_paths[path] = 1
 
+        observer = self.observer
+        if self.watcher == 'auto' and observer is not self._polling_observer:
+            if _filesystem_type(path) in _REMOTE_FILESYSTEMS:
+                log.debug(f"Polling '{path}' for changes, as it's on a network file system")
+                observer = self._polling_observer
+            elif _contains_symlinks(path, recursive):
+                log.debug(f"Polling '{path}' for changes, as it contains symlinks")
+                observer = self._polling_observer
+        # A native watch on a file follows its inode, which editors replace when they save the
+        # file by renaming a new one over it. So watch the directory, and filter by the path.
+        only_path = None
+        watch_path = path
+        if observer is not self._polling_observer and os.path.isfile(path):
+            only_path = path
+            watch_path = os.path.dirname(path)
+            recursive = False
+
         def callback(event):
-            if event.is_directory:
+            # Native observers also report files being opened and read, such as by the build.
+            if event.is_directory or event.event_type in ('opened', 'closed_no_write'):
+                return
+            if only_path is not None and only_path not in (
+                event.src_path,
+                getattr(event, 'dest_path', None),
+            ):
                 return
             log.debug(str(event))
             with self._rebuild_cond:
                 self._want_rebuild = True
+                self._changed_paths.add(event.src_path)
+                if dest_path := getattr(event, 'dest_path', None):
+                    self._changed_paths.add(dest_path)
                 self._rebuild_cond.notify_all()
 
         handler = watchdog.events.FileSystemEventHandler()
         handler.on_any_event = callback  # type: ignore[method-assign]
         log.debug(f"Watching '{path}'")
-        self._watch_refs[path] = self.observer.schedule(handler, path, recursive=recursive)
+        try:
+            watch = observer.schedule(handler, watch_path, recursive=recursive)
+        except OSError as e:
+            if observer is self._polling_observer:
+                raise
+            log.warning(f"Can't watch '{path}' for changes natively ({e}), polling it instead")
+            observer = self._polling_observer
+            watch = observer.schedule(handler, watch_path, recursive=recursive)
+        self._watch_refs[path] = (observer, watch, handler)
 
     def unwatch(self, path: str) -> None:
         """Stop watching file changes for path. Raises if there was no corresponding `watch` call."""
@@ -167,14 +297,40 @@ class LiveReloadServer(socketserver.ThreadingMixIn, wsgiref.simple_server.WSGISe
         self._watched_paths[path] -= 1
         if self._watched_paths[path] <= 0:
             self._watched_paths.pop(path)
-            self.observer.unschedule(self._watch_refs.pop(path))
+            observer, watch, handler = self._watch_refs.pop(path)
+            # Files in the same directory share the watch of the directory.
+            if any(o is observer and w == watch for o, w, _ in self._watch_refs.values()):
+                observer.remove_handler_for_watch(handler, watch)
+            else:
+                observer.unschedule(watch)
+
+    def _start_observers(self) -> None:
+        """Start watching, falling back to polling if native events turn out not to be available."""
+        if self.observer is not self._polling_observer:
+            try:
+                self.observer.start()
+            except OSError as e:
+                log.warning(f"Can't watch for changes natively ({e}), polling instead")
+                # The emitters that were already started are stopped by this.
+                self.observer.unschedule_all()
+                for path, (observer, watch, handler) in self._watch_refs.items():
+                    if observer is self.observer:
+                        self._watch_refs[path] = (
+                            self._polling_observer,
+                            self._polling_observer.schedule(
+                                handler, watch.path, recursive=watch.is_recursive
+                            ),
+                            handler,
+                        )
+                self.observer = self._polling_observer
+        self._polling_observer.start()
 
     def serve(self, *, open_in_browser=False):
         self.server_bind()
         self.server_activate()
 
         if self._watched_paths:
-            self.observer.start()
+            self._start_observers()
 
             paths_str = ", ".join(f"'{_try_relativize_path(path)}'" for path in self._watched_paths)
             log.info(f"Watching paths for changes: {paths_str}")
@@ -206,6 +362,8 @@ class LiveReloadServer(socketserver.ThreadingMixIn, wsgiref.simple_server.WSGISe
 
                 self._wanted_epoch = _timestamp()
                 self._want_rebuild = False
+                self._build_changed_paths = frozenset(self._changed_paths)
+                self._changed_paths.clear()
 
             try:
                 self.builder()
@@ -225,17 +383,143 @@ class LiveReloadServer(socketserver.ThreadingMixIn, wsgiref.simple_server.WSGISe
                 self._epoch_cond.notify_all()
 
     def shutdown(self, wait=False) -> None:
-        self.observer.stop()
+        observers = {self.observer, self._polling_observer}
+        for observer in observers:
+            observer.stop()
         with self._rebuild_cond:
             self._shutdown = True
             self._rebuild_cond.notify_all()
+        with self._epoch_cond:
+            self._epoch_cond.notify_all()
+            event_clients = list(self._event_clients)
+            self._event_clients.clear()
+        for connection in event_clients:
+            self._close_event_client(connection)
 
         if self.serve_thread.is_alive():
             super().shutdown()
         self.server_close()
         if wait:
             self.serve_thread.join()
-            self.observer.join()
+            if self._events_thread is not None:
+                self._events_thread.join()
+            for observer in observers:
+                if observer.is_alive():
+                    observer.join()
+
+    def shutdown_request(self, request) -> None:
+        with self._epoch_cond:
+            if request in self._event_clients:
+                return  # The connection stays open, to send events.
+        super().shutdown_request(request)
+
+    def _subscribe_to_events(self, handler: _Handler) -> bool:
+        """
+        If the request is for the event stream, take over its connection and return True.
+
+        The browser gets the new epoch as a server-sent event as soon as the site is rebuilt.
+        All the connections are written to by one thread, see `_events_loop`, so unlike the
+        polling requests they don't keep a thread each. That's why they're made non-blocking
+        after the response headers are sent.
+        """
+        m = re.fullmatch(r"/livereload/events/([0-9]+)/[0-9]+", handler.path)
+        if handler.command != "GET" or not m:
+            return False
+        epoch = int(m[1])
+        connection = handler.connection
+        connection.settimeout(10)
+        handler.log_request(200)
+        self._log_poll_request(handler.headers.get("Referer"), request_id=handler.path)
+        with self._epoch_cond:
+            message = (
+                b"HTTP/1.0 200 OK\r\n"
+                b"Content-Type: text/event-stream\r\n"
+                b"Cache-Control: no-cache\r\n"
+                b"\r\n"
+                b"retry: 3000\n\n"
+            )
+            if self._visible_epoch > epoch:
+                message += b"data: %d\n\n" % self._visible_epoch
+            try:
+                connection.sendall(message)
+                connection.setblocking(False)
+            except OSError:
+                return True
+            self._event_clients.add(connection)
+            if self._events_thread is None:
+                self._events_thread = threading.Thread(target=self._events_loop, daemon=True)
+                self._events_thread.start()
+        return True
+
+    def _events_loop(self) -> None:
+        """
+        Send each new epoch to all browsers that listen for events, and keep them connected.
+
+        A browser that doesn't take the whole message at once, such as a suspended tab whose
+        socket buffer is full, is disconnected, so that it can't delay the others. It reconnects
+        once it resumes, and then gets the latest epoch.
+        """
+        with self._epoch_cond:
+            sent_epoch = self._visible_epoch
+        while True:
+            with self._epoch_cond:
+                if not self._shutdown and self._visible_epoch == sent_epoch:
+                    self._epoch_cond.wait(timeout=self.events_keepalive_interval)
+                if self._shutdown:
+                    return
+                if self._visible_epoch != sent_epoch:
+                    sent_epoch = self._visible_epoch
+                    message = b"data: %d\n\n" % sent_epoch
+                else:
+                    # Lets closed connections be noticed, and keeps proxies from closing open ones.
+                    message = b": keepalive\n\n"
+                event_clients = list(self._event_clients)
+            for connection in event_clients:
+                try:
+                    if connection.send(message) == len(message):
+                        continue
+                except OSError:
+                    pass
+                with self._epoch_cond:
+                    self._event_clients.discard(connection)
+                self._close_event_client(connection)
+
+    @classmethod
+    def _close_event_client(cls, connection: socket.socket) -> None:
+        try:
+            connection.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        connection.close()
+
+    def set_site_files(self, files: Mapping[str, bytes | str]) -> None:
+        """
+        Serve the site from these files instead of reading it from `root`, until the next call.
+
+        `files` maps paths relative to `root` to the content, or to the path of a file that has the
+        content, like `mkdocs.utils.output.MemoryOutput.files`. Paths that aren't in it are still
+        looked up in `root`. This is meant to be called by the builder.
+        """
+        self._site_files = {
+            rel_path: _SiteFile(self._guess_type(rel_path), content, rel_path.endswith('.html'))
+            for rel_path, content in files.items()
+        }
+
+    def read_site_file(self, rel_path: str) -> bytes | None:
+        """Return the content of a file of the site (without the livereload script), or None."""
+        site_files = self._site_files
+        if site_files is not None and rel_path in site_files:
+            site_file = site_files[rel_path]
+            if site_file.path is None:
+                return b''.join(site_file.chunks)
+            file_path = site_file.path
+        else:
+            file_path = os.path.join(self.root, rel_path)
+        try:
+            with open(file_path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
 
     def serve_request(self, environ, start_response) -> Iterable[bytes]:
         try:
@@ -300,43 +584,144 @@ class LiveReloadServer(socketserver.ThreadingMixIn, wsgiref.simple_server.WSGISe
         with self._epoch_cond:
             self._epoch_cond.wait_for(lambda: self._visible_epoch == self._wanted_epoch)
             epoch = self._visible_epoch
-
-        try:
-            file: BinaryIO = open(file_path, "rb")
-        except OSError:
-            if not path.endswith("/") and os.path.isfile(os.path.join(file_path, "index.html")):
+            site_files = self._site_files
+
+        inject_js = bool(self._watched_paths)
+        site_file = None
+        if site_files is not None:
+            if rel_file_path in site_files:
+                site_file = site_files[rel_file_path]
+                if site_file.path is not None:
+                    file_path = site_file.path
+                    site_file = None
+            elif not path.endswith("/") and f"{rel_file_path}/index.html" in site_files:
                 start_response("302 Found", [("Location", urllib.parse.quote(path) + "/")])
                 return []
-            return None  # Not found
 
-        if self._watched_paths and file_path.endswith(".html"):
+        file: BinaryIO | None = None
+        if site_file is not None:
+            content_type = site_file.content_type
+            inject_js = inject_js and site_file.is_html
+            etag = site_file.etag
+            size = sum(map(len, site_file.chunks))
+        else:
+            try:
+                file = open(file_path, "rb")
+            except OSError:
+                if not path.endswith("/") and os.path.isfile(os.path.join(file_path, "index.html")):
+                    start_response("302 Found", [("Location", urllib.parse.quote(path) + "/")])
+                    return []
+                return None  # Not found
+            content_type = self._guess_type(file_path)
+            inject_js = inject_js and file_path.endswith(".html")
+            st = os.fstat(file.fileno())
+            etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+            size = st.st_size
+
+        compressible = _is_compressible(content_type)
+        use_gzip = (
+            compressible
+            and size >= _GZIP_MIN_SIZE
+            and _accepts_gzip(environ.get("HTTP_ACCEPT_ENCODING", ""))
+        )
+        # Each version of the site and each encoding of the file is a separate representation.
+        response_etag = _epoch_etag(etag, epoch) if inject_js else etag
+        if use_gzip:
+            response_etag = f'{response_etag[:-1]}-gzip"'
+        # Browsers may keep the file, but have to check that it's still the same on every use.
+        headers = [("ETag", response_etag), ("Cache-Control", "no-cache")]
+        if compressible:
+            headers.append(("Vary", "Accept-Encoding"))
+
+        if_none_match = environ.get("HTTP_IF_NONE_MATCH")
+        if if_none_match is not None and _etag_matches(if_none_match, response_etag):
+            if file is not None:
+                file.close()
+            start_response("304 Not Modified", headers)
+            return []
+
+        if site_file is None and not inject_js and not use_gzip:
+            assert file is not None
+            start_response(
+                "200 OK",
+                [("Content-Type", content_type), ("Content-Length", str(size)), *headers],
+            )
+            return wsgiref.util.FileWrapper(file)
+
+        def get_chunks() -> tuple[bytes, bytes]:
+            if site_file is not None:
+                return site_file.chunks
+            assert file is not None
             with file:
                 content = file.read()
-            content = self._inject_js_into_html(content, epoch)
-            file = io.BytesIO(content)
-            content_length = len(content)
+            body_end = _find_body_end(content) if inject_js else len(content)
+            return content[:body_end], content[body_end:]
+
+        script = self._livereload_script(epoch) if inject_js else None
+        if use_gzip:
+            key = (rel_file_path if site_file is not None else file_path, etag, inject_js)
+            chunks = [self._gzip(key, epoch, get_chunks, script)]
+            if file is not None:
+                file.close()
+            headers.append(("Content-Encoding", "gzip"))
         else:
-            content_length = os.path.getsize(file_path)
-
-        content_type = self._guess_type(file_path)
+            head, tail = get_chunks()
+            chunks = [head, tail] if script is None else [head, script, tail]
         start_response(
-            "200 OK", [("Content-Type", content_type), ("Content-Length", str(content_length))]
+            "200 OK",
+            [
+                ("Content-Type", content_type),
+                ("Content-Length", str(sum(map(len, chunks)))),
+                *headers,
+            ],
         )
-        return wsgiref.util.FileWrapper(file)
+        return chunks
 
-    def _inject_js_into_html(self, content, epoch):
-        try:
-            body_end = content.rindex(b"</body>")
-        except ValueError:
-            body_end = len(content)
+    def _gzip(
+        self,
+        key: tuple[str, str, bool],
+        epoch: int,
+        get_chunks: Callable[[], tuple[bytes, bytes]],
+        script: bytes | None,
+    ) -> bytes:
+        """
+        Return the content compressed with gzip, with the livereload script between the chunks.
+
+        Each file is compressed at most once for each version of the site. The script is
+        different in every response, so for HTML only the part before the script is compressed
+        in advance, and a copy of the compressor's state continues from there.
+        """
+        with self._gzip_lock:
+            if epoch > self._gzip_epoch:
+                self._gzip_epoch = epoch
+                self._gzip_cache = {}
+            entry: tuple[bytes, Any, bytes] | None = (
+                self._gzip_cache.get(key) if epoch == self._gzip_epoch else None
+            )
+        if entry is None:
+            head, tail = get_chunks()
+            # 31 means a gzip header and trailer.
+            compressor = zlib.compressobj(_GZIP_LEVEL, zlib.DEFLATED, 31)
+            if script is None:
+                entry = (compressor.compress(head + tail) + compressor.flush(), None, b"")
+            else:
+                entry = (compressor.compress(head), compressor, tail)
+            with self._gzip_lock:
+                if epoch == self._gzip_epoch:
+                    self._gzip_cache[key] = entry
+        compressed, state, tail = entry
+        if state is None:
+            return compressed
+        assert script is not None
+        state = state.copy()
+        return compressed + state.compress(script + tail) + state.flush()
+
+    @classmethod
+    def _livereload_script(cls, epoch: int) -> bytes:
         # The page will reload if the livereload poller returns a newer epoch than what it knows.
         # The other timestamp becomes just a unique identifier for the initiating page.
         script = _SCRIPT_TEMPLATE.substitute(epoch=epoch, request_id=_timestamp())
-        return b"%b<script>%b</script>%b" % (
-            content[:body_end],
-            script.encode(),
-            content[body_end:],
-        )
+        return b"<script>%b</script>" % script.encode()
 
     @classmethod
     @functools.lru_cache  # "Cache" to not repeat the same message for the same browser tab.
@@ -358,19 +743,146 @@ class LiveReloadServer(socketserver.ThreadingMixIn, wsgiref.simple_server.WSGISe
         return "application/octet-stream"
 
 
+class _SiteFile:
+    """A file of the site passed to `LiveReloadServer.set_site_files`."""
+
+    __slots__ = ('content_type', 'path', 'chunks', 'is_html', '_etag')
+
+    def __init__(self, content_type: str, content: bytes | str, is_html: bool) -> None:
+        self.content_type = content_type
+        self.is_html = is_html
+        self._etag: str | None = None
+        # Either the path of a file to serve, or the content. HTML content is split in two
+        # where the livereload script goes.
+        self.path: str | None = None
+        self.chunks: tuple[bytes, bytes] = (b'', b'')
+        if isinstance(content, str):
+            self.path = content
+        else:
+            body_end = _find_body_end(content) if is_html else len(content)
+            self.chunks = (content[:body_end], content[body_end:])
+
+    @property
+    def etag(self) -> str:
+        """A strong ETag of the content, only for files that aren't served from a path."""
+        if self._etag is None:
+            h = hashlib.blake2b(digest_size=16)
+            for chunk in self.chunks:
+                h.update(chunk)
+            self._etag = f'"{h.hexdigest()}"'
+        return self._etag
+
+
 class _Handler(wsgiref.simple_server.WSGIRequestHandler):
+    server: LiveReloadServer
+
+    def parse_request(self) -> bool:
+        if not super().parse_request():
+            return False
+        # An event stream isn't a WSGI request, the server takes over the connection instead.
+        # Returning False makes `handle` finish without responding.
+        return not self.server._subscribe_to_events(self)
+
     def log_request(self, code="-", size="-"):
-        level = logging.DEBUG if str(code) == "200" else logging.WARNING
+        level = logging.DEBUG if str(code) in ("200", "304") else logging.WARNING
         log.log(level, f'"{self.requestline}" code {code}')
 
     def log_message(self, format, *args):
         log.debug(format, *args)
 
 
+def _find_body_end(content: bytes) -> int:
+    """Return where the livereload script goes in the HTML."""
+    try:
+        return content.rindex(b"</body>")
+    except ValueError:
+        return len(content)
+
+
+def _epoch_etag(etag: str, epoch: int) -> str:
+    """Return the ETag of HTML with the livereload script, which depends on the site's version."""
+    return f'{etag[:-1]}-{epoch:x}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Return True if the value of an `If-None-Match` header matches the ETag."""
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, so a weak validator can match a strong one.
+    return any(
+        (tag[2:] if tag.startswith("W/") else tag) == etag
+        for tag in map(str.strip, if_none_match.split(","))
+    )
+
+
+def _is_compressible(content_type: str) -> bool:
+    return content_type.startswith("text/") or content_type in _COMPRESSIBLE_TYPES
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Return True if the value of an `Accept-Encoding` header allows gzip."""
+    qualities = {}
+    for item in accept_encoding.split(","):
+        coding, *params = item.split(";")
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.strip().lower()] = quality
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
+
+
 def _timestamp() -> int:
     return round(time.monotonic() * 1000)
 
 
+def _filesystem_type(path: str) -> str | None:
+    """Return the type of the file system that contains the path, or None if it's unknown."""
+    try:
+        with open('/proc/self/mounts', encoding='utf-8') as f:
+            mounts = [line.split()[1:3] for line in f]
+    except OSError:
+        return None
+    path = os.path.realpath(path)
+    fs_type, longest = None, -1
+    for mount_point, typ in mounts:
+        # Spaces and other special characters in the mount point are octal escapes.
+        mount_point = re.sub(r'\\([0-7]{3})', lambda m: chr(int(m[1], 8)), mount_point)
+        # Later mounts on the same mount point hide the earlier ones.
+        if len(mount_point) >= longest and (
+            path == mount_point or path.startswith(mount_point.rstrip('/') + '/')
+        ):
+            fs_type, longest = typ, len(mount_point)
+    return fs_type
+
+
+def _contains_symlinks(path: str, recursive: bool = True) -> bool:
+    """
+    Return True if the path is a symlink, or a directory that has a symlink inside.
+
+    The walk stops at the first symlink that it finds, so only a tree without any symlinks is
+    walked fully. If `recursive` is false, only the direct children of the directory are checked.
+    """
+    if os.path.islink(path):
+        return True
+    dirs = [path]
+    while dirs:
+        try:
+            with os.scandir(dirs.pop()) as entries:
+                for entry in entries:
+                    if entry.is_symlink():
+                        return True
+                    if recursive and entry.is_dir(follow_symlinks=False):
+                        dirs.append(entry.path)
+        except OSError:
+            pass
+    return False
+
+
 def _try_relativize_path(path: str) -> str:
     """Make the path relative to current directory if it's under that directory."""
     p = pathlib.Path(path)
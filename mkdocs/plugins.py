@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 import sys
+import time
 from typing import TYPE_CHECKING, Any, Callable, Generic, Literal, MutableMapping, TypeVar, overload
 
 if sys.version_info >= (3, 10):
@@ -23,6 +24,7 @@ if TYPE_CHECKING:
     from mkdocs.structure.files import Files
     from mkdocs.structure.nav import Navigation
     from mkdocs.structure.pages import Page
+    from mkdocs.utils.profiling import Profiler
     from mkdocs.utils.templates import TemplateContext
 
 if TYPE_CHECKING:
@@ -500,6 +502,8 @@ class PluginCollection(dict, MutableMapping[str, BasePlugin]):
     """
 
     _current_plugin: str | None
+    _profiler: Profiler | None = None
+    """If set, the time taken by each event handler is recorded into it."""
 
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
@@ -559,13 +563,22 @@ class PluginCollection(dict, MutableMapping[str, BasePlugin]):
         """
         pass_item = item is not None
         for method in self.events[name]:
-            self._current_plugin = self._event_origins.get(method, '<unknown>')
+            self._current_plugin = plugin_name = self._event_origins.get(method, '<unknown>')
             if log.getEffectiveLevel() <= logging.DEBUG:
-                log.debug(f"Running `{name}` event from plugin '{self._current_plugin}'")
+                log.debug(f"Running `{name}` event from plugin '{plugin_name}'")
+            start = time.perf_counter()
             if pass_item:
                 result = method(item, **kwargs)
             else:
                 result = method(**kwargs)
+            if self._profiler is not None:
+                self._profiler.add(
+                    'event',
+                    name,
+                    start,
+                    time.perf_counter() - start,
+                    plugin=plugin_name,
+                )
             # keep item if method returned `None`
             if result is not None:
                 item = result
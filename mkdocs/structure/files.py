@@ -1,15 +1,29 @@
 from __future__ import annotations
 
+import concurrent.futures
 import enum
 import fnmatch
 import logging
 import os
 import posixpath
+import re
 import shutil
+import sys
 import warnings
-from functools import cached_property
 from pathlib import PurePath, PurePosixPath
-from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Mapping, Sequence, overload
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ClassVar,
+    Generic,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+    TypeVar,
+    overload,
+)
 from urllib.parse import quote as urlquote
 
 import pathspec
@@ -27,6 +41,8 @@ if TYPE_CHECKING:
 
 log = logging.getLogger(__name__)
 
+T = TypeVar('T')
+
 
 class InclusionLevel(enum.Enum):
     EXCLUDED = -3
@@ -59,11 +75,37 @@ class InclusionLevel(enum.Enum):
         return self.value <= self.NOT_IN_NAV.value
 
 
+_FILE_KINDS = ('documentation_page', 'static_page', 'media_file', 'javascript', 'css')
+
+
 class Files:
-    """A collection of [File][mkdocs.structure.files.File] objects."""
+    """
+    A collection of [File][mkdocs.structure.files.File] objects.
+
+    The lists of files of each kind (`documentation_pages()` etc.) are indexed and cached;
+    each call returns a new list, which the caller is free to modify.
+    """
 
     def __init__(self, files: Iterable[File]) -> None:
         self._src_uris = {f.src_uri: f for f in files}
+        # Excluded directories that `get_files` didn't scan, see `prune_excluded_docs`.
+        self._pruned_dirs: tuple[str, ...] = ()
+        self._reset_indexes()
+
+    def _reset_indexes(self) -> None:
+        # Files by kind (keyed by `src_uri` to keep their order), built on first use and then
+        # kept up to date by `append` and `remove`.
+        self._kinds: dict[str, dict[str, File]] | None = None
+        self._by_dest_uri: dict[str, File] | None = None
+        # Query results, dropped whenever the collection changes or any file is reassigned a
+        # different inclusion level or path.
+        self._views: dict[tuple[str, frozenset[InclusionLevel] | None], tuple[File, ...]] = {}
+        self._views_generation = File._generation
+        self._version = getattr(self, '_version', 0) + 1
+
+    def _state(self) -> tuple[int, int]:
+        """A value that changes whenever a file is added or removed, or any file's path is reassigned."""
+        return self._version, File._generation
 
     def __iter__(self) -> Iterator[File]:
         """Iterate over the files within."""
@@ -77,6 +119,10 @@ class Files:
         """Soft-deprecated, prefer `get_file_from_path(path) is not None`."""
         return PurePath(path).as_posix() in self._src_uris
 
+    def _is_in_pruned_dir(self, src_uri: str) -> bool:
+        """Whether `src_uri` is in an excluded directory, whose files aren't in the collection."""
+        return src_uri.startswith(self._pruned_dirs) if self._pruned_dirs else False
+
     @property
     def src_paths(self) -> dict[str, File]:
         """Soft-deprecated, prefer `src_uris`."""
@@ -92,7 +138,18 @@ class Files:
 
     def get_file_from_path(self, path: str) -> File | None:
         """Return a File instance with File.src_uri equal to path."""
-        return self._src_uris.get(PurePath(path).as_posix())
+        # Most lookups are of already normalized paths, which don't need a PurePath.
+        file = self._src_uris.get(path)
+        if file is None:
+            file = self._src_uris.get(PurePath(path).as_posix())
+        return file
+
+    def get_file_from_dest_uri(self, dest_uri: str) -> File | None:
+        """Return a File instance with File.dest_uri equal to dest_uri."""
+        self._check_views()
+        if self._by_dest_uri is None:
+            self._by_dest_uri = {f.dest_uri: f for f in self}
+        return self._by_dest_uri.get(dest_uri)
 
     def append(self, file: File) -> None:
         """Add file to the Files collection."""
@@ -100,8 +157,14 @@ class Files:
             warnings.warn(
                 "To replace an existing file, call `remove` before `append`.", DeprecationWarning
             )
-            del self._src_uris[file.src_uri]
+            self._unindex(self._src_uris.pop(file.src_uri))
         self._src_uris[file.src_uri] = file
+        if self._kinds is not None:
+            self._index_kinds(file)
+        if self._by_dest_uri is not None:
+            self._by_dest_uri[file.dest_uri] = file
+        self._views.clear()
+        self._version += 1
 
     def remove(self, file: File) -> None:
         """Remove file from Files collection."""
@@ -109,39 +172,111 @@ class Files:
             del self._src_uris[file.src_uri]
         except KeyError:
             raise ValueError(f'{file.src_uri!r} not in collection')
+        self._unindex(file)
+
+    def _index_kinds(self, file: File) -> None:
+        assert self._kinds is not None
+        for kind, by_src_uri in self._kinds.items():
+            if getattr(file, f'is_{kind}')():
+                by_src_uri[file.src_uri] = file
+
+    def _unindex(self, file: File) -> None:
+        if self._kinds is not None:
+            for by_src_uri in self._kinds.values():
+                by_src_uri.pop(file.src_uri, None)
+        self._by_dest_uri = None
+        self._views.clear()
+        self._version += 1
+
+    def _check_views(self) -> None:
+        if self._views_generation != File._generation:
+            self._views.clear()
+            self._by_dest_uri = None
+            self._views_generation = File._generation
+
+    def _view(
+        self, kind: str, inclusion: Callable[[InclusionLevel], bool] | None = None
+    ) -> Sequence[File]:
+        """Return the files of the given kind (and inclusion levels), as a cached tuple."""
+        self._check_views()
+        levels = None if inclusion is None else frozenset(filter(inclusion, InclusionLevel))
+        try:
+            return self._views[kind, levels]
+        except KeyError:
+            pass
+        if self._kinds is None:
+            self._kinds = {kind: {} for kind in _FILE_KINDS}
+            for file in self:
+                self._index_kinds(file)
+        candidates = self._kinds[kind].values()
+        if levels is None:
+            view = tuple(candidates)
+        else:
+            view = tuple(f for f in candidates if f.inclusion in levels)
+        self._views[kind, levels] = view
+        return view
 
     def copy_static_files(
         self,
         dirty: bool = False,
         *,
         inclusion: Callable[[InclusionLevel], bool] = InclusionLevel.is_included,
+        copy_strategy: str = 'copy',
+        jobs: int = 1,
     ) -> None:
-        """Copy static files from source to destination."""
-        for file in self:
-            if not file.is_documentation_page() and inclusion(file.inclusion):
-                file.copy_file(dirty)
+        """
+        Copy static files from source to destination.
+
+        If `jobs` is greater than 1, the files are copied by that many threads. Files that have
+        the same destination are still copied in order, so the last one of them wins.
+        """
+        files = [f for f in self if not f.is_documentation_page() and inclusion(f.inclusion)]
+
+        def copy_files(group: Iterable[File]) -> None:
+            for file in group:
+                if type(file).copy_file is File.copy_file:
+                    file._copy_file(dirty, copy_strategy)
+                else:
+                    # Subclasses from plugins may override `copy_file`, which has no strategy.
+                    file.copy_file(dirty)
+
+        if jobs <= 1 or len(files) <= 1:
+            for file in files:
+                os.makedirs(os.path.dirname(file.abs_dest_path), exist_ok=True)
+                copy_files([file])
+            return
+
+        by_dest: dict[str, list[File]] = {}
+        for file in files:
+            by_dest.setdefault(file.abs_dest_path, []).append(file)
+        for output_dir in sorted({os.path.dirname(path) for path in by_dest}):
+            os.makedirs(output_dir, exist_ok=True)
+
+        with concurrent.futures.ThreadPoolExecutor(jobs) as executor:
+            for future in [executor.submit(copy_files, group) for group in by_dest.values()]:
+                future.result()
 
     def documentation_pages(
         self, *, inclusion: Callable[[InclusionLevel], bool] = InclusionLevel.is_included
     ) -> Sequence[File]:
         """Return iterable of all Markdown page file objects."""
-        return [file for file in self if file.is_documentation_page() and inclusion(file.inclusion)]
+        return list(self._view('documentation_page', inclusion))
 
     def static_pages(self) -> Sequence[File]:
         """Return iterable of all static page file objects."""
-        return [file for file in self if file.is_static_page()]
+        return list(self._view('static_page'))
 
     def media_files(self) -> Sequence[File]:
         """Return iterable of all file objects which are not documentation or static pages."""
-        return [file for file in self if file.is_media_file()]
+        return list(self._view('media_file'))
 
     def javascript_files(self) -> Sequence[File]:
         """Return iterable of all javascript file objects."""
-        return [file for file in self if file.is_javascript()]
+        return list(self._view('javascript'))
 
     def css_files(self) -> Sequence[File]:
         """Return iterable of all CSS file objects."""
-        return [file for file in self if file.is_css()]
+        return list(self._view('css'))
 
     def add_files_from_theme(self, env: jinja2.Environment, config: MkDocsConfig) -> None:
         """Retrieve static files from Jinja environment and add to collection."""
@@ -176,6 +311,50 @@ class Files:
     def _files(self, value: Iterable[File]):
         warnings.warn("Do not access Files._files.", DeprecationWarning)
         self._src_uris = {f.src_uri: f for f in value}
+        self._reset_indexes()
+
+
+class _slot_cached_property(Generic[T]):
+    """
+    Same as `functools.cached_property`, but stores the value in the slot named `_<name>`.
+
+    So it doesn't need a per-instance `__dict__`. As with `cached_property`, the value can be
+    overwritten by assigning to it, and deleting it makes it be computed again on next access.
+    Either of these invalidates the cached queries of `Files` (see `File._generation`).
+    """
+
+    def __init__(self, func: Callable[[Any], T]) -> None:
+        self.func = func
+        self.__doc__ = func.__doc__
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.slot = owner.__dict__[f'_{name}']
+
+    @overload
+    def __get__(self, instance: None, owner: type | None = None) -> _slot_cached_property[T]:
+        ...
+
+    @overload
+    def __get__(self, instance: object, owner: type | None = None) -> T:
+        ...
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            return self.slot.__get__(instance, owner)
+        except AttributeError:
+            value = self.func(instance)
+            self.slot.__set__(instance, value)
+            return value
+
+    def __set__(self, instance: object, value: T) -> None:
+        self.slot.__set__(instance, value)
+        File._generation += 1
+
+    def __delete__(self, instance: object) -> None:
+        self.slot.__delete__(instance)
+        File._generation += 1
 
 
 class File:
@@ -212,6 +391,25 @@ class File:
     additional transformations to the path, based on `use_directory_urls`.
     """
 
+    __slots__ = (
+        'src_uri',
+        'use_directory_urls',
+        'src_dir',
+        'dest_dir',
+        '_inclusion',
+        'generated_by',
+        '_content',
+        'page',
+        '_name',
+        '_dest_uri',
+        '_url',
+        '_abs_src_path',
+        '_abs_dest_path',
+        # Plugins may still set other attributes; the dict is only allocated when they do.
+        '__dict__',
+        '__weakref__',
+    )
+
     src_uri: str
     """The pure path (always '/'-separated) of the source file relative to the source directory."""
 
@@ -232,15 +430,12 @@ class File:
     dest_dir: str
     """The OS path of the destination directory (top-level site_dir) that the file should be copied to."""
 
-    inclusion: InclusionLevel = InclusionLevel.UNDEFINED
-    """Whether the file will be excluded from the built site."""
-
-    generated_by: str | None = None
+    generated_by: str | None
     """If not None, indicates that a plugin generated this file on the fly.
 
     The value is the plugin's entrypoint name and can be used to find the plugin by key in the PluginCollection."""
 
-    _content: str | bytes | None = None
+    _content: str | bytes | None
     """If set, the file's content will be read from here.
 
     This logic is handled by `content_bytes`/`content_string`, which should be used instead of
@@ -264,7 +459,20 @@ class File:
     def dest_path(self, value: str):
         self.dest_uri = PurePath(value).as_posix()
 
-    page: Page | None = None
+    page: Page | None
+
+    _generation: ClassVar[int] = 0
+    """Incremented whenever the inclusion or a path of any file is reassigned, see `Files`."""
+
+    @property
+    def inclusion(self) -> InclusionLevel:
+        """Whether the file will be excluded from the built site."""
+        return self._inclusion
+
+    @inclusion.setter
+    def inclusion(self, value: InclusionLevel):
+        self._inclusion = value
+        File._generation += 1
 
     @overload
     @classmethod
@@ -338,12 +546,16 @@ class File:
         inclusion: InclusionLevel = InclusionLevel.UNDEFINED,
     ) -> None:
         self.src_path = path
-        self.src_dir = src_dir
-        self.dest_dir = dest_dir
+        # Interned, so that all files share one copy of the docs_dir and site_dir paths.
+        self.src_dir = None if src_dir is None else sys.intern(src_dir)
+        self.dest_dir = sys.intern(dest_dir)
         self.use_directory_urls = use_directory_urls
         if dest_uri is not None:
-            self.dest_uri = dest_uri
-        self.inclusion = inclusion
+            self._dest_uri = dest_uri
+        self._inclusion = inclusion
+        self.generated_by = None
+        self._content = None
+        self.page = None
 
     def __repr__(self):
         return (
@@ -368,7 +580,7 @@ class File:
         stem, ext = posixpath.splitext(filename)
         return 'index' if stem == 'README' else stem
 
-    name = cached_property(_get_stem)
+    name = _slot_cached_property(_get_stem)
     """Return the name of the file without its extension."""
 
     def _get_dest_path(self, use_directory_urls: bool | None = None) -> str:
@@ -386,7 +598,7 @@ class File:
                 return posixpath.join(parent, self.name, 'index.html')
         return self.src_uri
 
-    dest_uri = cached_property(_get_dest_path)
+    dest_uri = _slot_cached_property(_get_dest_path)
     """The pure path (always '/'-separated) of the destination file relative to the destination directory."""
 
     def _get_url(self, use_directory_urls: bool | None = None) -> str:
@@ -397,12 +609,14 @@ class File:
             use_directory_urls = self.use_directory_urls
         if use_directory_urls and filename == 'index.html':
             url = (dirname or '.') + '/'
-        return urlquote(url)
+        quoted = urlquote(url)
+        # Share the string with `dest_uri` when nothing needed quoting.
+        return url if quoted == url else quoted
 
-    url = cached_property(_get_url)
+    url = _slot_cached_property(_get_url)
     """The URI of the destination file relative to the destination directory as a string."""
 
-    @cached_property
+    @_slot_cached_property
     def abs_src_path(self) -> str | None:
         """
         The absolute concrete path of the source file. Will use backslashes on Windows.
@@ -413,7 +627,7 @@ class File:
             return None
         return os.path.normpath(os.path.join(self.src_dir, self.src_uri))
 
-    @cached_property
+    @_slot_cached_property
     def abs_dest_path(self) -> str:
         """The absolute concrete path of the destination file. Will use backslashes on Windows."""
         return os.path.normpath(os.path.join(self.dest_dir, self.dest_uri))
@@ -472,25 +686,31 @@ class File:
 
     def copy_file(self, dirty: bool = False) -> None:
         """Copy source file to destination, ensuring parent directories exist."""
+        os.makedirs(os.path.dirname(self.abs_dest_path), exist_ok=True)
+        self._copy_file(dirty)
+
+    def _copy_file(self, dirty: bool, copy_strategy: str = 'copy') -> None:
+        """
+        Like `copy_file`, but the parent directory of the destination must exist.
+
+        See `mkdocs.utils.filecopy` for the possible values of `copy_strategy`.
+        """
         if dirty and not self.is_modified():
             log.debug(f"Skip copying unmodified file: '{self.src_uri}'")
             return
         log.debug(f"Copying media file: '{self.src_uri}'")
         output_path = self.abs_dest_path
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
         content = self._content
         if content is None:
             assert self.abs_src_path is not None
             try:
-                utils.copy_file(self.abs_src_path, output_path)
+                utils._copy_file(self.abs_src_path, output_path, copy_strategy)
             except shutil.SameFileError:
                 pass  # Let plugins write directly into site_dir.
         elif isinstance(content, str):
-            with open(output_path, 'w', encoding='utf-8') as output_file:
-                output_file.write(content)
+            utils._write_file(content.encode('utf-8'), output_path)
         else:
-            with open(output_path, 'wb') as output_file:
-                output_file.write(content)
+            utils._write_file(content, output_path)
 
     def is_modified(self) -> bool:
         if self._content is not None:
@@ -526,66 +746,210 @@ _default_exclude = pathspec.gitignore.GitIgnoreSpec.from_lines(['.*', '/template
 
 def set_exclusions(files: Iterable[File], config: MkDocsConfig) -> None:
     """Re-calculate which files are excluded, based on the patterns in the config."""
-    exclude: pathspec.gitignore.GitIgnoreSpec | None = config.get('exclude_docs')
-    exclude = _default_exclude + exclude if exclude else _default_exclude
-    drafts: pathspec.gitignore.GitIgnoreSpec | None = config.get('draft_docs')
-    nav_exclude: pathspec.gitignore.GitIgnoreSpec | None = config.get('not_in_nav')
-
+    matcher = _get_inclusion_matcher(config)
     for file in files:
         if file.inclusion == InclusionLevel.UNDEFINED:
-            if exclude.match_file(file.src_uri):
-                file.inclusion = InclusionLevel.EXCLUDED
-            elif drafts and drafts.match_file(file.src_uri):
-                file.inclusion = InclusionLevel.DRAFT
-            elif nav_exclude and nav_exclude.match_file(file.src_uri):
-                file.inclusion = InclusionLevel.NOT_IN_NAV
-            else:
-                file.inclusion = InclusionLevel.INCLUDED
+            file.inclusion = matcher.get(file.src_uri)
+
+
+_LITERAL_PREFIX_RE = re.compile(r'\^((?:[^\\.^$*+?{}\[\]|()]|\\[^A-Za-z0-9])*)([*+?{]?)')
+
+
+def _literal_prefix(pattern: pathspec.Pattern) -> str:
+    """Return the literal text that all paths matched by the pattern start with (can be empty)."""
+    regex = getattr(pattern, 'regex', None)
+    m = regex and _LITERAL_PREFIX_RE.match(regex.pattern)
+    if not m:
+        return ''
+    prefix = re.sub(r'\\(.)', r'\1', m[1])
+    # A quantifier makes the last character optional or repeated.
+    return prefix[:-1] if m[2] else prefix
+
+
+class _InclusionMatcher:
+    """
+    Decides the `InclusionLevel` of files, from the `exclude_docs`, `draft_docs` and `not_in_nav` patterns.
+
+    Patterns that are anchored to a literal prefix (such as `/api/`) can only match files in some
+    directories. So for each directory, the patterns are narrowed down once to those that can
+    match its files, and often no pattern needs to be checked at all. The results are cached.
+    """
+
+    def __init__(
+        self,
+        exclude: pathspec.gitignore.GitIgnoreSpec,
+        drafts: pathspec.gitignore.GitIgnoreSpec | None,
+        nav_exclude: pathspec.gitignore.GitIgnoreSpec | None,
+    ) -> None:
+        self._specs = [
+            (
+                level,
+                [(p, _literal_prefix(p)) for p in spec.patterns if p.include is not None],
+            )
+            for level, spec in (
+                (InclusionLevel.EXCLUDED, exclude),
+                (InclusionLevel.DRAFT, drafts),
+                (InclusionLevel.NOT_IN_NAV, nav_exclude),
+            )
+            if spec
+        ]
+        self._dir_specs: dict[
+            str, list[tuple[InclusionLevel, pathspec.gitignore.GitIgnoreSpec]]
+        ] = {}
+        self._results: dict[str, InclusionLevel] = {}
+
+    def _specs_for_dir(
+        self, dir: str
+    ) -> list[tuple[InclusionLevel, pathspec.gitignore.GitIgnoreSpec]]:
+        """Return the specs narrowed down to the patterns that can match files directly in `dir`."""
+        try:
+            return self._dir_specs[dir]
+        except KeyError:
+            pass
+        specs = []
+        for level, patterns in self._specs:
+            candidates = [
+                pattern
+                for pattern, prefix in patterns
+                if dir.startswith(prefix)
+                or (prefix.startswith(dir) and '/' not in prefix[len(dir) :])
+            ]
+            if candidates:
+                specs.append((level, pathspec.gitignore.GitIgnoreSpec(candidates)))
+        self._dir_specs[dir] = specs
+        return specs
+
+    def get(self, src_uri: str) -> InclusionLevel:
+        try:
+            return self._results[src_uri]
+        except KeyError:
+            pass
+        level = InclusionLevel.INCLUDED
+        for spec_level, spec in self._specs_for_dir(src_uri[: src_uri.rfind('/') + 1]):
+            if spec.match_file(src_uri):
+                level = spec_level
+                break
+        self._results[src_uri] = level
+        return level
+
+
+_inclusion_matchers: dict[tuple, _InclusionMatcher] = {}
+
+
+def _get_inclusion_matcher(config: MkDocsConfig) -> _InclusionMatcher:
+    """Get a matcher for the patterns in the config, reusing it as long as the patterns are the same (e.g. across rebuilds in `mkdocs serve`)."""
+    specs = (_get_exclude_spec(config), config.get('draft_docs'), config.get('not_in_nav'))
+    key = tuple(
+        None
+        if spec is None
+        else tuple((getattr(p, 'regex', None), p.include) for p in spec.patterns)
+        for spec in specs
+    )
+    try:
+        return _inclusion_matchers[key]
+    except KeyError:
+        pass
+    if len(_inclusion_matchers) >= 8:
+        _inclusion_matchers.clear()
+    matcher = _inclusion_matchers[key] = _InclusionMatcher(*specs)
+    return matcher
+
+
+def _get_exclude_spec(config: MkDocsConfig) -> pathspec.gitignore.GitIgnoreSpec:
+    exclude: pathspec.gitignore.GitIgnoreSpec | None = config.get('exclude_docs')
+    return _default_exclude + exclude if exclude else _default_exclude
+
+
+def _walk_docs_dir(
+    docs_dir: str, prune: pathspec.gitignore.GitIgnoreSpec | None = None
+) -> tuple[list[str], list[str]]:
+    """
+    Return the relative paths of all files under `docs_dir`, in the same order as `os.walk` would.
+
+    Directories are scanned concurrently. If `prune` is given, a directory that it excludes as a
+    whole isn't descended into - which is only possible when the patterns don't contain any
+    negated patterns. The relative paths of those directories (ending with '/') are returned too.
+    """
+    if prune is not None and any(pattern.include is False for pattern in prune.patterns):
+        prune = None
+    scanned: dict[str, tuple[list[str], list[str]]] = {}
+    pruned: list[str] = []
+
+    def scan(relative_dir: str) -> tuple[str, list[str], list[str]]:
+        filenames, dirnames = [], []
+        try:
+            with os.scandir(os.path.join(docs_dir, relative_dir)) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if not is_dir:
+                        filenames.append(entry.name)
+                    elif prune is not None and prune.match_file(f'{relative_dir}{entry.name}/'):
+                        pruned.append(f'{relative_dir}{entry.name}/')
+                    else:
+                        dirnames.append(entry.name)
+        except OSError:
+            pass
+        filenames.sort(key=_file_sort_key)
+        dirnames.sort()
+        return relative_dir, filenames, dirnames
+
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        pending = {executor.submit(scan, '')}
+        while pending:
+            done, pending = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                relative_dir, filenames, dirnames = future.result()
+                scanned[relative_dir] = (filenames, dirnames)
+                pending.update(executor.submit(scan, f'{relative_dir}{d}/') for d in dirnames)
+
+    result: list[str] = []
+    stack = ['']
+    while stack:
+        relative_dir = stack.pop()
+        filenames, dirnames = scanned[relative_dir]
+        result.extend(relative_dir + filename for filename in filenames)
+        stack.extend(f'{relative_dir}{d}/' for d in reversed(dirnames))
+    return result, sorted(pruned)
 
 
 def get_files(config: MkDocsConfig) -> Files:
     """Walk the `docs_dir` and return a Files collection."""
     files: list[File] = []
+    files_by_dest: dict[tuple[str, str], File] = {}
     conflicting_files: list[tuple[File, File]] = []
-    for source_dir, dirnames, filenames in os.walk(config['docs_dir'], followlinks=True):
-        relative_dir = os.path.relpath(source_dir, config['docs_dir'])
-        dirnames.sort()
-        filenames.sort(key=_file_sort_key)
-
-        files_by_dest: dict[str, File] = {}
-        for filename in filenames:
-            file = File(
-                os.path.join(relative_dir, filename),
-                config['docs_dir'],
-                config['site_dir'],
-                config['use_directory_urls'],
-            )
-            # Skip README.md if an index file also exists in dir (part 1)
-            prev_file = files_by_dest.setdefault(file.dest_uri, file)
-            if prev_file is not file:
-                conflicting_files.append((prev_file, file))
-            files.append(file)
-            prev_file = file
+    paths, pruned_dirs = _walk_docs_dir(
+        config['docs_dir'], _get_exclude_spec(config) if config.get('prune_excluded_docs') else None
+    )
+    for path in paths:
+        file = File(path, config['docs_dir'], config['site_dir'], config['use_directory_urls'])
+        # Skip README.md if an index file also exists in dir (part 1)
+        key = (posixpath.dirname(path), file.dest_uri)
+        prev_file = files_by_dest.setdefault(key, file)
+        if prev_file is not file:
+            conflicting_files.append((prev_file, file))
+        files.append(file)
 
     set_exclusions(files, config)
     # Skip README.md if an index file also exists in dir (part 2)
+    removed: dict[int, File] = {}
     for a, b in conflicting_files:
         if b.inclusion.is_included():
-            if a.inclusion.is_included():
+            if a.inclusion.is_included() and id(a) not in removed:
                 log.warning(
                     f"Excluding '{a.src_uri}' from the site because it conflicts with '{b.src_uri}'."
                 )
-            try:
-                files.remove(a)
-            except ValueError:
-                pass  # Catching this to avoid errors if attempting to remove the same file twice.
+            removed[id(a)] = a
         else:
-            try:
-                files.remove(b)
-            except ValueError:
-                pass
+            removed[id(b)] = b
 
-    return Files(files)
+    result = Files([file for file in files if id(file) not in removed])
+    result._pruned_dirs = tuple(pruned_dirs)
+    return result
 
 
 def file_sort_key(f: File, /):
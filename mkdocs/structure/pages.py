@@ -1,14 +1,18 @@
 from __future__ import annotations
 
+import contextlib
 import enum
 import logging
 import posixpath
+import threading
 import warnings
+import weakref
 from typing import TYPE_CHECKING, Any, Callable, Iterator, MutableMapping, Sequence
 from urllib.parse import unquote as urlunquote
 from urllib.parse import urljoin, urlsplit, urlunsplit
 
 import markdown
+import markdown.extensions.abbr
 import markdown.extensions.toc
 import markdown.htmlparser  # type: ignore
 import markdown.postprocessors
@@ -20,6 +24,7 @@ from mkdocs.structure import StructureItem
 from mkdocs.structure.toc import get_toc
 from mkdocs.utils import _removesuffix, get_build_date, get_markdown_title, meta, weak_property
 from mkdocs.utils.rendering import get_heading_text
+from mkdocs.utils.yaml import RelativeDirPlaceholder
 
 if TYPE_CHECKING:
     from xml.etree import ElementTree as etree
@@ -265,31 +270,29 @@ class Page(StructureItem):
         if self.markdown is None:
             raise RuntimeError("`markdown` field hasn't been set (via `read_source`)")
 
-        md = markdown.Markdown(
-            extensions=config['markdown_extensions'],
-            extension_configs=config['mdx_configs'] or {},
-        )
-
-        raw_html_ext = _RawHTMLPreprocessor()
-        raw_html_ext._register(md)
+        pool = _MarkdownPool.for_config(config)
+        with pool.acquire() as md:
+            raw_html_ext = _RawHTMLPreprocessor()
+            raw_html_ext._register(md)
 
-        extract_anchors_ext = _ExtractAnchorsTreeprocessor(self.file, files, config)
-        extract_anchors_ext._register(md)
+            extract_anchors_ext = _ExtractAnchorsTreeprocessor(self.file, files, config)
+            extract_anchors_ext._register(md)
 
-        relative_path_ext = _RelativePathTreeprocessor(self.file, files, config)
-        relative_path_ext._register(md)
+            relative_path_ext = _RelativePathTreeprocessor(self.file, files, config)
+            relative_path_ext._register(md)
 
-        extract_title_ext = _ExtractTitleTreeprocessor()
-        extract_title_ext._register(md)
+            extract_title_ext = _ExtractTitleTreeprocessor()
+            extract_title_ext._register(md)
 
-        self.content = md.convert(self.markdown)
-        self.toc = get_toc(getattr(md, 'toc_tokens', []))
+            self.content = md.convert(self.markdown)
+            self.toc = get_toc(getattr(md, 'toc_tokens', []))
         self._title_from_render = extract_title_ext.title
         self.present_anchor_ids = (
             extract_anchors_ext.present_anchor_ids | raw_html_ext.present_anchor_ids
         )
         if log.getEffectiveLevel() > logging.DEBUG:
             self.links_to_anchors = relative_path_ext.links_to_anchors
+        self._link_targets = relative_path_ext.link_targets
 
     present_anchor_ids: set[str] | None = None
     """Anchor IDs that this page contains (can be linked to in this page)."""
@@ -301,6 +304,12 @@ class Page(StructureItem):
     Populated after `.render()`. Populated only if `validation: {anchors: info}` (or greater) is set.
     """
 
+    _link_targets: dict[str, File | None] | None = None
+    """All paths that links on this page were looked up as, mapped to the file that was found, if any.
+
+    Populated after `.render()`. The rendered content stays valid as long as these lookups give the same result.
+    """
+
     def validate_anchor_links(self, *, files: Files, log_level: int) -> None:
         if not self.links_to_anchors:
             return
@@ -326,6 +335,97 @@ class Page(StructureItem):
                 )
 
 
+class _MarkdownPool:
+    """
+    Instances of `Markdown` that get reused for rendering pages, instead of constructing one for each page.
+
+    Constructing a `Markdown` instance imports and instantiates all extensions and populates all
+    registries of processors. Instead, after a page is rendered, the instance is `reset()` and
+    then used for another page, which replaces the page-specific processors that MkDocs registers.
+
+    That is safe only if the extensions clear their state in `reset()`. So instances are reused
+    only if all processors come from Python-Markdown or PyMdown Extensions, otherwise each page
+    gets a new instance as before. The same happens if the config contains a `!relative` value,
+    because extensions can resolve it when they are constructed.
+    """
+
+    _REUSABLE_MODULES = ('markdown.', 'pymdownx.')
+    # Before Markdown 3.6, abbreviations from one page would stay for the next ones.
+    _ABBR_RESETS = hasattr(markdown.extensions.abbr.AbbrExtension, 'reset')
+
+    def __init__(self, extensions: list, extension_configs: dict[str, dict]) -> None:
+        self.extensions = list(extensions)
+        self.extension_configs = {k: dict(v) for k, v in extension_configs.items()}
+        self.reusable: bool | None = None
+        if _contains_relative_dir(self.extension_configs):
+            self.reusable = False
+        self._idle: list[markdown.Markdown] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_config(cls, config: MkDocsConfig) -> _MarkdownPool:
+        """Get the pool stored on the config, or a new one if the Markdown config has changed."""
+        extensions = config['markdown_extensions']
+        extension_configs = config['mdx_configs'] or {}
+        pool = getattr(config, '_markdown_pool', None)
+        if (
+            pool is None
+            or pool.extensions != extensions
+            or pool.extension_configs != extension_configs
+        ):
+            pool = cls(extensions, extension_configs)
+            config._markdown_pool = pool
+        return pool
+
+    @contextlib.contextmanager
+    def acquire(self) -> Iterator[markdown.Markdown]:
+        with self._lock:
+            md = self._idle.pop() if self._idle else None
+        if md is None:
+            md = markdown.Markdown(
+                extensions=self.extensions, extension_configs=self.extension_configs
+            )
+            if self.reusable is None:
+                self.reusable = self._is_reusable(md)
+                if not self.reusable:
+                    log.debug("Creating a new Markdown instance for each page.")
+
+        yield md
+
+        # If the rendering failed, the instance doesn't get back into the pool.
+        if self.reusable:
+            md.reset()
+            with self._lock:
+                self._idle.append(md)
+
+    @classmethod
+    def _is_reusable(cls, md: markdown.Markdown) -> bool:
+        registries = (
+            md.preprocessors,
+            md.parser.blockprocessors,
+            md.treeprocessors,
+            md.inlinePatterns,
+            md.postprocessors,
+        )
+        for item in [*md.registeredExtensions, *(item for reg in registries for item in reg)]:
+            module = type(item).__module__
+            if not module.startswith(cls._REUSABLE_MODULES):
+                return False
+            if module == 'markdown.extensions.abbr' and not cls._ABBR_RESETS:
+                return False
+        return True
+
+
+def _contains_relative_dir(value: Any) -> bool:
+    if isinstance(value, RelativeDirPlaceholder):
+        return True
+    if isinstance(value, dict):
+        value = value.values()
+    elif not isinstance(value, (list, tuple)):
+        return False
+    return any(_contains_relative_dir(v) for v in value)
+
+
 class _ExtractAnchorsTreeprocessor(markdown.treeprocessors.Treeprocessor):
     def __init__(self, file: File, files: Files, config: MkDocsConfig) -> None:
         self.present_anchor_ids: set[str] = set()
@@ -343,12 +443,54 @@ class _ExtractAnchorsTreeprocessor(markdown.treeprocessors.Treeprocessor):
         md.treeprocessors.register(self, "mkdocs_extract_anchors", priority=5)  # Same as 'toc'.
 
 
+class _LinkResolver:
+    """
+    Memoizes the resolution of links between documentation files, for all pages of a build.
+
+    A link that resolves to an existing file is remembered per source directory, as is the URL of
+    each target relative to each page directory. Nothing else is memoized, so broken links are
+    still reported for every page. The resolver is thrown away when a file is added to or removed
+    from `files`, when a file's path or URL is reassigned, or when used with another config.
+    """
+
+    def __init__(self, files: Files, config: MkDocsConfig) -> None:
+        self.files = files
+        self.config = config
+        self.state = files._state()
+        # (source directory, href) -> (target_uri, target file, query, anchor)
+        self.links: dict[tuple[str, str], tuple[str, File, str, str]] = {}
+        # (page directory, target URL) -> relative URL
+        self.relative_urls: dict[tuple[str, str], str] = {}
+
+    @classmethod
+    def for_files(cls, files: Files, config: MkDocsConfig) -> _LinkResolver:
+        resolver = _link_resolvers.get(files)
+        if resolver is None or resolver.config is not config or resolver.state != files._state():
+            resolver = _link_resolvers[files] = cls(files, config)
+        return resolver
+
+    def get_relative_url(self, url: str, other: str) -> str:
+        """Same as `utils.get_relative_url`, memoized."""
+        dirname, _, basename = other.rpartition('/')
+        key = (dirname if '.' in basename else other, url)
+        try:
+            return self.relative_urls[key]
+        except KeyError:
+            result = self.relative_urls[key] = utils.get_relative_url(url, other)
+            return result
+
+
+_link_resolvers: weakref.WeakKeyDictionary[Files, _LinkResolver] = weakref.WeakKeyDictionary()
+
+
 class _RelativePathTreeprocessor(markdown.treeprocessors.Treeprocessor):
     def __init__(self, file: File, files: Files, config: MkDocsConfig) -> None:
         self.file = file
         self.files = files
         self.config = config
         self.links_to_anchors: dict[File, dict[str, str]] = {}
+        self.link_targets: dict[str, File | None] = {}
+        self._resolver = _LinkResolver.for_files(files, config)
 
     def run(self, root: etree.Element) -> etree.Element:
         """
@@ -417,6 +559,12 @@ class _RelativePathTreeprocessor(markdown.treeprocessors.Treeprocessor):
                     tried.add(guess)
 
     def path_to_url(self, url: str) -> str:
+        link_key = (posixpath.dirname(self.file.src_uri), url)
+        link = self._resolver.links.get(link_key)
+        if link is not None:
+            self.link_targets[link[0]] = link[1]
+            return self._link_to_file(url, *link)
+
         scheme, netloc, path, query, anchor = urlsplit(url)
 
         absolute_link = None
@@ -451,7 +599,12 @@ class _RelativePathTreeprocessor(markdown.treeprocessors.Treeprocessor):
         else:
             # Validate that the target exists in files collection.
             target_uri = next(possible_target_uris)
-            target_file = self.files.get_file_from_path(target_uri)
+            target_file = self._get_file(target_uri)
+
+        if target_file is None and not warning and self.files._is_in_pruned_dir(target_uri):
+            # The target is in an excluded directory that wasn't scanned.
+            self._log_link_to_excluded(target_uri)
+            return url
 
         if target_file is None and not warning:
             # Primary lookup path had no match, definitely produce a warning, just choose which one.
@@ -478,7 +631,7 @@ class _RelativePathTreeprocessor(markdown.treeprocessors.Treeprocessor):
             if warning_level > logging.DEBUG:
                 suggest_url = ''
                 for path in possible_target_uris:
-                    if self.files.get_file_from_path(path) is not None:
+                    if self._get_file(path) is not None:
                         if anchor and path == self.file.src_uri:
                             path = ''
                         elif absolute_link is _AbsoluteLinksValidationValue.RELATIVE_TO_DOCS:
@@ -497,24 +650,36 @@ class _RelativePathTreeprocessor(markdown.treeprocessors.Treeprocessor):
 
         assert target_uri is not None
         assert target_file is not None
+        self._resolver.links[link_key] = (target_uri, target_file, query, anchor)
+        return self._link_to_file(url, target_uri, target_file, query, anchor)
 
+    def _link_to_file(
+        self, url: str, target_uri: str, target_file: File, query: str, anchor: str
+    ) -> str:
         if anchor:
             # Register that this page links to the target file with an anchor.
             self.links_to_anchors.setdefault(target_file, {}).setdefault(anchor, url)
 
         if target_file.inclusion.is_excluded():
-            if self.file.inclusion.is_excluded():
-                warning_level = logging.DEBUG
-            else:
-                warning_level = min(logging.INFO, self.config.validation.links.not_found)
-            warning = (
-                f"Doc file '{self.file.src_uri}' contains a link to "
-                f"'{target_uri}' which is excluded from the built site."
-            )
-            log.log(warning_level, warning)
-        path = utils.get_relative_url(target_file.url, self.file.url)
+            self._log_link_to_excluded(target_uri)
+        path = self._resolver.get_relative_url(target_file.url, self.file.url)
         return urlunsplit(('', '', path, query, anchor))
 
+    def _log_link_to_excluded(self, target_uri: str) -> None:
+        if self.file.inclusion.is_excluded():
+            warning_level = logging.DEBUG
+        else:
+            warning_level = min(logging.INFO, self.config.validation.links.not_found)
+        warning = (
+            f"Doc file '{self.file.src_uri}' contains a link to "
+            f"'{target_uri}' which is excluded from the built site."
+        )
+        log.log(warning_level, warning)
+
+    def _get_file(self, path: str) -> File | None:
+        file = self.link_targets[path] = self.files.get_file_from_path(path)
+        return file
+
     def _register(self, md: markdown.Markdown) -> None:
         md.treeprocessors.register(self, "relpath", 0)
 
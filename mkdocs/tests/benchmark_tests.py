@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+
+import functools
+import os
+import posixpath
+import sys
+import time
+import tracemalloc
+import unittest
+
+from mkdocs import utils
+from mkdocs.structure.files import File, Files
+
+
+@functools.lru_cache(maxsize=None)
+def _previous_norm_parts(path):
+    if not path.startswith('/'):
+        path = '/' + path
+    path = posixpath.normpath(path)[1:]
+    return path.split('/') if path else []
+
+
+def _previous_get_relative_url(url, other):
+    """The implementation of `utils.get_relative_url` before its path parts were interned."""
+    dirname, _, basename = other.rpartition('/')
+    if '.' in basename:
+        other = dirname
+
+    other_parts = _previous_norm_parts(other)
+    dest_parts = _previous_norm_parts(url)
+    common = 0
+    for a, b in zip(other_parts, dest_parts):
+        if a != b:
+            break
+        common += 1
+
+    rel_parts = ['..'] * (len(other_parts) - common) + dest_parts[common:]
+    relurl = '/'.join(rel_parts) or '.'
+    return relurl + '/' if url.endswith('/') else relurl
+
+
+@unittest.skipUnless(os.environ.get('MKDOCS_BENCHMARK'), "set MKDOCS_BENCHMARK=1 to run")
+class BenchmarkTests(unittest.TestCase):
+    def _report(self, name, value):
+        sys.stderr.write(f"\n{name}: {value}\n")
+
+    def test_files_memory(self):
+        docs_dir, site_dir = os.path.abspath('docs'), os.path.abspath('site')
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            files = Files(
+                File(
+                    f'section{i // 1000}/sub{i // 100}/{"page" if i % 4 else "image"}{i}.'
+                    + ('md' if i % 4 else 'png'),
+                    docs_dir,
+                    site_dir,
+                    use_directory_urls=True,
+                )
+                for i in range(200_000)
+            )
+            for file in files:
+                # Compute the derived paths, which are then cached in the file.
+                paths = (file.url, file.abs_src_path, file.abs_dest_path)
+            after = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+        self.assertEqual(paths[0], 'section199/sub1999/page199999/')
+        per_file = (after - before) / len(files)
+        self._report('Memory per File, including its paths (bytes)', round(per_file))
+        self.assertLess(per_file, 800)
+
+    def test_get_relative_url(self):
+        # Like a site with 1000 pages: the nav, the assets and a few content links on each page.
+        pages = [f'section{i // 100}/sub{i // 10}/page{i}/' for i in range(1000)]
+        assets = ['css/theme.css', 'js/theme.js', 'img/favicon.ico', 'search/main.js', '.']
+        calls = [
+            (url, page)
+            for n, page in enumerate(pages)
+            for url in pages[::4] + assets + pages[n % 990 : n % 990 + 10]
+        ]
+        expected = [_previous_get_relative_url(url, other) for url, other in calls]
+        self.assertEqual([utils.get_relative_url(url, other) for url, other in calls], expected)
+
+        def best_time(func):
+            times = []
+            for _ in range(5):
+                start = time.perf_counter()
+                for url, other in calls:
+                    func(url, other)
+                times.append(time.perf_counter() - start)
+            return min(times)
+
+        # Timings are too noisy on shared machines to assert on, so they're only reported.
+        previous = best_time(_previous_get_relative_url)
+        current = best_time(utils.get_relative_url)
+        self._report(
+            f'get_relative_url over {len(calls)} calls (previous, current, speedup)',
+            (round(previous, 4), round(current, 4), round(previous / current, 2)),
+        )
@@ -6,6 +6,7 @@ import io
 import os.path
 import re
 import textwrap
+import time
 import unittest
 from pathlib import Path
 from typing import TYPE_CHECKING
@@ -20,7 +21,8 @@ from mkdocs.structure.files import File, Files
 from mkdocs.structure.nav import get_navigation
 from mkdocs.structure.pages import Page
 from mkdocs.tests.base import PathAssertionMixin, load_config, tempdir
-from mkdocs.utils import meta
+from mkdocs.utils import meta, normalize_url, profiling
+from mkdocs.utils.output import MemoryOutput, OutputManifest
 
 if TYPE_CHECKING:
     from mkdocs.config.defaults import MkDocsConfig
@@ -218,6 +220,43 @@ class BuildTests(PathAssertionMixin, unittest.TestCase):
         context = build.get_context(mock.Mock(), mock.Mock(), cfg)
         self.assertEqual(context['config']['extra']['a'], 1)
 
+    def test_site_context_extra_urls(self):
+        cfg = load_config(
+            extra_css=['style.css', 'foo/bar/style.css', '/abs.css'],
+            extra_javascript=['https://example.com/script.js', 'foo/script.js'],
+            use_directory_urls=False,
+        )
+        fs = [
+            File(path, cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls)
+            for path in [
+                'index.md',
+                'foo/index.md',
+                'foo/a.md',
+                'baz/a.md',
+                'foo/bar/a.md',
+                'foo/baz/a.md',
+                'baz/bar/a.md',
+                'baz/b.md',
+                'qux/a.md',
+                'style.css/a.md',
+            ]
+        ]
+        files = Files(fs)
+        nav = get_navigation(files, cfg)
+        expected = [build.get_context(nav, files, cfg, page) for page in nav.pages]
+        site_context = build._SiteContext(nav, files, cfg)
+        with mock.patch('mkdocs.utils.normalize_url', wraps=normalize_url) as mock_normalize:
+            contexts = [site_context.get_context(page) for page in nav.pages]
+        for context, expected_context in zip(contexts, expected):
+            with self.subTest(page=context['page']):
+                self.assertEqual(context['extra_css'], expected_context['extra_css'])
+                self.assertEqual(context['extra_javascript'], expected_context['extra_javascript'])
+                self.assertEqual(context['build_date_utc'], site_context.build_date_utc)
+        # 'baz/', 'baz/b.html' and 'qux/' share URLs, as do 'foo/' and 'foo/a.html'. But pages
+        # under 'foo/bar/' or 'style.css/' can have a path prefix in common with some of them.
+        self.assertEqual(len(nav.pages), 10)
+        self.assertEqual(mock_normalize.call_count, 7 * 5)
+
     # Test build._build_theme_template
 
     @mock.patch('mkdocs.utils.write_file')
@@ -239,7 +278,10 @@ class BuildTests(PathAssertionMixin, unittest.TestCase):
         cfg = load_config(site_dir=site_dir)
         env = cfg.theme.get_env()
         build._build_theme_template('sitemap.xml', env, Files([]), cfg, mock.Mock())
-        mock_write_file.assert_called_once()
+        self.assertEqual(
+            [args[1] for args, kwargs in mock_write_file.call_args_list],
+            [os.path.join(site_dir, 'sitemap.xml'), os.path.join(site_dir, 'sitemap.xml.gz')],
+        )
         mock_build_template.assert_called_once()
         mock_gzip_gzipfile.assert_called_once()
 
@@ -680,6 +722,31 @@ class BuildTests(PathAssertionMixin, unittest.TestCase):
 
             self.assertPathNotExists(site_dir, '.zoo.html')
 
+    @tempdir(
+        files={
+            'index.md': 'page1 content, [draft](drafts/a.md), [missing](missing.md)',
+            'drafts/a.md': 'page2 content',
+        }
+    )
+    @tempdir()
+    def test_links_to_excluded_dirs(self, site_dir, docs_dir):
+        for prune_excluded_docs in False, True:
+            with self.subTest(prune_excluded_docs=prune_excluded_docs):
+                cfg = load_config(
+                    docs_dir=docs_dir,
+                    site_dir=site_dir,
+                    use_directory_urls=False,
+                    exclude_docs='drafts/',
+                    prune_excluded_docs=prune_excluded_docs,
+                )
+                expected_logs = '''
+                    INFO:Doc file 'index.md' contains a link to 'drafts/a.md' which is excluded from the built site.
+                    WARNING:Doc file 'index.md' contains a link 'missing.md', but the target is not found among documentation files.
+                '''
+                with self._assert_build_logs(expected_logs):
+                    build.build(cfg)
+                self.assertPathNotExists(site_dir, 'drafts', 'a.html')
+
     @tempdir(
         files={
             'foo/README.md': 'page1 content',
@@ -740,6 +807,454 @@ class BuildTests(PathAssertionMixin, unittest.TestCase):
         with self._assert_build_logs(expected_logs):
             build.build(cfg)
 
+    @tempdir(
+        files={
+            'test/foo.md': '## page1 heading\n\n[bar](bar.md#page1-heading) [baz](baz.md)',
+            'test/bar.md': '# Bar title\n\n## page2 heading\n\n[aaa](#a) [foo](foo.md#page1-heading)',
+        }
+    )
+    @tempdir()
+    def test_populate_pages_in_parallel(self, site_dir, docs_dir):
+        cfg = load_config(docs_dir=docs_dir, site_dir=site_dir, validation={'anchors': 'warn'})
+
+        expected_logs = '''
+            WARNING:Doc file 'test/foo.md' contains a link 'baz.md', but the target 'test/baz.md' is not found among documentation files.
+            WARNING:Doc file 'test/bar.md' contains a link '#a', but there is no such anchor on this page.
+            WARNING:Doc file 'test/foo.md' contains a link 'bar.md#page1-heading', but the doc 'test/bar.md' does not contain an anchor '#page1-heading'.
+        '''
+        outputs = {}
+        for jobs in 1, 3:
+            with self.subTest(jobs=jobs):
+                with self._assert_build_logs(expected_logs):
+                    build.build(cfg, jobs=jobs)
+                outputs[jobs] = {
+                    name: Path(site_dir, 'test', name, 'index.html').read_text()
+                    for name in ('foo', 'bar')
+                }
+                self.assertIn('<title>Bar title - Example</title>', outputs[jobs]['bar'])
+                self.assertIn('<a href="../foo/#page1-heading">foo</a>', outputs[jobs]['bar'])
+        self.assertEqual(outputs[1], outputs[3])
+
+    @tempdir(
+        files={
+            'test/foo.md': '## page1 heading\n\n[bar](bar.md#page1-heading) [baz](baz.md)',
+            'test/bar.md': '# Bar title\n\n## page2 heading\n\n[aaa](#a) [foo](foo.md#page1-heading)',
+        }
+    )
+    @tempdir()
+    @tempdir()
+    def test_render_cache(self, project_dir, site_dir, docs_dir):
+        cfg = load_config(
+            config_file_path=os.path.join(project_dir, 'mkdocs.yml'),
+            docs_dir=docs_dir,
+            site_dir=site_dir,
+            validation={'anchors': 'warn'},
+        )
+
+        expected_logs = '''
+            WARNING:Doc file 'test/foo.md' contains a link 'baz.md', but the target 'test/baz.md' is not found among documentation files.
+            WARNING:Doc file 'test/bar.md' contains a link '#a', but there is no such anchor on this page.
+            WARNING:Doc file 'test/foo.md' contains a link 'bar.md#page1-heading', but the doc 'test/bar.md' does not contain an anchor '#page1-heading'.
+        '''
+        with self._assert_build_logs(expected_logs):
+            build.build(cfg, render_cache=True)
+        outputs = {
+            name: Path(site_dir, 'test', name, 'index.html').read_text() for name in ('foo', 'bar')
+        }
+        self.assertPathIsDir(project_dir, '.cache', 'mkdocs', 'render')
+
+        for jobs in 1, 2:
+            with self.subTest(jobs=jobs):
+                with mock.patch.object(Page, 'render', autospec=True) as mock_render:
+                    with self._assert_build_logs(expected_logs):
+                        build.build(cfg, jobs=jobs, render_cache=True)
+                mock_render.assert_not_called()
+                for name, output in outputs.items():
+                    self.assertEqual(Path(site_dir, 'test', name, 'index.html').read_text(), output)
+
+        # A page that a link points to appears, so only the page with that link is rendered again.
+        Path(docs_dir, 'test', 'baz.md').write_text('baz')
+        expected_logs = '''
+            WARNING:Doc file 'test/bar.md' contains a link '#a', but there is no such anchor on this page.
+            WARNING:Doc file 'test/foo.md' contains a link 'bar.md#page1-heading', but the doc 'test/bar.md' does not contain an anchor '#page1-heading'.
+        '''
+        with mock.patch.object(
+            Page, 'render', autospec=True, side_effect=Page.render
+        ) as mock_render:
+            with self._assert_build_logs(expected_logs):
+                build.build(cfg, render_cache=True)
+        self.assertEqual(
+            sorted(page.file.src_uri for (page, *_), _ in mock_render.call_args_list),
+            ['test/baz.md', 'test/foo.md'],
+        )
+        self.assertIn(
+            '<a href="../baz/">baz</a>', Path(site_dir, 'test', 'foo', 'index.html').read_text()
+        )
+
+        def cache_entries():
+            return sorted(Path(project_dir, '.cache', 'mkdocs', 'render').rglob('*.json'))
+
+        # Entries that a full build didn't use are removed, but not after a dirty build.
+        self.assertEqual(len(cache_entries()), 3)
+        Path(docs_dir, 'test', 'baz.md').unlink()
+        with self.assertLogs('mkdocs'):
+            build.build(cfg, render_cache=True, dirty=True)
+        self.assertEqual(len(cache_entries()), 3)
+        with self.assertLogs('mkdocs'):
+            build.build(cfg, render_cache=True)
+        self.assertEqual(len(cache_entries()), 2)
+
+    @tempdir(files={'foo.md': '# Foo'})
+    @tempdir()
+    @tempdir()
+    def test_render_cache_with_external_inputs(self, project_dir, site_dir, docs_dir):
+        cfg = load_config(
+            config_file_path=os.path.join(project_dir, 'mkdocs.yml'),
+            docs_dir=docs_dir,
+            site_dir=site_dir,
+            markdown_extensions=['abbr'],
+        )
+        with mock.patch.object(build, '_EXTERNAL_INPUT_EXTENSIONS', frozenset({'abbr'})):
+            with self.assertLogs('mkdocs.commands.build', 'INFO') as cm:
+                build.build(cfg, render_cache=True)
+                with mock.patch.object(
+                    Page, 'render', autospec=True, side_effect=Page.render
+                ) as mock_render:
+                    build.build(cfg, render_cache=True)
+        mock_render.assert_called_once()
+        self.assertIn("Markdown extension 'abbr' reads files", '\n'.join(cm.output))
+        self.assertPathNotExists(project_dir, '.cache', 'mkdocs', 'render')
+
+    @tempdir(
+        files={
+            'foo.md': '# Foo\n\n[bar](bar.md) [baz](baz.md)',
+            'bar.md': '# Bar\n\nbar text',
+            'other.md': '# Other\n\nother text',
+            'img.png': '',
+        }
+    )
+    @tempdir()
+    def test_build_with_state(self, site_dir, docs_dir):
+        cfg = load_config(docs_dir=docs_dir, site_dir=site_dir, validation={'not_found': 'info'})
+        state = build._BuildState()
+
+        def build_and_get_rendered(changed_paths):
+            state.changed_paths = changed_paths
+            with mock.patch.object(Page, 'render', autospec=True, side_effect=Page.render) as m:
+                with self.assertLogs('mkdocs') as cm:
+                    build.build(cfg, state=state)
+            self.assertNotIn('WARNING', '\n'.join(cm.output))
+            return sorted(page.file.src_uri for (page, *_), _ in m.call_args_list)
+
+        def mtimes():
+            return {
+                name: Path(site_dir, name, 'index.html').stat().st_mtime_ns
+                for name in ('foo', 'bar', 'other')
+            }
+
+        self.assertEqual(build_and_get_rendered(None), ['bar.md', 'foo.md', 'other.md'])
+
+        # Changing the text of one page: only that page is rendered and written again.
+        before = mtimes()
+        Path(docs_dir, 'bar.md').write_text('# Bar\n\nnew bar text')
+        self.assertEqual(build_and_get_rendered([os.path.join(docs_dir, 'bar.md')]), ['bar.md'])
+        after = mtimes()
+        self.assertIn('new bar text', Path(site_dir, 'bar', 'index.html').read_text())
+        self.assertEqual(before['other'], after['other'])
+        self.assertEqual(before['foo'], after['foo'])
+
+        # Changing the title of a page changes the nav on all pages, but doesn't render them.
+        Path(docs_dir, 'bar.md').write_text('# Renamed bar\n\nnew bar text')
+        self.assertEqual(build_and_get_rendered([os.path.join(docs_dir, 'bar.md')]), ['bar.md'])
+        self.assertIn('Renamed bar', Path(site_dir, 'other', 'index.html').read_text())
+
+        # A new page that is a target of a link: the page with that link is rendered again.
+        Path(docs_dir, 'baz.md').write_text('baz')
+        self.assertEqual(
+            build_and_get_rendered([os.path.join(docs_dir, 'baz.md')]), ['baz.md', 'foo.md']
+        )
+        self.assertIn('<a href="../baz/">baz</a>', Path(site_dir, 'foo', 'index.html').read_text())
+
+        # A deleted file that isn't a page: it might have been included by a page, so everything
+        # is rendered again. Its output is deleted too.
+        Path(docs_dir, 'img.png').unlink()
+        self.assertEqual(
+            build_and_get_rendered([os.path.join(docs_dir, 'img.png')]),
+            ['bar.md', 'baz.md', 'foo.md', 'other.md'],
+        )
+        self.assertPathNotExists(site_dir, 'img.png')
+        self.assertPathIsFile(site_dir, 'other', 'index.html')
+
+        # A change outside of docs_dir, such as the config: everything is rebuilt.
+        self.assertEqual(
+            build_and_get_rendered([cfg.config_file_path]),
+            ['bar.md', 'baz.md', 'foo.md', 'other.md'],
+        )
+
+    @tempdir(
+        files={
+            'index.md': '# Index\n\n--8<-- "inc/snip.txt"',
+            'other.md': '# Other',
+            'inc/snip.txt': 'old snippet',
+        }
+    )
+    @tempdir()
+    def test_build_with_state_and_external_inputs(self, site_dir, docs_dir):
+        cfg = load_config(
+            docs_dir=docs_dir,
+            site_dir=site_dir,
+            markdown_extensions=[{'mkdocs.tests.build_tests': {'base_path': docs_dir}}],
+        )
+        state = build._BuildState()
+
+        def build_and_get_rendered(changed_paths):
+            state.changed_paths = changed_paths
+            with mock.patch.object(Page, 'render', autospec=True, side_effect=Page.render) as m:
+                build.build(cfg, state=state)
+            return sorted(page.file.src_uri for (page, *_), _ in m.call_args_list)
+
+        build_and_get_rendered(None)
+        self.assertIn('old snippet', Path(site_dir, 'index.html').read_text())
+
+        # The included file isn't a page: everything is rendered again.
+        Path(docs_dir, 'inc', 'snip.txt').write_text('new snippet')
+        self.assertEqual(
+            build_and_get_rendered([os.path.join(docs_dir, 'inc', 'snip.txt')]),
+            ['index.md', 'other.md'],
+        )
+        self.assertIn('new snippet', Path(site_dir, 'index.html').read_text())
+
+        # Only a page changed, but the extension may have read it for another page.
+        Path(docs_dir, 'other.md').write_text('# Other\n\nnew text')
+        self.assertEqual(build_and_get_rendered([os.path.join(docs_dir, 'other.md')]), ['other.md'])
+        with mock.patch.object(
+            build, '_EXTERNAL_INPUT_EXTENSIONS', frozenset({'mkdocs.tests.build_tests'})
+        ):
+            Path(docs_dir, 'other.md').write_text('# Other\n\nnewer text')
+            self.assertEqual(
+                build_and_get_rendered([os.path.join(docs_dir, 'other.md')]),
+                ['index.md', 'other.md'],
+            )
+
+    @tempdir(files={'foo.md': '# Foo', 'bar.md': '# Bar', 'img.png': 'image'})
+    @tempdir(files={'old.html': 'old'})
+    @tempdir()
+    def test_build_write_if_changed(self, project_dir, site_dir, docs_dir):
+        cfg = load_config(
+            config_file_path=os.path.join(project_dir, 'mkdocs.yml'),
+            docs_dir=docs_dir,
+            site_dir=site_dir,
+        )
+        names = ['foo/index.html', 'bar/index.html', 'img.png', 'sitemap.xml.gz']
+
+        def mtimes():
+            return {name: Path(site_dir, name).stat().st_mtime_ns for name in names}
+
+        build.build(cfg, write_if_changed=True)
+        self.assertPathIsFile(site_dir, 'old.html')
+        self.assertPathIsFile(project_dir, '.cache', 'mkdocs', 'output.json')
+        before = mtimes()
+        time.sleep(0.01)
+
+        Path(docs_dir, 'bar.md').write_text('# Bar\n\nnew text')
+        with self.assertLogs('mkdocs.commands.build', level='INFO') as cm:
+            build.build(cfg, write_if_changed=True)
+        self.assertIn('new text', Path(site_dir, 'bar', 'index.html').read_text())
+        after = mtimes()
+        self.assertNotEqual(before['bar/index.html'], after['bar/index.html'])
+        for name in 'foo/index.html', 'img.png', 'sitemap.xml.gz':
+            self.assertEqual(before[name], after[name], name)
+        self.assertIn('files were unchanged', '\n'.join(cm.output))
+
+    @tempdir(files={'foo.md': '# Foo', 'img.png': 'image', 'draft.md': 'draft'})
+    @tempdir(
+        files={
+            'old.html': 'old',
+            'old/index.html': 'old',
+            'img.png': 'image',
+            '.hidden': 'hidden',
+        }
+    )
+    def test_build_prune(self, site_dir, docs_dir):
+        cfg = load_config(docs_dir=docs_dir, site_dir=site_dir, draft_docs='draft.md')
+        Path(site_dir, 'draft').mkdir()
+        Path(site_dir, 'draft', 'index.html').write_text('draft')
+
+        with self.assertLogs('mkdocs.commands.build', level='INFO') as cm:
+            build.build(cfg, prune=True)
+        self.assertIn('Removed 3 stale files from the site directory', '\n'.join(cm.output))
+        self.assertPathNotExists(site_dir, 'old.html')
+        self.assertPathNotExists(site_dir, 'old')
+        self.assertPathNotExists(site_dir, 'draft')
+        self.assertPathIsFile(site_dir, 'foo', 'index.html')
+        self.assertPathIsFile(site_dir, '.hidden')
+        self.assertPathIsFile(site_dir, 'img.png')
+
+    @tempdir(files={'index.md': '# Home', 'img.png': 'image'})
+    @tempdir()
+    def test_build_to_memory(self, site_dir, docs_dir):
+        cfg = load_config(docs_dir=docs_dir, site_dir=site_dir)
+        output = MemoryOutput(site_dir)
+        build.build(cfg, output=output)
+        self.assertIn(b'<h1 id="home">Home</h1>', output.files['index.html'])
+        self.assertEqual(output.files['img.png'], os.path.join(docs_dir, 'img.png'))
+        self.assertIn('sitemap.xml.gz', output.files)
+        self.assertIn('css/base.css', output.files)
+        self.assertPathNotExists(site_dir, 'index.html')
+        self.assertPathNotExists(site_dir, 'img.png')
+        self.assertIsNone(OutputManifest.current())
+
+    @tempdir(
+        files={'index.md': '# Home', 'img.png': 'image', 'robots.txt': '{{ config.site_url }}'}
+    )
+    @tempdir()
+    @tempdir()
+    def test_build_hardlink_keeps_sources(self, project_dir, site_dir, docs_dir):
+        cfg = load_config(
+            config_file_path=os.path.join(project_dir, 'mkdocs.yml'),
+            docs_dir=docs_dir,
+            site_dir=site_dir,
+            site_url='https://example.org/',
+            extra_templates=['robots.txt'],
+            copy_strategy='hardlink',
+        )
+        for write_if_changed in False, True, False:
+            with self.subTest(write_if_changed=write_if_changed):
+                build.build(cfg, write_if_changed=write_if_changed)
+                self.assertPathIsFile(site_dir, 'robots.txt')
+                self.assertEqual(Path(site_dir, 'robots.txt').read_text(), 'https://example.org/')
+                self.assertEqual(Path(docs_dir, 'robots.txt').read_text(), '{{ config.site_url }}')
+                self.assertTrue(
+                    os.path.samefile(Path(docs_dir, 'img.png'), Path(site_dir, 'img.png'))
+                )
+
+    @tempdir(
+        files={
+            'index.md': '# Home\n\n[foo](sub/foo-page.md#section)',
+            'sub/foo-page.md': '# Foo title\n\n## Section\n\ntext',
+            'sub/bar.md': 'no title ünïcode',
+        }
+    )
+    @tempdir()
+    @mock.patch.dict(os.environ, {'SOURCE_DATE_EPOCH': '0'})
+    def test_build_low_memory(self, site_dir, docs_dir):
+        def read_site(site_dir):
+            return {
+                path.relative_to(site_dir).as_posix(): path.read_bytes()
+                for path in Path(site_dir).rglob('*')
+                if path.suffix in ('.html', '.json', '.xml')
+            }
+
+        cfg = load_config(
+            docs_dir=docs_dir,
+            site_dir=site_dir,
+            plugins=['search'],
+            validation={'anchors': 'warn'},
+        )
+        build.build(cfg)
+        expected = read_site(cfg.site_dir)
+        self.assertIn(b'Foo title', expected['index.html'])
+        for jobs in 1, 2:
+            with self.subTest(jobs=jobs):
+                build.build(cfg, jobs=jobs, low_memory=True)
+                self.assertEqual(read_site(cfg.site_dir), expected)
+
+        with self.assertRaises(ValueError):
+            build.build(cfg, low_memory=True, state=build._BuildState())
+
+    @tempdir(files={f'page{i}.md': f'# Page {i}' for i in range(12)})
+    @tempdir()
+    def test_build_low_memory_in_parallel_reads_few_pages_ahead(self, site_dir, docs_dir):
+        cfg = load_config(docs_dir=docs_dir, site_dir=site_dir)
+        read_pages = []
+        in_memory = []
+
+        def read_page(page, config, files):
+            # How many pages hold their Markdown when the next one is read.
+            in_memory.append(sum(p.markdown is not None for p in read_pages))
+            read_pages.append(page)
+            return mock.DEFAULT
+
+        with mock.patch.object(build, '_read_page', wraps=build._read_page, side_effect=read_page):
+            build.build(cfg, jobs=2, low_memory=True)
+        self.assertEqual(len(read_pages), 12)
+        self.assertLessEqual(max(in_memory), 5)
+        self.assertIn('Page 11', Path(site_dir, 'page11', 'index.html').read_text())
+
+    def test_page_spill(self):
+        cfg = load_config()
+        page = Page(None, File('foo.md', cfg.docs_dir, cfg.site_dir, True), cfg)
+        page.markdown, page.content = '# Foo ünïcode', '<h1>Foo ünïcode</h1>'
+        other = Page(None, File('bar.md', cfg.docs_dir, cfg.site_dir, True), cfg)
+        other.markdown = '# Bar ünïcode'
+        spill = build._PageSpill()
+        try:
+            for p in page, other:
+                spill.release(p)
+            self.assertIsNone(page.markdown)
+            self.assertIsNone(page.content)
+            self.assertIsNone(other.markdown)
+            self.assertEqual(other.title, 'Bar ünïcode')
+            for p in other, page:
+                spill.restore(p)
+        finally:
+            spill.close()
+        self.assertEqual(page.markdown, '# Foo ünïcode')
+        self.assertEqual(page.content, '<h1>Foo ünïcode</h1>')
+        self.assertEqual(other.markdown, '# Bar ünïcode')
+        self.assertIsNone(other.content)
+
+    @tempdir(files={'foo.md': '# Foo', 'bar.md': '# Bar'})
+    @tempdir()
+    def test_build_with_profiler(self, site_dir, docs_dir):
+        cfg = load_config(docs_dir=docs_dir, site_dir=site_dir, plugins=['search'])
+        for jobs in 1, 2:
+            with self.subTest(jobs=jobs):
+                profiler = profiling.Profiler()
+                build.build(cfg, jobs=jobs, profiler=profiler)
+                self.assertIsNone(cfg.plugins._profiler)
+
+                report = profiler.report(top=1)
+                self.assertEqual(
+                    [p['name'] for p in report['phases']],
+                    [
+                        'config',
+                        'pre_build',
+                        'clean',
+                        'get_files',
+                        'theme',
+                        'files',
+                        'nav',
+                        'populate_pages',
+                        'env',
+                        'copy_static_files',
+                        'static_templates',
+                        'build_pages',
+                        'validate_anchors',
+                        'post_build',
+                    ],
+                )
+                self.assertIn(
+                    dict(plugin='search', event='page_context', calls=2),
+                    [{k: v for k, v in e.items() if k != 'seconds'} for e in report['events']],
+                )
+                self.assertEqual(report['slowest_plugins'][0]['plugin'], 'search')
+                self.assertEqual(len(report['slowest_pages']), 1)
+                self.assertEqual(sorted(p['page'] for p in report['pages']), ['bar.md', 'foo.md'])
+                for page in report['pages']:
+                    for stage in 'read', 'render', 'page_content', 'context', 'template', 'write':
+                        self.assertIn(stage, page)
+                render_pids = {
+                    s.process_id
+                    for s in profiler.spans
+                    if s.category == 'page' and s.name == 'render'
+                }
+                if jobs == 1:
+                    self.assertEqual(render_pids, {os.getpid()})
+                else:
+                    self.assertTrue(render_pids)
+                    self.assertNotIn(os.getpid(), render_pids)
+
     @tempdir(
         files={
             'test/foo.md': '[bar](bar.md#heading1)',
@@ -904,23 +1419,24 @@ class BuildTests(PathAssertionMixin, unittest.TestCase):
                 <p>(Failed to read 'test/bar.md')</p>
                 <p>(Failed to read '../foo.md')</p>''',
         }.items():
-            with self.subTest(base_path=base_path):
-                cfg = f'''
-                    site_name: test
-                    use_directory_urls: false
-                    markdown_extensions:
-                      - mkdocs.tests.build_tests:
-                          base_path: {base_path}
-                '''
-                config = base.load_config(
-                    io.StringIO(cfg), config_file_path=os.path.join(config_dir, 'mkdocs.yml')
-                )
+            for jobs in 1, 2:
+                with self.subTest(base_path=base_path, jobs=jobs):
+                    cfg = f'''
+                        site_name: test
+                        use_directory_urls: false
+                        markdown_extensions:
+                          - mkdocs.tests.build_tests:
+                              base_path: {base_path}
+                    '''
+                    config = base.load_config(
+                        io.StringIO(cfg), config_file_path=os.path.join(config_dir, 'mkdocs.yml')
+                    )
 
-                with self._assert_build_logs(''):
-                    build.build(config)
-                main_path = Path(config_dir, 'site', 'main', 'main.html')
-                self.assertTrue(main_path.is_file())
-                self.assertIn(textwrap.dedent(expected), main_path.read_text())
+                    with self._assert_build_logs(''):
+                        build.build(config, jobs=jobs)
+                    main_path = Path(config_dir, 'site', 'main', 'main.html')
+                    self.assertTrue(main_path.is_file())
+                    self.assertIn(textwrap.dedent(expected), main_path.read_text())
 
     # Test build.site_directory_contains_stale_files
 
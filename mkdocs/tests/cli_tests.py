@@ -8,6 +8,7 @@ from unittest import mock
 from click.testing import CliRunner
 
 from mkdocs import __main__ as cli
+from mkdocs.utils import profiling
 
 
 class CLITests(unittest.TestCase):
@@ -30,6 +31,8 @@ class CLITests(unittest.TestCase):
             use_directory_urls=None,
             watch_theme=False,
             watch=(),
+            watcher='auto',
+            in_memory=False,
         )
 
     @mock.patch('mkdocs.commands.serve.serve', autospec=True)
@@ -63,6 +66,8 @@ class CLITests(unittest.TestCase):
             use_directory_urls=None,
             watch_theme=False,
             watch=(),
+            watcher='auto',
+            in_memory=False,
         )
 
     @mock.patch('mkdocs.commands.serve.serve', autospec=True)
@@ -81,6 +86,8 @@ class CLITests(unittest.TestCase):
             use_directory_urls=None,
             watch_theme=False,
             watch=(),
+            watcher='auto',
+            in_memory=False,
         )
 
     @mock.patch('mkdocs.commands.serve.serve', autospec=True)
@@ -101,6 +108,8 @@ class CLITests(unittest.TestCase):
             use_directory_urls=None,
             watch_theme=False,
             watch=(),
+            watcher='auto',
+            in_memory=False,
         )
 
     @mock.patch('mkdocs.commands.serve.serve', autospec=True)
@@ -121,6 +130,8 @@ class CLITests(unittest.TestCase):
             use_directory_urls=True,
             watch_theme=False,
             watch=(),
+            watcher='auto',
+            in_memory=False,
         )
 
     @mock.patch('mkdocs.commands.serve.serve', autospec=True)
@@ -141,6 +152,8 @@ class CLITests(unittest.TestCase):
             use_directory_urls=False,
             watch_theme=False,
             watch=(),
+            watcher='auto',
+            in_memory=False,
         )
 
     @mock.patch('mkdocs.commands.serve.serve', autospec=True)
@@ -159,6 +172,8 @@ class CLITests(unittest.TestCase):
             use_directory_urls=None,
             watch_theme=False,
             watch=(),
+            watcher='auto',
+            in_memory=False,
         )
 
     @mock.patch('mkdocs.commands.serve.serve', autospec=True)
@@ -177,6 +192,8 @@ class CLITests(unittest.TestCase):
             use_directory_urls=None,
             watch_theme=False,
             watch=(),
+            watcher='auto',
+            in_memory=False,
         )
 
     @mock.patch('mkdocs.commands.serve.serve', autospec=True)
@@ -195,6 +212,8 @@ class CLITests(unittest.TestCase):
             use_directory_urls=None,
             watch_theme=False,
             watch=(),
+            watcher='auto',
+            in_memory=False,
         )
 
     @mock.patch('mkdocs.commands.serve.serve', autospec=True)
@@ -213,8 +232,22 @@ class CLITests(unittest.TestCase):
             use_directory_urls=None,
             watch_theme=True,
             watch=(),
+            watcher='auto',
+            in_memory=False,
         )
 
+    @mock.patch('mkdocs.commands.serve.serve', autospec=True)
+    def test_serve_in_memory(self, mock_serve):
+        result = self.runner.invoke(
+            cli.cli, ["serve", '--in-memory', '--watcher', 'polling'], catch_exceptions=False
+        )
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(mock_serve.call_count, 1)
+        args, kwargs = mock_serve.call_args
+        self.assertTrue(kwargs['in_memory'])
+        self.assertEqual(kwargs['watcher'], 'polling')
+
     @mock.patch('mkdocs.config.load_config', autospec=True)
     @mock.patch('mkdocs.commands.build.build', autospec=True)
     def test_build_defaults(self, mock_build, mock_load_config):
@@ -225,12 +258,20 @@ class CLITests(unittest.TestCase):
         args, kwargs = mock_build.call_args
         self.assertTrue('dirty' in kwargs)
         self.assertFalse(kwargs['dirty'])
+        self.assertEqual(kwargs['jobs'], 1)
+        self.assertFalse(kwargs['render_cache'])
+        self.assertIsNone(kwargs['profiler'])
+        self.assertFalse(kwargs['write_if_changed'])
+        self.assertFalse(kwargs['prune'])
+        self.assertTrue(kwargs['template_cache'])
+        self.assertFalse(kwargs['low_memory'])
         mock_load_config.assert_called_once_with(
             config_file=None,
             strict=None,
             theme=None,
             use_directory_urls=None,
             site_dir=None,
+            copy_strategy=None,
         )
         for log_name in 'mkdocs', 'mkdocs.structure.pages', 'mkdocs.plugins.foo':
             self.assertEqual(logging.getLogger(log_name).getEffectiveLevel(), logging.INFO)
@@ -257,6 +298,113 @@ class CLITests(unittest.TestCase):
         self.assertTrue('dirty' in kwargs)
         self.assertTrue(kwargs['dirty'])
 
+    @mock.patch('mkdocs.config.load_config', autospec=True)
+    @mock.patch('mkdocs.commands.build.build', autospec=True)
+    def test_build_jobs(self, mock_build, mock_load_config):
+        result = self.runner.invoke(cli.cli, ['build', '--jobs', '4'], catch_exceptions=False)
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(mock_build.call_count, 1)
+        args, kwargs = mock_build.call_args
+        self.assertEqual(kwargs['jobs'], 4)
+
+    @mock.patch('mkdocs.utils.profiling.save_report', autospec=True)
+    @mock.patch('mkdocs.config.load_config', autospec=True)
+    @mock.patch('mkdocs.commands.build.build', autospec=True)
+    def test_build_profile(self, mock_build, mock_load_config, mock_save_report):
+        result = self.runner.invoke(
+            cli.cli, ['build', '--profile', 'profile.json'], catch_exceptions=False
+        )
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(mock_build.call_count, 1)
+        args, kwargs = mock_build.call_args
+        self.assertIsInstance(kwargs['profiler'], profiling.Profiler)
+        mock_save_report.assert_called_once_with(kwargs['profiler'], 'profile.json')
+
+    @mock.patch('mkdocs.utils.profiling.save_trace', autospec=True)
+    @mock.patch('mkdocs.utils.profiling.save_report', autospec=True)
+    @mock.patch('mkdocs.config.load_config', autospec=True)
+    @mock.patch('mkdocs.commands.build.build', autospec=True)
+    def test_build_trace(self, mock_build, mock_load_config, mock_save_report, mock_save_trace):
+        result = self.runner.invoke(
+            cli.cli, ['build', '--trace', 'trace.json'], catch_exceptions=False
+        )
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(mock_build.call_count, 1)
+        args, kwargs = mock_build.call_args
+        self.assertIsInstance(kwargs['profiler'], profiling.Profiler)
+        mock_save_trace.assert_called_once_with(kwargs['profiler'], 'trace.json')
+        mock_save_report.assert_not_called()
+
+    @mock.patch('mkdocs.config.load_config', autospec=True)
+    @mock.patch('mkdocs.commands.build.build', autospec=True)
+    def test_build_render_cache(self, mock_build, mock_load_config):
+        result = self.runner.invoke(cli.cli, ['build', '--render-cache'], catch_exceptions=False)
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(mock_build.call_count, 1)
+        args, kwargs = mock_build.call_args
+        self.assertTrue(kwargs['render_cache'])
+
+    @mock.patch('mkdocs.config.load_config', autospec=True)
+    @mock.patch('mkdocs.commands.build.build', autospec=True)
+    def test_build_write_if_changed(self, mock_build, mock_load_config):
+        result = self.runner.invoke(
+            cli.cli, ['build', '--write-if-changed'], catch_exceptions=False
+        )
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(mock_build.call_count, 1)
+        args, kwargs = mock_build.call_args
+        self.assertTrue(kwargs['write_if_changed'])
+
+    @mock.patch('mkdocs.config.load_config', autospec=True)
+    @mock.patch('mkdocs.commands.build.build', autospec=True)
+    def test_build_prune(self, mock_build, mock_load_config):
+        result = self.runner.invoke(cli.cli, ['build', '--prune'], catch_exceptions=False)
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(mock_build.call_count, 1)
+        args, kwargs = mock_build.call_args
+        self.assertTrue(kwargs['prune'])
+        self.assertFalse(kwargs['write_if_changed'])
+
+    @mock.patch('mkdocs.config.load_config', autospec=True)
+    @mock.patch('mkdocs.commands.build.build', autospec=True)
+    def test_build_no_template_cache(self, mock_build, mock_load_config):
+        result = self.runner.invoke(
+            cli.cli, ['build', '--no-template-cache'], catch_exceptions=False
+        )
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(mock_build.call_count, 1)
+        args, kwargs = mock_build.call_args
+        self.assertFalse(kwargs['template_cache'])
+
+    @mock.patch('mkdocs.config.load_config', autospec=True)
+    @mock.patch('mkdocs.commands.build.build', autospec=True)
+    def test_build_low_memory(self, mock_build, mock_load_config):
+        result = self.runner.invoke(cli.cli, ['build', '--low-memory'], catch_exceptions=False)
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(mock_build.call_count, 1)
+        args, kwargs = mock_build.call_args
+        self.assertTrue(kwargs['low_memory'])
+
+    @mock.patch('mkdocs.config.load_config', autospec=True)
+    @mock.patch('mkdocs.commands.build.build', autospec=True)
+    def test_build_copy_strategy(self, mock_build, mock_load_config):
+        result = self.runner.invoke(
+            cli.cli, ['build', '--copy-strategy', 'hardlink'], catch_exceptions=False
+        )
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(mock_build.call_count, 1)
+        args, kwargs = mock_load_config.call_args
+        self.assertEqual(kwargs['copy_strategy'], 'hardlink')
+
     @mock.patch('mkdocs.config.load_config', autospec=True)
     @mock.patch('mkdocs.commands.build.build', autospec=True)
     def test_build_config_file(self, mock_build, mock_load_config):
@@ -285,6 +433,7 @@ class CLITests(unittest.TestCase):
             theme=None,
             use_directory_urls=None,
             site_dir=None,
+            copy_strategy=None,
         )
 
     @mock.patch('mkdocs.config.load_config', autospec=True)
@@ -302,6 +451,7 @@ class CLITests(unittest.TestCase):
             theme='readthedocs',
             use_directory_urls=None,
             site_dir=None,
+            copy_strategy=None,
         )
 
     @mock.patch('mkdocs.config.load_config', autospec=True)
@@ -319,6 +469,7 @@ class CLITests(unittest.TestCase):
             theme=None,
             use_directory_urls=True,
             site_dir=None,
+            copy_strategy=None,
         )
 
     @mock.patch('mkdocs.config.load_config', autospec=True)
@@ -336,6 +487,7 @@ class CLITests(unittest.TestCase):
             theme=None,
             use_directory_urls=False,
             site_dir=None,
+            copy_strategy=None,
         )
 
     @mock.patch('mkdocs.config.load_config', autospec=True)
@@ -353,6 +505,7 @@ class CLITests(unittest.TestCase):
             theme=None,
             use_directory_urls=None,
             site_dir='custom',
+            copy_strategy=None,
         )
 
     @mock.patch('mkdocs.config.load_config', autospec=True)
@@ -401,6 +554,7 @@ class CLITests(unittest.TestCase):
         b_args, b_kwargs = mock_build.call_args
         self.assertTrue('dirty' in b_kwargs)
         self.assertFalse(b_kwargs['dirty'])
+        self.assertTrue(b_kwargs['template_cache'])
         mock_load_config.assert_called_once_with(
             remote_branch=None,
             remote_name=None,
@@ -437,6 +591,19 @@ class CLITests(unittest.TestCase):
         self.assertTrue('dirty' in kwargs)
         self.assertTrue(kwargs['dirty'])
 
+    @mock.patch('mkdocs.config.load_config', autospec=True)
+    @mock.patch('mkdocs.commands.build.build', autospec=True)
+    @mock.patch('mkdocs.commands.gh_deploy.gh_deploy', autospec=True)
+    def test_gh_deploy_no_template_cache(self, mock_gh_deploy, mock_build, mock_load_config):
+        result = self.runner.invoke(
+            cli.cli, ['gh-deploy', '--no-template-cache'], catch_exceptions=False
+        )
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(mock_build.call_count, 1)
+        args, kwargs = mock_build.call_args
+        self.assertFalse(kwargs['template_cache'])
+
     @mock.patch('mkdocs.config.load_config', autospec=True)
     @mock.patch('mkdocs.commands.build.build', autospec=True)
     @mock.patch('mkdocs.commands.gh_deploy.gh_deploy', autospec=True)
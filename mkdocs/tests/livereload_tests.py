@@ -2,14 +2,17 @@
 
 import contextlib
 import email
+import gzip
 import io
 import sys
 import threading
 import time
 import unittest
+import zlib
 from pathlib import Path
 from unittest import mock
 
+from mkdocs import livereload
 from mkdocs.livereload import LiveReloadServer
 from mkdocs.tests.base import change_dir, tempdir
 
@@ -26,9 +29,24 @@ class FakeRequest:
     def sendall(self, data):
         self.out_file.write(data)
 
+    def send(self, data):
+        return self.out_file.write(data)
+
+    def settimeout(self, timeout):
+        pass
+
+    def setblocking(self, flag):
+        pass
+
+    def shutdown(self, how):
+        pass
+
+    def close(self):
+        self.closed = True
+
 
 @contextlib.contextmanager
-def testing_server(root, builder=lambda: None, mount_path="/"):
+def testing_server(root, builder=lambda: None, mount_path="/", watcher="auto"):
     """Create the server and start most of its parts, but don't listen on a socket."""
     with mock.patch("socket.socket"):
         server = LiveReloadServer(
@@ -38,11 +56,12 @@ def testing_server(root, builder=lambda: None, mount_path="/"):
             root=root,
             mount_path=mount_path,
             polling_interval=0.2,
+            watcher=watcher,
         )
         server.server_name = "localhost"
         server.server_port = 0
         server.setup_environ()
-    server.observer.start()
+    server._start_observers()
     thread = threading.Thread(target=server._build_loop, daemon=True)
     thread.start()
     yield server
@@ -50,8 +69,8 @@ def testing_server(root, builder=lambda: None, mount_path="/"):
     thread.join()
 
 
-def do_request(server, content):
-    request = FakeRequest(content + " HTTP/1.1")
+def do_request(server, content, headers=()):
+    request = FakeRequest(content + " HTTP/1.1" + "".join(f"\r\n{h}" for h in headers))
     server.RequestHandlerClass(request, ("127.0.0.1", 0), server)
     response = request.out_file.getvalue()
 
@@ -61,6 +80,8 @@ def do_request(server, content):
 
     headers = email.message_from_bytes(headers)
     headers["_status"] = status
+    if headers.get("content-encoding") == "gzip":
+        content = gzip.decompress(content)
     return headers, content.decode()
 
 
@@ -183,6 +204,35 @@ class BuildTests(unittest.TestCase):
             with self.assertRaises(KeyError):
                 server.unwatch(site_dir)
 
+    @tempdir({"mkdocs.yml": "a", "other.yml": "a", "unrelated": "a"})
+    def test_watches_file_replaced_by_rename(self, tmp_dir):
+        started_building = threading.Event()
+        config_file, other_file = Path(tmp_dir, "mkdocs.yml"), Path(tmp_dir, "other.yml")
+
+        for watcher in livereload.WATCHERS:
+            with self.subTest(watcher=watcher), testing_server(
+                tmp_dir, started_building.set, watcher=watcher
+            ) as server:
+                server.watch(str(config_file))
+                server.watch(str(other_file))
+                time.sleep(0.01)
+
+                # Like an editor that saves by renaming a new file over the original one.
+                for i in range(3):
+                    started_building.clear()
+                    Path(tmp_dir, "mkdocs.yml.tmp").write_text(str(i))
+                    Path(tmp_dir, "mkdocs.yml.tmp").replace(config_file)
+                    self.assertTrue(started_building.wait(timeout=10))
+                    time.sleep(0.1)
+
+                # Files in the same directory share a watch; unwatching one keeps the other.
+                server.unwatch(str(other_file))
+                started_building.clear()
+                Path(tmp_dir, "unrelated").write_text("b")
+                self.assertFalse(started_building.wait(timeout=0.5))
+                config_file.write_text("b")
+                self.assertTrue(started_building.wait(timeout=10))
+
     @tempdir({"foo.docs": "docs1"})
     @tempdir({"foo.extra": "extra1"})
     @tempdir({"foo.site": "original"})
@@ -212,6 +262,25 @@ class BuildTests(unittest.TestCase):
             _, output = do_request(server, "GET /foo.site")
             self.assertEqual(output, "docs2extra2")
 
+    @tempdir({"foo.docs": "a", "bar.docs": "b"})
+    @tempdir()
+    def test_changed_paths_are_passed_to_build(self, site_dir, docs_dir):
+        started_building = threading.Event()
+        changed_paths = []
+
+        def rebuild():
+            changed_paths.append(server._build_changed_paths)
+            started_building.set()
+
+        with testing_server(site_dir, rebuild) as server:
+            self.assertIsNone(server._build_changed_paths)
+            server.watch(docs_dir)
+            time.sleep(0.01)
+
+            Path(docs_dir, "foo.docs").write_text("c")
+            self.assertTrue(started_building.wait(timeout=10))
+            self.assertEqual(changed_paths, [{str(Path(docs_dir, "foo.docs"))}])
+
     @tempdir({"foo.docs": "docs1"})
     @tempdir({"foo.extra": "extra1"})
     @tempdir({"foo.site": "original"})
@@ -428,6 +497,90 @@ class BuildTests(unittest.TestCase):
             self.assertGreaterEqual(time.monotonic(), start_time + 0.2)
             self.assertEqual(output, str(initial_epoch))
 
+    @tempdir()
+    def test_serves_events(self, site_dir):
+        with testing_server(site_dir) as server:
+            initial_epoch = server._visible_epoch
+            headers, output = do_request(server, f"GET /livereload/events/{initial_epoch}/0")
+            self.assertEqual(headers["_status"], "200 OK")
+            self.assertEqual(headers["content-type"], "text/event-stream")
+            self.assertEqual(output, "retry: 3000\n\n")
+
+            _, output = do_request(server, "GET /livereload/events/0/0")
+            self.assertEqual(output, f"retry: 3000\n\ndata: {initial_epoch}\n\n")
+            self.assertEqual(len(server._event_clients), 2)
+
+    @tempdir()
+    @tempdir()
+    def test_serves_events_after_event(self, site_dir, docs_dir):
+        with testing_server(site_dir) as server:
+            initial_epoch = server._visible_epoch
+            server.watch(docs_dir)
+            time.sleep(0.01)
+
+            request = FakeRequest(f"GET /livereload/events/{initial_epoch}/0 HTTP/1.1")
+            server.RequestHandlerClass(request, ("127.0.0.1", 0), server)
+            self.assertEqual(len(server._event_clients), 1)
+
+            Path(docs_dir, "foo.docs").write_text("b")
+            for _ in range(100):
+                if b"data:" in request.out_file.getvalue():
+                    break
+                time.sleep(0.05)
+
+            self.assertNotEqual(server._visible_epoch, initial_epoch)
+            self.assertTrue(
+                request.out_file.getvalue().endswith(b"data: %d\n\n" % server._visible_epoch)
+            )
+        self.assertTrue(request.closed)
+        self.assertFalse(server._event_clients)
+
+    @tempdir()
+    def test_events_keepalive(self, site_dir):
+        with testing_server(site_dir) as server:
+            server.events_keepalive_interval = 0.05
+            request = FakeRequest("GET /livereload/events/0/0 HTTP/1.1")
+            server.RequestHandlerClass(request, ("127.0.0.1", 0), server)
+            time.sleep(0.3)
+            self.assertIn(b"\n\n: keepalive\n\n", request.out_file.getvalue())
+
+            request.send = mock.Mock(side_effect=ConnectionResetError)
+            time.sleep(0.3)
+            self.assertTrue(request.closed)
+            self.assertFalse(server._event_clients)
+
+    @tempdir()
+    @tempdir()
+    def test_events_drop_stalled_client(self, site_dir, docs_dir):
+        with testing_server(site_dir) as server:
+            initial_epoch = server._visible_epoch
+            server.watch(docs_dir)
+            time.sleep(0.01)
+
+            stalled, partial, ok = (
+                FakeRequest(f"GET /livereload/events/{initial_epoch}/{i} HTTP/1.1")
+                for i in range(3)
+            )
+            for request in stalled, partial, ok:
+                server.RequestHandlerClass(request, ("127.0.0.1", 0), server)
+            self.assertEqual(len(server._event_clients), 3)
+            # A full socket buffer: a non-blocking send fails or takes only part of the message.
+            stalled.send = mock.Mock(side_effect=BlockingIOError)
+            partial.send = mock.Mock(return_value=1)
+
+            Path(docs_dir, "foo.docs").write_text("b")
+            for _ in range(100):
+                if b"data:" in ok.out_file.getvalue():
+                    break
+                time.sleep(0.05)
+
+            self.assertTrue(
+                ok.out_file.getvalue().endswith(b"data: %d\n\n" % server._visible_epoch)
+            )
+            self.assertTrue(stalled.closed)
+            self.assertTrue(partial.closed)
+            self.assertEqual(len(server._event_clients), 1)
+
     @tempdir()
     def test_error_handler(self, site_dir):
         with testing_server(site_dir) as server:
@@ -624,3 +777,305 @@ class BuildTests(unittest.TestCase):
 
             Path(docs_dir, "subdir", "test").write_text("test")
             self.assertTrue(started_building.wait(timeout=10))
+
+    @tempdir({"foo.docs": "a"})
+    @tempdir(["docs/foo.docs", "linked/foo.docs"])
+    def test_watcher_choice(self, tmp_dir, site_dir):
+        docs_dir = Path(tmp_dir, "docs")
+        try:
+            Path(tmp_dir, "docs", "link").symlink_to(Path(tmp_dir, "linked"))
+        except NotImplementedError:  # PyPy on Windows
+            self.skipTest("Creating symlinks not supported")
+
+        for watcher in livereload.WATCHERS:
+            with self.subTest(watcher=watcher), testing_server(site_dir, watcher=watcher) as server:
+                server.watch(site_dir)
+                server.watch(docs_dir)
+                if watcher == "polling":
+                    self.assertIs(server.observer, server._polling_observer)
+                else:
+                    self.assertIsNot(server.observer, server._polling_observer)
+                self.assertIs(server._watch_refs[site_dir][0], server.observer)
+                self.assertIs(
+                    server._watch_refs[str(docs_dir)][0],
+                    server._polling_observer if watcher == "auto" else server.observer,
+                )
+
+        with testing_server(site_dir) as server:
+            # The symlink is in a subdirectory, which a non-recursive watch doesn't cover.
+            server.watch(tmp_dir, recursive=False)
+            self.assertIs(server._watch_refs[tmp_dir][0], server.observer)
+
+        with self.assertRaises(ValueError), mock.patch("socket.socket"):
+            LiveReloadServer(lambda: None, host="localhost", port=0, root=site_dir, watcher="x")
+
+    @tempdir()
+    @tempdir()
+    def test_auto_watcher_polls_network_file_systems(self, site_dir, docs_dir):
+        started_building = threading.Event()
+        with mock.patch("mkdocs.livereload._filesystem_type", return_value="nfs4"):
+            with testing_server(site_dir, started_building.set) as server:
+                server.watch(docs_dir)
+                self.assertIs(server._watch_refs[docs_dir][0], server._polling_observer)
+                time.sleep(0.01)
+
+                Path(docs_dir, "foo.docs").write_text("b")
+                self.assertTrue(started_building.wait(timeout=10))
+
+    @tempdir()
+    @tempdir()
+    def test_native_watcher_falls_back_to_polling(self, site_dir, docs_dir):
+        started_building = threading.Event()
+        with testing_server(site_dir, started_building.set, watcher="native") as server:
+            with mock.patch.object(server.observer, "schedule", side_effect=OSError("limit")):
+                with self.assertLogs("mkdocs.livereload", "WARNING") as cm:
+                    server.watch(docs_dir)
+            self.assertIn("polling it instead", cm.output[0])
+            self.assertIs(server._watch_refs[docs_dir][0], server._polling_observer)
+            time.sleep(0.01)
+
+            Path(docs_dir, "foo.docs").write_text("b")
+            self.assertTrue(started_building.wait(timeout=10))
+
+            server.unwatch(docs_dir)
+            self.assertEqual(server._watch_refs, {})
+
+    @tempdir()
+    @tempdir()
+    def test_native_watcher_falls_back_to_polling_on_start(self, site_dir, docs_dir):
+        started_building = threading.Event()
+        with mock.patch("socket.socket"):
+            server = LiveReloadServer(
+                started_building.set,
+                host="localhost",
+                port=0,
+                root=site_dir,
+                polling_interval=0.2,
+                watcher="native",
+            )
+        server.watch(docs_dir)
+        with mock.patch.object(server.observer, "start", side_effect=OSError("no inotify")):
+            with self.assertLogs("mkdocs.livereload", "WARNING"):
+                server._start_observers()
+        self.assertIs(server.observer, server._polling_observer)
+        self.assertIs(server._watch_refs[docs_dir][0], server._polling_observer)
+        thread = threading.Thread(target=server._build_loop, daemon=True)
+        thread.start()
+        try:
+            time.sleep(0.01)
+            Path(docs_dir, "foo.docs").write_text("b")
+            self.assertTrue(started_building.wait(timeout=10))
+        finally:
+            server.shutdown()
+            thread.join()
+
+    def test_filesystem_type(self):
+        mounts = (
+            "/dev/sda1 / ext4 rw 0 0\n"
+            "server:/export /mnt/my\\040share nfs4 rw 0 0\n"
+            "tmpfs /mnt/my\\040share/tmp tmpfs rw 0 0\n"
+        )
+        with mock.patch("builtins.open", mock.mock_open(read_data=mounts)), mock.patch(
+            "os.path.realpath", side_effect=lambda path: path
+        ):
+            for path, expected in [
+                ("/home/docs", "ext4"),
+                ("/mnt/my share", "nfs4"),
+                ("/mnt/my share/docs", "nfs4"),
+                ("/mnt/my sharedocs", "ext4"),
+                ("/mnt/my share/tmp/docs", "tmpfs"),
+            ]:
+                with self.subTest(path=path):
+                    self.assertEqual(livereload._filesystem_type(path), expected)
+
+    @tempdir({"on_disk.txt": "disk", "static.html": "<body>static</body>"}, prefix="docs_dir")
+    @tempdir({"on_disk.html": "<body>plugin</body>", "page.html": "stale"})
+    def test_serves_site_files(self, site_dir, docs_dir):
+        with testing_server(site_dir) as server:
+            server.watch(docs_dir)
+            server.set_site_files(
+                {
+                    "index.html": b"<body>home</body>",
+                    "page.html": b"<body>page</body>",
+                    "sub/index.html": b"<p>no body",
+                    "style.css": b"div {}",
+                    "copied.txt": str(Path(docs_dir, "on_disk.txt")),
+                    "copied.html": str(Path(docs_dir, "static.html")),
+                }
+            )
+
+            headers, output = do_request(server, "GET /")
+            self.assertRegex(output, fr"^<body>home{SCRIPT_REGEX}</body>$")
+            self.assertEqual(headers.get("content-type"), "text/html")
+            self.assertEqual(headers.get("content-length"), str(len(output.encode())))
+
+            _, output = do_request(server, "GET /page.html")
+            self.assertRegex(output, fr"^<body>page{SCRIPT_REGEX}</body>$")
+
+            _, output = do_request(server, "GET /sub/")
+            self.assertRegex(output, fr"^<p>no body{SCRIPT_REGEX}$")
+
+            with self.assertLogs("mkdocs.livereload"):
+                headers, _ = do_request(server, "GET /sub")
+            self.assertEqual(headers["_status"], "302 Found")
+            self.assertEqual(headers.get("location"), "/sub/")
+
+            headers, output = do_request(server, "GET /style.css")
+            self.assertEqual(output, "div {}")
+            self.assertEqual(headers.get("content-type"), "text/css")
+            self.assertEqual(headers.get("content-length"), "6")
+
+            _, output = do_request(server, "GET /copied.txt")
+            self.assertEqual(output, "disk")
+
+            _, output = do_request(server, "GET /copied.html")
+            self.assertRegex(output, fr"^<body>static{SCRIPT_REGEX}</body>$")
+
+            # Files that aren't in memory are read from the site directory.
+            _, output = do_request(server, "GET /on_disk.html")
+            self.assertRegex(output, fr"^<body>plugin{SCRIPT_REGEX}</body>$")
+
+            self.assertEqual(server.read_site_file("page.html"), b"<body>page</body>")
+            self.assertEqual(server.read_site_file("copied.txt"), b"disk")
+            self.assertEqual(server.read_site_file("on_disk.html"), b"<body>plugin</body>")
+            self.assertIsNone(server.read_site_file("missing.html"))
+
+            server.set_site_files({"page.html": b"new"})
+            _, output = do_request(server, "GET /page.html")
+            self.assertRegex(output, fr"^new{SCRIPT_REGEX}$")
+            with self.assertLogs("mkdocs.livereload"):
+                headers, _ = do_request(server, "GET /style.css")
+            self.assertEqual(headers["_status"], "404 Not Found")
+
+    @tempdir({"test.css": "div { color: red; }", "index.html": "<body>aaa</body>"})
+    def test_serves_with_etag(self, site_dir):
+        with testing_server(site_dir) as server:
+            server.watch(site_dir)
+            for path in "/test.css", "/", "/page.html", "/style.css":
+                with self.subTest(path=path):
+                    if path == "/page.html":
+                        server.set_site_files(
+                            {"page.html": b"<body>b</body>", "style.css": b"p {}"}
+                        )
+                    headers, output = do_request(server, f"GET {path}")
+                    self.assertEqual(headers["_status"], "200 OK")
+                    self.assertEqual(headers.get("cache-control"), "no-cache")
+                    etag = headers.get("etag")
+                    self.assertRegex(etag, r'^"[0-9a-f-]+"$')
+
+                    headers, output = do_request(server, f"GET {path}", [f"If-None-Match: {etag}"])
+                    self.assertEqual(headers["_status"], "304 Not Modified")
+                    self.assertEqual(headers.get("etag"), etag)
+                    self.assertEqual(output, "")
+
+                    for if_none_match in f'W/{etag}, "other"', "*":
+                        headers, _ = do_request(
+                            server, f"GET {path}", [f"If-None-Match: {if_none_match}"]
+                        )
+                        self.assertEqual(headers["_status"], "304 Not Modified")
+
+                    headers, _ = do_request(
+                        server, f"GET {path}", ['If-None-Match: "other", W/"x"']
+                    )
+                    self.assertEqual(headers["_status"], "200 OK")
+
+                    # After a rebuild, HTML has a different livereload script.
+                    server._visible_epoch = server._wanted_epoch = server._visible_epoch + 1
+                    headers, _ = do_request(server, f"GET {path}", [f"If-None-Match: {etag}"])
+                    self.assertEqual(
+                        headers["_status"],
+                        "200 OK" if path in ("/", "/page.html") else "304 Not Modified",
+                    )
+
+            server.set_site_files({})
+            headers, _ = do_request(server, "GET /test.css")
+            etag = headers.get("etag")
+            Path(site_dir, "test.css").write_text("div { color: blue; }")
+            headers, _ = do_request(server, "GET /test.css", [f"If-None-Match: {etag}"])
+            self.assertEqual(headers["_status"], "200 OK")
+            self.assertNotEqual(headers.get("etag"), etag)
+
+    @tempdir(
+        {
+            "big.css": "div { color: red; }\n" * 100,
+            "small.css": "div {}",
+            "img.png": "x" * 2000,
+            "index.html": "<body>" + "aaa " * 500 + "</body>",
+        }
+    )
+    def test_serves_gzip(self, site_dir):
+        gzip_header = "Accept-Encoding: deflate, gzip;q=0.5"
+        with testing_server(site_dir) as server:
+            server.watch(site_dir)
+            for path in "/big.css", "/", "/data.json":
+                with self.subTest(path=path):
+                    if path == "/data.json":
+                        server.set_site_files({"data.json": b'{"a": 1}' * 200})
+                    headers, plain = do_request(server, f"GET {path}")
+                    self.assertIsNone(headers.get("content-encoding"))
+                    self.assertEqual(headers.get("vary"), "Accept-Encoding")
+
+                    headers, output = do_request(server, f"GET {path}", [gzip_header])
+                    self.assertEqual(headers.get("content-encoding"), "gzip")
+                    self.assertEqual(headers.get("vary"), "Accept-Encoding")
+                    self.assertLess(int(headers["content-length"]), len(plain) // 4)
+                    self.assertTrue(headers.get("etag").endswith('-gzip"'))
+                    if path == "/":
+                        self.assertRegex(output, fr"^<body>(aaa ){{500}}{SCRIPT_REGEX}</body>$")
+                    else:
+                        self.assertEqual(output, plain)
+
+                    etag = headers.get("etag")
+                    headers, _ = do_request(
+                        server, f"GET {path}", [gzip_header, f"If-None-Match: {etag}"]
+                    )
+                    self.assertEqual(headers["_status"], "304 Not Modified")
+                    headers, _ = do_request(server, f"GET {path}", [f"If-None-Match: {etag}"])
+                    self.assertEqual(headers["_status"], "200 OK")
+
+            for path, accept_encoding in [
+                ("/big.css", "gzip;q=0, *"),
+                ("/big.css", "br"),
+                ("/small.css", "gzip"),
+                ("/img.png", "gzip"),
+            ]:
+                with self.subTest(path=path, accept_encoding=accept_encoding):
+                    headers, _ = do_request(
+                        server, f"GET {path}", [f"Accept-Encoding: {accept_encoding}"]
+                    )
+                    self.assertEqual(headers["_status"], "200 OK")
+                    self.assertIsNone(headers.get("content-encoding"))
+
+    @tempdir({"index.html": "<body>" + "aaa " * 500 + "</body>", "big.css": "div {}" * 500})
+    def test_gzip_once_per_build(self, site_dir):
+        with testing_server(site_dir) as server:
+            server.watch(site_dir)
+            with mock.patch("zlib.compressobj", wraps=zlib.compressobj) as mock_compressobj:
+                for _ in range(3):
+                    for path in "/", "/big.css":
+                        headers, output = do_request(
+                            server, f"GET {path}", ["Accept-Encoding: gzip"]
+                        )
+                        self.assertEqual(headers.get("content-encoding"), "gzip")
+                self.assertEqual(mock_compressobj.call_count, 2)
+
+                server._visible_epoch = server._wanted_epoch = server._visible_epoch + 1
+                headers, output = do_request(server, "GET /", ["Accept-Encoding: gzip"])
+                self.assertIn(f"livereload({server._visible_epoch}, ", output)
+                self.assertEqual(mock_compressobj.call_count, 3)
+
+    def test_accepts_gzip(self):
+        for accept_encoding, expected in [
+            ("gzip", True),
+            ("gzip, deflate, br", True),
+            ("GZIP;q=0.1", True),
+            ("*", True),
+            ("", False),
+            ("identity", False),
+            ("gzip;q=0", False),
+            ("gzip;q=0.0, *", False),
+            ("br, *;q=0", False),
+            ("gzip;q=x", False),
+        ]:
+            with self.subTest(accept_encoding):
+                self.assertEqual(livereload._accepts_gzip(accept_encoding), expected)
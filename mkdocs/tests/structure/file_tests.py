@@ -3,7 +3,16 @@ import sys
 import unittest
 from unittest import mock
 
-from mkdocs.structure.files import File, Files, _sort_files, file_sort_key, get_files
+from mkdocs.structure.files import (
+    File,
+    Files,
+    InclusionLevel,
+    _get_inclusion_matcher,
+    _sort_files,
+    file_sort_key,
+    get_files,
+    set_exclusions,
+)
 from mkdocs.tests.base import PathAssertionMixin, load_config, tempdir
 
 
@@ -350,6 +359,41 @@ class TestFiles(PathAssertionMixin, unittest.TestCase):
         files.remove(fs[1])
         self.assertEqual(files.documentation_pages(), [fs[0], extra_file])
 
+    def test_files_indexes(self):
+        fs = [
+            File('index.md', '/path/to/docs', '/path/to/site', use_directory_urls=True),
+            File('draft.md', '/path/to/docs', '/path/to/site', use_directory_urls=True),
+            File('foo/bar.js', '/path/to/docs', '/path/to/site', use_directory_urls=True),
+        ]
+        files = Files(fs)
+        docs = files.documentation_pages()
+        self.assertEqual(files.documentation_pages(), docs)
+        self.assertIsNot(files.documentation_pages(), docs)
+        self.assertIsInstance(docs, list)
+        docs.append(fs[2])
+        self.assertEqual(files.documentation_pages(), [fs[0], fs[1]])
+        docs.remove(fs[2])
+        self.assertEqual(files.get_file_from_dest_uri('draft/index.html'), fs[1])
+
+        fs[1].inclusion = InclusionLevel.DRAFT
+        self.assertEqual(files.documentation_pages(), [fs[0]])
+        self.assertEqual(files.documentation_pages(inclusion=InclusionLevel.is_in_serve), docs)
+        self.assertEqual(files.documentation_pages(inclusion=lambda i: i.is_excluded()), [fs[1]])
+
+        fs[1].dest_uri = 'other.html'
+        self.assertIsNone(files.get_file_from_dest_uri('draft/index.html'))
+        self.assertEqual(files.get_file_from_dest_uri('other.html'), fs[1])
+
+        new_js = File('foo/bar.js', '/path/to/theme', '/path/to/site', use_directory_urls=True)
+        with self.assertWarns(DeprecationWarning):
+            files.append(new_js)
+        self.assertEqual(files.javascript_files(), [new_js])
+        self.assertEqual(files.media_files(), [new_js])
+        self.assertEqual(files.get_file_from_dest_uri('foo/bar.js'), new_js)
+        files.remove(fs[0])
+        self.assertEqual(files.documentation_pages(inclusion=InclusionLevel.all), [fs[1]])
+        self.assertIsNone(files.get_file_from_dest_uri('index.html'))
+
     @tempdir(
         files=[
             'favicon.ico',
@@ -602,6 +646,110 @@ class TestFiles(PathAssertionMixin, unittest.TestCase):
             ['.dotfile', 'templates/foo.html'],
         )
 
+    def test_inclusion_matcher(self):
+        options = dict(
+            exclude_docs='/api/\n*.py\n!/api/keep.md\nfoo/bar\n/a.b/c\n/x?y/',
+            draft_docs='drafts/\n/blog/*/draft-*',
+            not_in_nav='/api/\n/index.md',
+        )
+        config = load_config(**options)
+        paths = [
+            'index.md',
+            'a.md',
+            'foo.py',
+            'x/foo.py',
+            'api/a.md',
+            'api/keep.md',
+            'api/x/keep.md',
+            'apix.md',
+            'foo/bar',
+            'z/foo/bar/baz.md',
+            'a.b/c',
+            'aXb/c',
+            'xzy/a.md',
+            'xy/a.md',
+            'drafts/a.md',
+            'x/drafts/a.md',
+            'blog/2024/draft-a.md',
+            'blog/draft-a.md',
+            '.hidden/a.md',
+            'templates/a.md',
+            'x/templates/a.md',
+        ]
+        expected = {}
+        for path in paths:
+            if config.exclude_docs.match_file(path) or path.startswith(('.', 'templates/')):
+                expected[path] = InclusionLevel.EXCLUDED
+            elif config.draft_docs.match_file(path):
+                expected[path] = InclusionLevel.DRAFT
+            elif config.not_in_nav.match_file(path):
+                expected[path] = InclusionLevel.NOT_IN_NAV
+            else:
+                expected[path] = InclusionLevel.INCLUDED
+        files = [File(path, '/docs', '/site', use_directory_urls=True) for path in paths]
+        set_exclusions(files, config)
+        self.assertEqual({f.src_uri: f.inclusion for f in files}, expected)
+        self.assertEqual(expected['api/keep.md'], InclusionLevel.NOT_IN_NAV)
+        self.assertEqual(expected['xzy/a.md'], InclusionLevel.EXCLUDED)
+
+        # The matcher is reused as long as the patterns are the same.
+        matcher = _get_inclusion_matcher(config)
+        self.assertIs(_get_inclusion_matcher(load_config(**options)), matcher)
+        self.assertIsNot(_get_inclusion_matcher(load_config(exclude_docs='*.py')), matcher)
+
+    @tempdir(
+        files=[
+            'b/index.md',
+            'b/a.md',
+            'a/z/1.md',
+            'a/2.md',
+            'a.md',
+            'api/x/1.md',
+            'api/x.md',
+            '.git/HEAD',
+        ]
+    )
+    def test_get_files_walk_order_and_pruning(self, tdir):
+        def get_files_and_scanned_dirs(exclude_docs, prune_excluded_docs=True):
+            config = load_config(
+                docs_dir=tdir, exclude_docs=exclude_docs, prune_excluded_docs=prune_excluded_docs
+            )
+            with mock.patch('os.scandir', wraps=os.scandir) as mock_scandir:
+                files = get_files(config)
+            scanned = {os.path.relpath(args[0], tdir) for args, _ in mock_scandir.call_args_list}
+            return files, [f.src_uri for f in files], scanned
+
+        all_files = [
+            'a.md',
+            '.git/HEAD',
+            'a/2.md',
+            'a/z/1.md',
+            'api/x.md',
+            'api/x/1.md',
+            'b/index.md',
+            'b/a.md',
+        ]
+        all_dirs = {'.', '.git', 'a', 'a/z', 'api', 'api/x', 'b'}
+
+        # By default, all directories are scanned, in the same order as `os.walk`.
+        files, src_uris, scanned = get_files_and_scanned_dirs('/api/', prune_excluded_docs=False)
+        self.assertEqual(src_uris, all_files)
+        self.assertEqual(scanned, all_dirs)
+        self.assertFalse(files._is_in_pruned_dir('api/x.md'))
+
+        # Excluded directories are not scanned.
+        files, src_uris, scanned = get_files_and_scanned_dirs('/api/')
+        self.assertEqual(src_uris, ['a.md', 'a/2.md', 'a/z/1.md', 'b/index.md', 'b/a.md'])
+        self.assertEqual(scanned, {'.', 'a', 'a/z', 'b'})
+        self.assertEqual(files._pruned_dirs, ('.git/', 'api/'))
+        self.assertTrue(files._is_in_pruned_dir('api/x/1.md'))
+        self.assertFalse(files._is_in_pruned_dir('apix.md'))
+
+        # With negated patterns, any file could be included again, so all directories are scanned.
+        files, src_uris, scanned = get_files_and_scanned_dirs('/api/\n!/api/x.md')
+        self.assertEqual(src_uris, all_files)
+        self.assertEqual(scanned, all_dirs)
+
     @tempdir(
         files=[
             'README.md',
@@ -708,6 +856,50 @@ class TestFiles(PathAssertionMixin, unittest.TestCase):
         with open(dest_path, encoding='utf-8') as f:
             self.assertEqual(f.read(), 'ö')
 
+    @tempdir()
+    @tempdir(files={'a/1.png': '1', 'a/b/2.png': '2', 'c/3.png': '3', 'theme/4.css': 'theme'})
+    def test_copy_static_files_in_parallel(self, src_dir, dest_dir):
+        fs = [
+            File('a/1.png', src_dir, dest_dir, use_directory_urls=True),
+            File('a/b/2.png', src_dir, dest_dir, use_directory_urls=True),
+            File('c/3.png', src_dir, dest_dir, use_directory_urls=True),
+            File('index.md', src_dir, dest_dir, use_directory_urls=True),
+            File('theme/4.css', src_dir, dest_dir, use_directory_urls=True, dest_uri='4.css'),
+            File.generated(mock.Mock(site_dir=dest_dir), '4.css', content='docs'),
+        ]
+        Files(fs).copy_static_files(jobs=4)
+        for path, content in (
+            ('a/1.png', '1'),
+            ('a/b/2.png', '2'),
+            ('c/3.png', '3'),
+            ('4.css', 'docs'),
+        ):
+            with open(os.path.join(dest_dir, path), encoding='utf-8') as f:
+                self.assertEqual(f.read(), content)
+        self.assertPathNotExists(dest_dir, 'index.html')
+
+    @tempdir()
+    @tempdir(files={'a.png': 'a', 'b.png': 'b'})
+    def test_copy_static_files_with_overridden_copy_file(self, src_dir, dest_dir):
+        copied = []
+
+        class PluginFile(File):
+            def copy_file(self, dirty=False):
+                copied.append(self.src_uri)
+                super().copy_file(dirty)
+
+        for jobs in 1, 2:
+            with self.subTest(jobs=jobs):
+                copied.clear()
+                fs = [
+                    PluginFile('a.png', src_dir, dest_dir, use_directory_urls=True),
+                    File('b.png', src_dir, dest_dir, use_directory_urls=True),
+                ]
+                Files(fs).copy_static_files(copy_strategy='hardlink', jobs=jobs)
+                self.assertEqual(copied, ['a.png'])
+                self.assertFalse(os.path.samefile(fs[0].abs_src_path, fs[0].abs_dest_path))
+                self.assertTrue(os.path.samefile(fs[1].abs_src_path, fs[1].abs_dest_path))
+
     def test_files_append_remove_src_paths(self):
         fs = [
             File('index.md', '/path/to/docs', '/path/to/site', use_directory_urls=True),
@@ -739,6 +739,45 @@ class PageTests(unittest.TestCase):
             ),
         )
 
+    def test_page_render_reuses_markdown_instance(self):
+        cfg = load_config(markdown_extensions=['toc', 'footnotes', 'abbr'])
+        sources = {
+            'a.md': '# A\n\nText[^1] with HTML.\n\n[^1]: Note A\n\n*[HTML]: Hyper Text',
+            'b.md': '# B\n\nText[^2] with HTML.\n\n[^2]: Note B',
+        }
+        files = Files(
+            [File(name, cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls) for name in sources]
+        )
+        with mock.patch('markdown.Markdown', wraps=markdown.Markdown) as mock_markdown:
+            pages = []
+            for file in files:
+                pg = Page(None, file, cfg)
+                pg.markdown = sources[file.src_uri]
+                pg.render(cfg, files)
+                pages.append(pg)
+        self.assertEqual(mock_markdown.call_count, 1)
+
+        # The results are the same as with a separate instance for each page.
+        for pg in pages:
+            md = markdown.Markdown(extensions=['toc', 'footnotes', 'abbr'])
+            self.assertEqual(pg.content, md.convert(pg.markdown))
+            self.assertEqual([item.title for item in pg.toc], [pg.file.name.upper()])
+        self.assertNotIn('<abbr', pages[1].content)
+
+    def test_page_render_with_unknown_extension(self):
+        cfg = load_config(
+            markdown_extensions=['toc', {'mkdocs.tests.build_tests': {'base_path': '.'}}]
+        )
+        files = Files(
+            [File(name, cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls) for name in 'ab']
+        )
+        with mock.patch('markdown.Markdown', wraps=markdown.Markdown) as mock_markdown:
+            for file in files:
+                pg = Page(None, file, cfg)
+                pg.markdown = '# Hi'
+                pg.render(cfg, files)
+        self.assertEqual(mock_markdown.call_count, 2)
+
     def test_missing_page(self):
         cfg = load_config()
         fl = File('missing.md', cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls)
@@ -1380,3 +1419,37 @@ class RelativePathExtensionTests(unittest.TestCase):
             exp_true='test.png, test.png.md, foo/test.png, foo/test.png.md',
             exp_false='test.png, test.png.md',
         )
+
+    def test_link_resolutions_shared_between_pages(self):
+        cfg = load_config(docs_dir=DOCS_DIR)
+        fs = [
+            File(f, cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls)
+            for f in ['a/one.md', 'a/two.md', 'a/target.md']
+        ]
+        files = Files(fs)
+        pages = [Page('One', fs[0], cfg), Page('Two', fs[1], cfg)]
+
+        with mock.patch.object(
+            Files, 'get_file_from_path', autospec=True, side_effect=Files.get_file_from_path
+        ) as mock_get_file:
+            for pg in pages:
+                pg.markdown = '[x](target.md#sec) [y](missing.md)'
+                with self.assertLogs('mkdocs.structure.pages') as cm:
+                    pg.render(cfg, files)
+                self.assertEqual(
+                    pg.content, '<p><a href="../target/#sec">x</a> <a href="missing.md">y</a></p>'
+                )
+                # Broken links are still reported for each page.
+                self.assertEqual(len(cm.records), 1)
+                self.assertIs(pg._link_targets['a/target.md'], fs[2])
+                self.assertEqual(pg.links_to_anchors, {fs[2]: {'sec': 'target.md#sec'}})
+        looked_up = [call.args[1] for call in mock_get_file.call_args_list]
+        self.assertEqual(looked_up.count('a/target.md'), 1)
+        self.assertEqual(looked_up.count('a/missing.md'), 2)
+
+        # The resolutions are forgotten when the files change.
+        files.remove(fs[2])
+        with self.assertLogs('mkdocs.structure.pages') as cm:
+            pages[0].render(cfg, files)
+        self.assertEqual(len(cm.records), 2)
+        self.assertIsNone(pages[0]._link_targets['a/target.md'])
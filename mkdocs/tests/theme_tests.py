@@ -123,3 +123,28 @@ class ThemeTests(unittest.TestCase):
                     'locale': parse_locale('en'),
                 },
             )
+
+    @tempdir()
+    @tempdir(files={'main.html': 'Hello {{ name }}'})
+    def test_bytecode_cache(self, custom, cache_dir):
+        theme = Theme(name='mkdocs', custom_dir=custom)
+        env = theme.get_env(bytecode_cache_dir=cache_dir)
+        self.assertEqual(env.get_template('main.html').render(name='a'), 'Hello a')
+        [subdir] = os.listdir(cache_dir)
+        self.assertEqual(len(os.listdir(os.path.join(cache_dir, subdir))), 1)
+
+        # Another environment loads the compiled template instead of compiling it again.
+        env = theme.get_env(bytecode_cache_dir=cache_dir)
+        with mock.patch.object(env, 'compile', wraps=env.compile) as mock_compile:
+            self.assertEqual(env.get_template('main.html').render(name='b'), 'Hello b')
+        mock_compile.assert_not_called()
+
+        # But not when the template changed.
+        with open(os.path.join(custom, 'main.html'), 'w') as f:
+            f.write('Bye {{ name }}')
+        env = theme.get_env(bytecode_cache_dir=cache_dir)
+        self.assertEqual(env.get_template('main.html').render(name='c'), 'Bye c')
+
+        # The cache isn't shared with other theme dirs.
+        Theme(name='readthedocs', custom_dir=custom).get_env(bytecode_cache_dir=cache_dir)
+        self.assertEqual(len(os.listdir(cache_dir)), 2)
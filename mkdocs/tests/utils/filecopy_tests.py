@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+
+import os
+import shutil
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from mkdocs.tests.base import tempdir
+from mkdocs.utils import filecopy
+
+
+class CopyFileTests(unittest.TestCase):
+    @tempdir(files={'src.txt': 'content'})
+    def test_strategies(self, tdir):
+        src = os.path.join(tdir, 'src.txt')
+        for strategy in filecopy.COPY_STRATEGIES:
+            with self.subTest(strategy=strategy):
+                dst = os.path.join(tdir, f'{strategy}.txt')
+                filecopy.copy_file(src, dst, strategy)
+                filecopy.copy_file(src, dst, strategy)
+                self.assertEqual(Path(dst).read_text(), 'content')
+                self.assertEqual(os.path.samefile(src, dst), strategy == 'hardlink')
+
+    @tempdir(files={'src.txt': 'content'})
+    def test_copy_breaks_hardlink(self, tdir):
+        src = os.path.join(tdir, 'src.txt')
+        for strategy in 'copy', 'reflink':
+            with self.subTest(strategy=strategy):
+                dst = os.path.join(tdir, f'{strategy}.txt')
+                filecopy.copy_file(src, dst, 'hardlink')
+                self.assertTrue(os.path.samefile(src, dst))
+                filecopy.copy_file(src, dst, strategy)
+                self.assertFalse(os.path.samefile(src, dst))
+                self.assertEqual(Path(dst).read_text(), 'content')
+
+    @tempdir(files={'src.txt': 'content', 'other.txt': 'other'})
+    def test_copy_over_hardlink_keeps_source(self, tdir):
+        src = os.path.join(tdir, 'src.txt')
+        for strategy in filecopy.COPY_STRATEGIES:
+            with self.subTest(strategy=strategy):
+                dst = os.path.join(tdir, f'{strategy}.txt')
+                filecopy.copy_file(src, dst, 'hardlink')
+                filecopy.copy_file(os.path.join(tdir, 'other.txt'), dst, strategy)
+                self.assertEqual(Path(dst).read_text(), 'other')
+                self.assertEqual(Path(src).read_text(), 'content')
+
+    @tempdir(files={'src.txt': 'content'})
+    def test_break_hardlink(self, tdir):
+        src = os.path.join(tdir, 'src.txt')
+        dst = os.path.join(tdir, 'dst.txt')
+        filecopy.copy_file(src, dst, 'hardlink')
+        filecopy.break_hardlink(dst)
+        filecopy.break_hardlink(dst)
+        self.assertFalse(os.path.exists(dst))
+        self.assertEqual(Path(src).read_text(), 'content')
+
+    @tempdir(files={'src.txt': 'content'})
+    def test_same_file(self, tdir):
+        src = os.path.join(tdir, 'src.txt')
+        for strategy in 'copy', 'reflink':
+            with self.subTest(strategy=strategy):
+                with self.assertRaises(shutil.SameFileError):
+                    filecopy.copy_file(src, src, strategy)
+        filecopy.copy_file(src, src, 'hardlink')
+        self.assertEqual(Path(src).read_text(), 'content')
+
+    @tempdir(files={'src.txt': 'content'})
+    def test_fallbacks(self, tdir):
+        src = os.path.join(tdir, 'src.txt')
+        dst = os.path.join(tdir, 'dst.txt')
+        with mock.patch('os.link', side_effect=OSError), mock.patch(
+            'mkdocs.utils.filecopy._reflink', return_value=False
+        ), mock.patch('mkdocs.utils.filecopy._copy_file_range', return_value=False), mock.patch(
+            'shutil.copyfile', wraps=shutil.copyfile
+        ) as mock_copyfile:
+            filecopy.copy_file(src, dst, 'hardlink')
+        mock_copyfile.assert_called_once_with(src, dst)
+        self.assertEqual(Path(dst).read_text(), 'content')
+        self.assertFalse(os.path.samefile(src, dst))
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+
+import os
+import shutil
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from mkdocs import utils
+from mkdocs.tests.base import tempdir
+from mkdocs.utils.output import MemoryOutput, OutputManifest
+
+
+class OutputManifestTests(unittest.TestCase):
+    @tempdir(files={'src.txt': 'source'})
+    @tempdir(files={'same.txt': 'same', 'other.txt': 'old'})
+    def test_write_only_changed(self, site_dir, src_dir):
+        manifest_path = os.path.join(site_dir, '.cache', 'output.json')
+        manifest = OutputManifest(site_dir, manifest_path)
+        manifest.activate()
+        try:
+            with mock.patch('shutil.copyfile', wraps=shutil.copyfile) as mock_copyfile:
+                utils.write_file(b'same', os.path.join(site_dir, 'same.txt'))
+                utils.write_file(b'new', os.path.join(site_dir, 'other.txt'))
+                utils.write_file(b'new', os.path.join(site_dir, 'sub', 'new.txt'))
+                utils.copy_file(os.path.join(src_dir, 'src.txt'), site_dir)
+                utils.copy_file(os.path.join(src_dir, 'src.txt'), site_dir)
+            self.assertEqual(mock_copyfile.call_count, 1)
+        finally:
+            manifest.close()
+        self.assertIsNone(OutputManifest.current())
+        self.assertEqual((manifest.written, manifest.unchanged), (3, 2))
+        self.assertEqual(Path(site_dir, 'other.txt').read_text(), 'new')
+        self.assertEqual(Path(site_dir, 'sub', 'new.txt').read_text(), 'new')
+        self.assertEqual(Path(site_dir, 'src.txt').read_text(), 'source')
+
+        # Files recorded in the manifest are not read again to be compared.
+        manifest = OutputManifest(site_dir, manifest_path)
+        with mock.patch('mkdocs.utils.output._hash_file') as mock_hash_file:
+            self.assertFalse(manifest.write_file(b'same', os.path.join(site_dir, 'same.txt')))
+            self.assertTrue(manifest.write_file(b'sam3', os.path.join(site_dir, 'same.txt')))
+            # Neither are unchanged source files of copies.
+            self.assertFalse(
+                manifest.copy_file(
+                    os.path.join(src_dir, 'src.txt'), os.path.join(site_dir, 'src.txt')
+                )
+            )
+        mock_hash_file.assert_not_called()
+
+        Path(src_dir, 'src.txt').write_text('changed')
+        self.assertTrue(
+            manifest.copy_file(os.path.join(src_dir, 'src.txt'), os.path.join(site_dir, 'src.txt'))
+        )
+        self.assertEqual(Path(site_dir, 'src.txt').read_text(), 'changed')
+
+    @tempdir(files={'a.txt': 'aaa'})
+    def test_manifest_of_other_site_dir_is_ignored(self, site_dir):
+        manifest_path = os.path.join(site_dir, '.cache', 'output.json')
+        manifest = OutputManifest(site_dir, manifest_path)
+        manifest.write_file(b'aaa', os.path.join(site_dir, 'a.txt'))
+        manifest.save()
+
+        manifest = OutputManifest(os.path.join(site_dir, 'other'), manifest_path)
+        self.assertEqual(manifest._old_entries, {})
+
+    @tempdir(
+        files={
+            'stale.txt': '',
+            'kept.txt': '',
+            'written.txt': '',
+            'dir/stale.txt': '',
+            '.hidden': '',
+            '.dir/stale.txt': '',
+            'recent.txt': '',
+        }
+    )
+    def test_prune(self, site_dir):
+        manifest = OutputManifest(site_dir)
+        manifest.snapshot()
+        manifest.activate()
+        try:
+            utils.write_file(b'new', os.path.join(site_dir, 'written.txt'))
+            # Written by a plugin directly, or left in place by it.
+            Path(site_dir, 'plugin.txt').write_text('')
+            Path(site_dir, 'dir', 'stale.txt').write_text('changed')
+            OutputManifest.current().keep(os.path.join(site_dir, 'stale.txt'))
+        finally:
+            manifest.close()
+        removed = manifest.prune(keep=[os.path.join(site_dir, 'kept.txt')])
+
+        self.assertEqual(removed, ['recent.txt'])
+        self.assertEqual(
+            sorted(os.listdir(site_dir)),
+            ['.dir', '.hidden', 'dir', 'kept.txt', 'plugin.txt', 'stale.txt', 'written.txt'],
+        )
+
+        # Without a snapshot, all files that weren't produced are stale, however recent.
+        manifest = OutputManifest(site_dir)
+        self.assertEqual(
+            sorted(manifest.prune()),
+            ['dir/stale.txt', 'kept.txt', 'plugin.txt', 'stale.txt', 'written.txt'],
+        )
+        self.assertEqual(sorted(os.listdir(site_dir)), ['.dir', '.hidden'])
+
+
+class MemoryOutputTests(unittest.TestCase):
+    @tempdir(files={'src.txt': 'source'})
+    @tempdir()
+    def test_keeps_files_in_memory(self, site_dir, src_dir):
+        output = MemoryOutput(site_dir)
+        output.activate()
+        try:
+            utils.write_file(b'new', os.path.join(site_dir, 'sub', 'new.txt'))
+            utils.copy_file(os.path.join(src_dir, 'src.txt'), site_dir)
+        finally:
+            output.close()
+        self.assertIsNone(OutputManifest.current())
+        self.assertEqual(
+            output.files,
+            {'sub/new.txt': b'new', 'src.txt': os.path.join(src_dir, 'src.txt')},
+        )
+        self.assertFalse(os.path.exists(os.path.join(site_dir, 'sub', 'new.txt')))
+        self.assertFalse(os.path.exists(os.path.join(site_dir, 'src.txt')))
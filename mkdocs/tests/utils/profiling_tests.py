@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+
+import json
+import os
+import unittest
+
+from mkdocs.tests.base import tempdir
+from mkdocs.utils import profiling
+
+
+class ProfilerTests(unittest.TestCase):
+    def _get_profiler(self):
+        profiler = profiling.Profiler()
+        start = profiler._origin
+        profiler.add('phase', 'nav', start, 1.0)
+        profiler.add('phase', 'build_pages', start + 1, 5.0)
+        profiler.add('event', 'page_content', start + 1, 0.5, plugin='foo')
+        profiler.add('event', 'page_content', start + 3, 1.5, plugin='foo')
+        profiler.add('event', 'post_build', start + 6, 0.25, plugin='bar')
+        profiler.add('page', 'populate', start + 1, 2.0, page='a.md')
+        profiler.add('page', 'build', start + 3, 1.0, page='a.md')
+        profiler.add('page', 'populate', start + 4, 2.0, page='b.md')
+        return profiler
+
+    def test_report(self):
+        report = self._get_profiler().report(top=1)
+        self.assertEqual(report['total_seconds'], 6.25)
+        self.assertEqual(
+            report['phases'],
+            [dict(name='nav', seconds=1.0), dict(name='build_pages', seconds=5.0)],
+        )
+        self.assertEqual(
+            report['events'],
+            [
+                dict(plugin='foo', event='page_content', calls=2, seconds=2.0),
+                dict(plugin='bar', event='post_build', calls=1, seconds=0.25),
+            ],
+        )
+        self.assertEqual(
+            report['pages'],
+            [
+                dict(page='a.md', seconds=3.0, populate=2.0, build=1.0),
+                dict(page='b.md', seconds=2.0, populate=2.0),
+            ],
+        )
+        self.assertEqual(report['slowest_plugins'], [dict(plugin='foo', seconds=2.0)])
+        self.assertEqual(report['slowest_pages'], [dict(page='a.md', seconds=3.0)])
+
+    def test_span(self):
+        profiler = profiling.Profiler()
+        with profiler.span('page', 'build', page='a.md'):
+            pass
+        [span] = profiler.spans
+        self.assertEqual(span[:2], ('page', 'build'))
+        self.assertEqual(span.args, {'page': 'a.md'})
+        self.assertEqual(span.process_id, os.getpid())
+        self.assertGreaterEqual(span.duration, 0)
+
+    @tempdir()
+    def test_save_report(self, tdir):
+        path = os.path.join(tdir, 'profile.json')
+        with self.assertLogs('mkdocs.utils.profiling') as cm:
+            profiling.save_report(self._get_profiler(), path, top=2)
+        self.assertEqual(
+            cm.output[0].split(':', 2)[2],
+            (
+                'Profile of the build:\n'
+                'Phase             seconds\n'
+                'nav                 1.000\n'
+                'build_pages         5.000\n'
+                '\n'
+                'Slowest plugins   seconds\n'
+                'foo                 2.000\n'
+                'bar                 0.250\n'
+                '\n'
+                'Slowest pages     seconds\n'
+                'a.md                3.000\n'
+                'b.md                2.000\n'
+                '\n'
+                'Total: 6.250 seconds'
+            ),
+        )
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f)['slowest_pages'][1], dict(page='b.md', seconds=2.0))
+
+    @tempdir()
+    def test_save_trace(self, tdir):
+        profiler = self._get_profiler()
+        profiler.add(
+            'page', 'render', profiler._origin + 1, 0.5, process_id=1, thread_id=2, page='a.md'
+        )
+        path = os.path.join(tdir, 'trace.json')
+        with self.assertLogs('mkdocs.utils.profiling'):
+            profiling.save_trace(profiler, path)
+        with open(path, encoding='utf-8') as f:
+            events = json.load(f)['traceEvents']
+        self.assertEqual(
+            events[:2],
+            [
+                dict(
+                    name='process_name',
+                    ph='M',
+                    pid=1,
+                    tid=0,
+                    args=dict(name='mkdocs render worker'),
+                ),
+                dict(name='process_name', ph='M', pid=os.getpid(), tid=0, args=dict(name='mkdocs')),
+            ],
+        )
+        self.assertEqual(
+            [e['name'] for e in events[2:]],
+            [
+                'nav',
+                'build_pages',
+                'foo: on_page_content',
+                'foo: on_page_content',
+                'bar: on_post_build',
+                'populate a.md',
+                'build a.md',
+                'populate b.md',
+                'render a.md',
+            ],
+        )
+        self.assertEqual(
+            events[-1],
+            dict(
+                name='render a.md',
+                cat='page',
+                ph='X',
+                ts=1000000.0,
+                dur=500000.0,
+                pid=1,
+                tid=2,
+                args=dict(page='a.md'),
+            ),
+        )
@@ -3,9 +3,20 @@ from textwrap import dedent
 
 import yaml
 
-from mkdocs.tests.base import load_config
+from mkdocs.commands.build import get_context
+from mkdocs.structure.files import File, Files
+from mkdocs.structure.nav import get_navigation
+from mkdocs.tests.base import load_config, tempdir
+from mkdocs.theme import Theme
 from mkdocs.utils import templates
 
+ITEM_TEMPLATE = (
+    '<li{% if nav_item.active %} class="active"{% endif %}>'
+    '{%- if nav_item.children %}<span>{{ nav_item.title }}</span><ul>'
+    '{%- for nav_item in nav_item.children %}INCLUDE{% endfor %}</ul>'
+    '{%- else %}<a href="{{ nav_item.url|url }}">{{ nav_item.title }}</a>{% endif %}</li>'
+)
+
 
 class UtilsTemplatesTests(unittest.TestCase):
     def test_script_tag(self):
@@ -47,3 +58,47 @@ class UtilsTemplatesTests(unittest.TestCase):
                 '<script src="here/plain_string.mjs"></script>',
             ],
         )
+
+    @tempdir(
+        files={
+            'cached.html': "{% for nav_item in nav %}{{ nav_item|nav_fragment('item.html') }}{% endfor %}",
+            'included.html': "{% for nav_item in nav %}{% include 'item-include.html' %}{% endfor %}",
+            'item.html': ITEM_TEMPLATE.replace(
+                'INCLUDE', "{{ nav_item|nav_fragment('item.html') }}"
+            ),
+            'item-include.html': ITEM_TEMPLATE.replace(
+                'INCLUDE', "{% include 'item-include.html' %}"
+            ),
+        }
+    )
+    def test_nav_fragment(self, custom_dir):
+        nav_cfg = [
+            {'Home': 'index.md'},
+            {'A': [{'One': 'a/one.md'}, {'B': [{'Two': 'a/b/two.md'}, 'a/b/three.md']}]},
+            {'C': ['c/four.md', {'Link': 'https://example.com/'}]},
+        ]
+        cfg = load_config(nav=nav_cfg, theme={'name': None, 'custom_dir': custom_dir})
+        files = Files(
+            [
+                File(path, cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls)
+                for path in ['index.md', 'a/one.md', 'a/b/two.md', 'a/b/three.md', 'c/four.md']
+            ]
+        )
+        nav = get_navigation(files, cfg)
+        env = Theme(custom_dir=custom_dir).get_env()
+        cached, included = env.get_template('cached.html'), env.get_template('included.html')
+
+        for page in nav.pages:
+            page.active = True
+            with self.subTest(page=page.url):
+                context = get_context(nav, files, cfg, page)
+                output = cached.render(context)
+                self.assertEqual(output, included.render(context))
+                self.assertEqual(output.count(' class="active"'), len(page.ancestors) + 1)
+            page.active = False
+        context = get_context(nav, files, cfg, base_url='..')
+        self.assertEqual(cached.render(context), included.render(context))
+
+        # Each item was rendered at most once in each state.
+        cache = env.filters['nav_fragment'].__self__
+        self.assertEqual(len(cache._variants), 9 + 8)
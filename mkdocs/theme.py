@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
 import os
 import warnings
 from typing import Any, Collection, MutableMapping
 
 import jinja2
+import jinja2.bccache
 import yaml
 
 try:
@@ -155,12 +158,49 @@ class Theme(MutableMapping[str, Any]):
         self.static_templates.update(theme_config.pop('static_templates', []))
         self.__vars.update(theme_config)
 
-    def get_env(self) -> jinja2.Environment:
-        """Return a Jinja environment for the theme."""
+    def get_env(self, *, bytecode_cache_dir: str | None = None) -> jinja2.Environment:
+        """
+        Return a Jinja environment for the theme.
+
+        If `bytecode_cache_dir` is given, the compiled templates are stored in a subdirectory of
+        it, so that other processes don't need to compile them again. The subdirectory is specific
+        to the theme dirs, the version of Jinja and the extensions of the environment, and a
+        template whose source changed is compiled again.
+        """
         loader = jinja2.FileSystemLoader(self.dirs)
         # No autoreload because editing a template in the middle of a build is not useful.
         env = jinja2.Environment(loader=loader, auto_reload=False)
         env.filters['url'] = templates.url_filter
         env.filters['script_tag'] = templates.script_tag_filter
+        env.filters['nav_fragment'] = templates.NavFragmentCache().nav_fragment_filter
         localization.install_translations(env, self.locale, self.dirs)
+        if bytecode_cache_dir is not None:
+            # The compiled code depends on the extensions, so set up the cache after adding them.
+            key = json.dumps(
+                [
+                    [os.path.abspath(d) for d in self.dirs],
+                    jinja2.__version__,
+                    sorted(env.extensions),
+                    getattr(env, 'newstyle_gettext', None),
+                ]
+            )
+            cache_dir = os.path.join(
+                bytecode_cache_dir, hashlib.sha256(key.encode()).hexdigest()[:16]
+            )
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+            except OSError as e:
+                log.warning(f"Not caching compiled templates: {e}")
+            else:
+                env.bytecode_cache = _BytecodeCache(cache_dir)
         return env
+
+
+class _BytecodeCache(jinja2.FileSystemBytecodeCache):
+    """A bytecode cache that doesn't fail the build if a compiled template can't be stored."""
+
+    def dump_bytecode(self, bucket: jinja2.bccache.Bucket) -> None:
+        try:
+            super().dump_bytecode(bucket)
+        except OSError as e:
+            log.debug(f"Could not cache the compiled template '{bucket.key}': {e}")
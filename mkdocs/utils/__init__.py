@@ -26,6 +26,8 @@ else:
     from importlib_metadata import EntryPoint, entry_points
 
 from mkdocs import exceptions
+from mkdocs.utils import filecopy
+from mkdocs.utils.output import OutputManifest
 from mkdocs.utils.yaml import get_yaml_loader, yaml_load  # noqa: F401 - legacy re-export
 
 if TYPE_CHECKING:
@@ -110,23 +112,40 @@ else:
         a.insert(i, x)
 
 
-def copy_file(source_path: str, output_path: str) -> None:
+def copy_file(source_path: str, output_path: str, strategy: str = 'copy') -> None:
     """
     Copy source_path to output_path, making sure any parent directories exist.
 
-    The output_path may be a directory.
+    The output_path may be a directory. See `mkdocs.utils.filecopy` for the possible strategies.
     """
     output_dir = os.path.dirname(output_path)
     os.makedirs(output_dir, exist_ok=True)
     if os.path.isdir(output_path):
         output_path = os.path.join(output_path, os.path.basename(source_path))
-    shutil.copyfile(source_path, output_path)
+    _copy_file(source_path, output_path, strategy)
+
+
+def _copy_file(source_path: str, output_path: str, strategy: str = 'copy') -> None:
+    """Like `copy_file`, but the parent directory of output_path (a file path) must exist."""
+    if (manifest := OutputManifest.current()) is not None:
+        manifest.copy_file(source_path, output_path, strategy)
+        return
+    filecopy.copy_file(source_path, output_path, strategy)
 
 
 def write_file(content: bytes, output_path: str) -> None:
     """Write content to output_path, making sure any parent directories exist."""
     output_dir = os.path.dirname(output_path)
     os.makedirs(output_dir, exist_ok=True)
+    _write_file(content, output_path)
+
+
+def _write_file(content: bytes, output_path: str) -> None:
+    """Like `write_file`, but the parent directory of output_path must exist."""
+    if (manifest := OutputManifest.current()) is not None:
+        manifest.write_file(content, output_path)
+        return
+    filecopy.break_hardlink(output_path)
     with open(output_path, 'wb') as f:
         f.write(content)
 
@@ -167,11 +186,12 @@ def is_error_template(path: str) -> bool:
 
 
 @functools.lru_cache(maxsize=None)
-def _norm_parts(path: str) -> list[str]:
+def _norm_parts(path: str) -> tuple[str, ...]:
     if not path.startswith('/'):
         path = '/' + path
     path = posixpath.normpath(path)[1:]
-    return path.split('/') if path else []
+    # Interned, so that comparing equal components is just an identity check.
+    return tuple(map(sys.intern, path.split('/'))) if path else ()
 
 
 def get_relative_url(url: str, other: str) -> str:
@@ -193,11 +213,11 @@ def get_relative_url(url: str, other: str) -> str:
     dest_parts = _norm_parts(url)
     common = 0
     for a, b in zip(other_parts, dest_parts):
-        if a != b:
+        if a is not b:
             break
         common += 1
 
-    rel_parts = ['..'] * (len(other_parts) - common) + dest_parts[common:]
+    rel_parts = ('..',) * (len(other_parts) - common) + dest_parts[common:]
     relurl = '/'.join(rel_parts) or '.'
     return relurl + '/' if url.endswith('/') else relurl
 
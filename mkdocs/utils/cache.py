@@ -1,11 +1,16 @@
-import datetime
+from __future__ import annotations
+
+import os
 import urllib.request
-from typing import Callable
+from typing import TYPE_CHECKING, Callable
 
 import mkdocs_get_deps.cache
 
 import mkdocs
 
+if TYPE_CHECKING:
+    import datetime
+
 
 def download_url(url: str) -> bytes:
     req = urllib.request.Request(url, headers={"User-Agent": f"mkdocs/{mkdocs.__version__}"})
@@ -34,3 +39,20 @@ def download_and_cache_url(
     return mkdocs_get_deps.cache.download_and_cache_url(
         url=url, cache_duration=cache_duration, download=download, comment=comment
     )
+
+
+def get_project_cache_dir(config_file_path: str | None, *subdirs: str) -> str:
+    """
+    Returns the path of a directory under `.cache/mkdocs/` next to the config file.
+
+    This is meant for caches that are specific to one project, as opposed to the `~/.cache/` directory.
+    The directory is not created by this function.
+
+    Args:
+        config_file_path: The path to the config file (`mkdocs.yml`). If empty, the current directory is used.
+        subdirs: Path components to append to the directory.
+    """
+    base_dir = (
+        os.path.dirname(os.path.abspath(config_file_path)) if config_file_path else os.getcwd()
+    )
+    return os.path.join(base_dir, '.cache', 'mkdocs', *subdirs)
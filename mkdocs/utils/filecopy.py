@@ -0,0 +1,101 @@
+"""
+Copying files to `site_dir` with the `copy_strategy` chosen in the config.
+
+* `copy`: a regular copy with `shutil.copyfile`.
+* `reflink`: a copy-on-write clone (`FICLONE`) where the file system supports it, otherwise an
+  in-kernel copy with `os.copy_file_range`, otherwise a regular copy.
+* `hardlink`: a hard link if the source and the destination are on the same file system,
+  otherwise the same as `reflink`.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+
+if sys.platform != 'win32':
+    import fcntl
+
+COPY_STRATEGIES = ('copy', 'reflink', 'hardlink')
+
+# From <linux/fs.h>: _IOW(0x94, 9, int)
+_FICLONE = 0x40049409
+
+
+def break_hardlink(path: str) -> None:
+    """
+    Remove the file at `path` if it has other hard links, so that writing to it creates a new file.
+
+    Otherwise writing to a file that a previous build hard-linked from `docs_dir` would change the
+    source file too.
+    """
+    try:
+        if os.lstat(path).st_nlink > 1:
+            os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def _hardlink(source_path: str, output_path: str) -> bool:
+    try:
+        if os.stat(source_path).st_dev != os.stat(os.path.dirname(output_path)).st_dev:
+            return False
+        if os.path.lexists(output_path):
+            if os.path.samefile(source_path, output_path):
+                return True
+            os.unlink(output_path)
+        os.link(source_path, output_path)
+    except OSError:
+        return False
+    return True
+
+
+def _reflink(source_path: str, output_path: str) -> bool:
+    if sys.platform == 'win32':  # pragma: no cover
+        return False
+    try:
+        with open(source_path, 'rb') as src, open(output_path, 'wb') as dst:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+    except OSError:
+        return False
+    return True
+
+
+def _copy_file_range(source_path: str, output_path: str) -> bool:
+    if not hasattr(os, 'copy_file_range'):
+        return False
+    try:
+        with open(source_path, 'rb') as src, open(output_path, 'wb') as dst:
+            remaining = os.fstat(src.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                if not copied:
+                    return False
+                remaining -= copied
+    except OSError:
+        return False
+    return True
+
+
+def copy_file(source_path: str, output_path: str, strategy: str = 'copy') -> None:
+    """
+    Copy `source_path` to `output_path` (both are file paths) using the given strategy.
+
+    Like `shutil.copyfile`, raises `shutil.SameFileError` if both are the same path.
+    """
+    if strategy == 'hardlink' and _hardlink(source_path, output_path):
+        return
+    if os.path.lexists(output_path) and os.path.samefile(source_path, output_path):
+        if os.path.normcase(os.path.abspath(source_path)) == os.path.normcase(
+            os.path.abspath(output_path)
+        ):
+            raise shutil.SameFileError(f'{source_path!r} and {output_path!r} are the same file')
+        # Don't write through a hard link created by a previous build.
+        os.unlink(output_path)
+    else:
+        break_hardlink(output_path)
+    if strategy in ('hardlink', 'reflink'):
+        if _reflink(source_path, output_path) or _copy_file_range(source_path, output_path):
+            return
+    shutil.copyfile(source_path, output_path)
@@ -0,0 +1,267 @@
+"""
+Keeping track of the files written to `site_dir`, for `mkdocs build --write-if-changed` and `--prune`.
+
+While an `OutputManifest` is active, `mkdocs.utils.write_file` and `mkdocs.utils.copy_file` record
+the files they produce. If the manifest compares content, they also leave a file untouched
+(including its modification time) when its content is identical to the new one. At the end of the
+build, the files that weren't produced can be removed with `OutputManifest.prune`. Plugins that
+write to `site_dir` by other means, or leave a previous output in place, can call
+`OutputManifest.current().keep(path)` so that the file isn't considered stale.
+
+A `MemoryOutput` keeps the files in memory instead, for `mkdocs serve --in-memory`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import stat
+import threading
+from typing import ClassVar, Iterable, Mapping
+
+from mkdocs.utils import filecopy
+
+log = logging.getLogger(__name__)
+
+
+def _hash_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class OutputManifest:
+    """
+    Remembers the files that a build produced in the output directory.
+
+    If `manifest_path` is given, the size, modification time and hash of each file are recorded
+    and persisted there as JSON, and files whose content didn't change aren't written again. On the
+    next build the existing outputs don't need to be read again to be compared: a file whose size
+    and modification time match its entry is assumed to still have the recorded hash. The same is
+    recorded for the source files of copies, so unchanged sources aren't read either.
+    """
+
+    _active: ClassVar[OutputManifest | None] = None
+
+    def __init__(self, site_dir: str, manifest_path: str | None = None) -> None:
+        self.site_dir = os.path.abspath(site_dir)
+        self.manifest_path = manifest_path
+        self.written = self.unchanged = 0
+        self._lock = threading.Lock()
+        self._produced: set[str] = set()
+        self._old_entries: dict[str, tuple[int, int, str]] = {}
+        self._entries: dict[str, tuple[int, int, str]] = {}
+        # The same for source files of copies, keyed by absolute path.
+        self._old_sources: dict[str, tuple[int, int, str]] = {}
+        self._sources: dict[str, tuple[int, int, str]] = {}
+        # The files in site_dir before the build: path -> (inode, size, mtime_ns), see `snapshot`.
+        self._snapshot: dict[str, tuple[int, int, int]] | None = None
+        if manifest_path is None:
+            return
+        try:
+            with open(manifest_path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data['site_dir'] == self.site_dir:
+                self._old_entries = {k: tuple(v) for k, v in data['files'].items()}
+                self._old_sources = {k: tuple(v) for k, v in data.get('sources', {}).items()}
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    @classmethod
+    def current(cls) -> OutputManifest | None:
+        """Return the manifest that is active in the current build, if any."""
+        return cls._active
+
+    def activate(self) -> None:
+        """Route the writes of `mkdocs.utils.write_file` and `mkdocs.utils.copy_file` through this manifest."""
+        OutputManifest._active = self
+
+    def snapshot(self) -> None:
+        """Remember the files that are in `site_dir` now, so that `prune` keeps the ones that change after."""
+        snapshot = {}
+        for dirpath, _dirnames, filenames in os.walk(self.site_dir):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.lstat(path)
+                except OSError:
+                    continue
+                snapshot[self._key(path)] = (st.st_ino, st.st_size, st.st_mtime_ns)
+        self._snapshot = snapshot
+
+    def keep(self, path: str) -> None:
+        """Record that the file at `path` belongs to the output of this build, so `prune` keeps it."""
+        key = self._key(path)
+        with self._lock:
+            self._produced.add(key)
+
+    def close(self) -> None:
+        """Stop routing writes through this manifest and save it."""
+        if OutputManifest._active is self:
+            OutputManifest._active = None
+        if self.manifest_path is not None:
+            self.save()
+
+    def save(self) -> None:
+        assert self.manifest_path is not None
+        with self._lock:
+            data = dict(
+                site_dir=self.site_dir,
+                files=dict(sorted(self._entries.items())),
+                sources=dict(sorted(self._sources.items())),
+            )
+        try:
+            os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+            with open(self.manifest_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+        except OSError as e:
+            log.warning(f"Could not save the output manifest '{self.manifest_path}': {e}")
+
+    def _key(self, path: str) -> str:
+        return os.path.relpath(os.path.abspath(path), self.site_dir).replace(os.sep, '/')
+
+    def _existing_hash(self, path: str, size: int) -> str | None:
+        """Return the hash of the file at `path` if it's a regular file of the given size."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if not stat.S_ISREG(st.st_mode) or st.st_size != size:
+            return None
+        key = self._key(path)
+        with self._lock:
+            entry = self._entries.get(key) or self._old_entries.get(key)
+        if entry is not None and entry[:2] == (st.st_size, st.st_mtime_ns):
+            digest = entry[2]
+        else:
+            digest = _hash_file(path)
+        with self._lock:
+            self._entries[key] = (st.st_size, st.st_mtime_ns, digest)
+        return digest
+
+    def _source_hash(self, path: str) -> tuple[int, str]:
+        """Return the size and the hash of the source file at `path`, hashing it only if it changed."""
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        with self._lock:
+            entry = self._sources.get(path) or self._old_sources.get(path)
+        if entry is not None and entry[:2] == (st.st_size, st.st_mtime_ns):
+            digest = entry[2]
+        else:
+            digest = _hash_file(path)
+        with self._lock:
+            self._sources[path] = (st.st_size, st.st_mtime_ns, digest)
+        return st.st_size, digest
+
+    def _record(self, path: str, digest: str | None, written: bool) -> None:
+        st = os.stat(path) if digest is not None else None
+        key = self._key(path)
+        with self._lock:
+            self._produced.add(key)
+            if st is not None and digest is not None:
+                self._entries[key] = (st.st_size, st.st_mtime_ns, digest)
+            if written:
+                self.written += 1
+            else:
+                self.unchanged += 1
+
+    def write_file(self, content: bytes, output_path: str) -> bool:
+        """Write `content` to `output_path` unless the file already has it. Return whether it was written."""
+        digest = None
+        written = True
+        if self.manifest_path is not None:
+            digest = hashlib.sha256(content).hexdigest()
+            written = self._existing_hash(output_path, len(content)) != digest
+        if written:
+            filecopy.break_hardlink(output_path)
+            with open(output_path, 'wb') as f:
+                f.write(content)
+        self._record(output_path, digest, written)
+        return written
+
+    def copy_file(self, source_path: str, output_path: str, strategy: str = 'copy') -> bool:
+        """Copy `source_path` to `output_path` unless the content is the same. Return whether it was copied."""
+        digest = None
+        written = True
+        if self.manifest_path is not None:
+            size, digest = self._source_hash(source_path)
+            written = self._existing_hash(output_path, size) != digest
+        if written:
+            filecopy.copy_file(source_path, output_path, strategy)
+        self._record(output_path, digest, written)
+        return written
+
+    def prune(self, keep: Iterable[str] = ()) -> list[str]:
+        """
+        Remove the files in `site_dir` that weren't produced while the manifest was active.
+
+        Files in `keep` or passed to `keep()`, files that were created or modified since the
+        `snapshot` (e.g. written by a plugin directly) and hidden files at the top level are never
+        removed, nor are the directories that still contain anything. Return the relative paths of
+        the removed files.
+        """
+        with self._lock:
+            produced = self._produced | {self._key(path) for path in keep}
+        snapshot = self._snapshot
+        removed = []
+        for dirpath, _dirnames, filenames in os.walk(self.site_dir, topdown=False):
+            rel_dir = os.path.relpath(dirpath, self.site_dir).replace(os.sep, '/')
+            if rel_dir != '.' and rel_dir.startswith('.'):
+                continue
+            for name in filenames:
+                key = name if rel_dir == '.' else f'{rel_dir}/{name}'
+                path = os.path.join(dirpath, name)
+                if key in produced or (rel_dir == '.' and name.startswith('.')):
+                    continue
+                try:
+                    if snapshot is not None:
+                        st = os.lstat(path)
+                        if snapshot.get(key) != (st.st_ino, st.st_size, st.st_mtime_ns):
+                            continue
+                    os.unlink(path)
+                except OSError as e:
+                    log.warning(f"Could not remove the stale file '{path}': {e}")
+                    continue
+                removed.append(key)
+            if rel_dir != '.':
+                try:
+                    os.rmdir(dirpath)
+                except OSError:
+                    pass  # Not empty.
+        return removed
+
+
+class MemoryOutput(OutputManifest):
+    """
+    Keeps the files that a build produces in memory instead of writing them to `site_dir`.
+
+    `files` maps the path of each file relative to `site_dir` to its content. Copied files aren't
+    read: they map to the path of their source file. Files that plugins write to `site_dir`
+    directly still end up on disk, they're not in `files`.
+    """
+
+    def __init__(self, site_dir: str) -> None:
+        super().__init__(site_dir)
+        self._files: dict[str, bytes | str] = {}
+
+    @property
+    def files(self) -> Mapping[str, bytes | str]:
+        return self._files
+
+    def write_file(self, content: bytes, output_path: str) -> bool:
+        key = self._key(output_path)
+        with self._lock:
+            self._files[key] = content
+        self._record(output_path, None, True)
+        return True
+
+    def copy_file(self, source_path: str, output_path: str, strategy: str = 'copy') -> bool:
+        key = self._key(output_path)
+        with self._lock:
+            self._files[key] = os.path.abspath(source_path)
+        self._record(output_path, None, True)
+        return True
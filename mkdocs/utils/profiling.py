@@ -0,0 +1,192 @@
+"""
+Measuring how long the parts of a build take, for `mkdocs build --profile` and `--trace`.
+
+The build records spans of time into a `Profiler`: the phases of the build, each plugin event
+handler and each stage of processing each page. Afterwards they are aggregated into a report,
+or exported as a timeline.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Iterator, NamedTuple
+
+log = logging.getLogger(__name__)
+
+
+class Span(NamedTuple):
+    category: str
+    """One of 'phase', 'event' (a plugin's event handler) or 'page'."""
+    name: str
+    """The name of the phase, the event or the stage of processing the page."""
+    start: float
+    """Seconds since the profiler was created."""
+    duration: float
+    """Seconds."""
+    process_id: int
+    thread_id: int
+    args: dict[str, str]
+    """Extra info, e.g. `plugin` for events and `page` for pages."""
+
+
+class Profiler:
+    """Collects spans of time during a build."""
+
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+        self._origin = time.perf_counter()
+
+    @contextlib.contextmanager
+    def span(self, category: str, name: str, **args: str) -> Iterator[None]:
+        """Measure the time that the body of the `with` statement takes."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(category, name, start, time.perf_counter() - start, None, None, args)
+
+    def add(
+        self,
+        category: str,
+        name: str,
+        start: float,
+        duration: float,
+        *,
+        process_id: int | None = None,
+        thread_id: int | None = None,
+        **args: str,
+    ) -> None:
+        """
+        Record a span that was measured separately. `start` is a value of `time.perf_counter()`.
+
+        By default the span is attributed to the current process and thread.
+        """
+        self._record(category, name, start, duration, process_id, thread_id, args)
+
+    def _record(
+        self,
+        category: str,
+        name: str,
+        start: float,
+        duration: float,
+        process_id: int | None,
+        thread_id: int | None,
+        args: dict[str, str],
+    ) -> None:
+        span = Span(
+            category,
+            name,
+            start - self._origin,
+            duration,
+            os.getpid() if process_id is None else process_id,
+            threading.get_ident() if thread_id is None else thread_id,
+            args,
+        )
+        self.spans.append(span)
+
+    def report(self, top: int = 10) -> dict[str, Any]:
+        """Aggregate the spans into a report that can be serialized as JSON."""
+        phases: dict[str, float] = {}
+        events: dict[tuple[str, str], list] = {}
+        plugins: dict[str, float] = {}
+        pages: dict[str, dict[str, float]] = {}
+        for span in self.spans:
+            if span.category == 'phase':
+                phases[span.name] = phases.get(span.name, 0.0) + span.duration
+            elif span.category == 'event':
+                plugin = span.args.get('plugin', '<unknown>')
+                entry = events.setdefault((plugin, span.name), [0, 0.0])
+                entry[0] += 1
+                entry[1] += span.duration
+                plugins[plugin] = plugins.get(plugin, 0.0) + span.duration
+            elif span.category == 'page':
+                times = pages.setdefault(span.args.get('page', '<unknown>'), {})
+                times[span.name] = times.get(span.name, 0.0) + span.duration
+
+        page_totals = {page: sum(times.values()) for page, times in pages.items()}
+        return dict(
+            total_seconds=max((s.start + s.duration for s in self.spans), default=0.0),
+            phases=[dict(name=name, seconds=seconds) for name, seconds in phases.items()],
+            events=[
+                dict(plugin=plugin, event=event, calls=calls, seconds=seconds)
+                for (plugin, event), (calls, seconds) in events.items()
+            ],
+            pages=[dict(page=page, seconds=page_totals[page], **pages[page]) for page in pages],
+            slowest_plugins=[
+                dict(plugin=plugin, seconds=seconds)
+                for plugin, seconds in sorted(plugins.items(), key=lambda x: -x[1])[:top]
+            ],
+            slowest_pages=[
+                dict(page=page, seconds=seconds)
+                for page, seconds in sorted(page_totals.items(), key=lambda x: -x[1])[:top]
+            ],
+        )
+
+    def trace_events(self) -> list[dict[str, Any]]:
+        """
+        Convert the spans to the Trace Event Format.
+
+        This can be viewed in `chrome://tracing` or https://ui.perfetto.dev/.
+        """
+        events: list[dict[str, Any]] = []
+        for pid in sorted({span.process_id for span in self.spans}):
+            name = 'mkdocs' if pid == os.getpid() else 'mkdocs render worker'
+            events.append(dict(name='process_name', ph='M', pid=pid, tid=0, args=dict(name=name)))
+        for span in self.spans:
+            name = span.name
+            if span.category == 'event':
+                name = f"{span.args.get('plugin', '<unknown>')}: on_{span.name}"
+            elif span.category == 'page':
+                name = f"{span.name} {span.args.get('page', '<unknown>')}"
+            events.append(
+                dict(
+                    name=name,
+                    cat=span.category,
+                    ph='X',
+                    ts=round(span.start * 1e6, 3),
+                    dur=round(span.duration * 1e6, 3),
+                    pid=span.process_id,
+                    tid=span.thread_id,
+                    args=span.args,
+                )
+            )
+        return events
+
+
+def format_report(report: dict[str, Any]) -> str:
+    """Format the summary of a report (from `Profiler.report`) as a text table."""
+    sections = {
+        'Phase': [(p['name'], p['seconds']) for p in report['phases']],
+        'Slowest plugins': [(p['plugin'], p['seconds']) for p in report['slowest_plugins']],
+        'Slowest pages': [(p['page'], p['seconds']) for p in report['slowest_pages']],
+    }
+    width = max(len(name) for title, rows in sections.items() for name in [title, *dict(rows)])
+    lines = []
+    for title, rows in sections.items():
+        if rows:
+            lines.append(f"{title:<{width}}  {'seconds':>8}")
+            lines.extend(f"{name:<{width}}  {seconds:>8.3f}" for name, seconds in rows)
+            lines.append('')
+    lines.append(f"Total: {report['total_seconds']:.3f} seconds")
+    return '\n'.join(lines)
+
+
+def save_report(profiler: Profiler, path: str, top: int = 10) -> None:
+    """Log the summary of the profile and write the full report to `path` as JSON."""
+    report = profiler.report(top)
+    log.info(f"Profile of the build:\n{format_report(report)}")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    log.info(f"Profile report written to '{path}'")
+
+
+def save_trace(profiler: Profiler, path: str) -> None:
+    """Write the spans recorded by the profiler to `path` as JSON in the Trace Event Format."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(dict(traceEvents=profiler.trace_events(), displayTimeUnit='ms'), f)
+    log.info(f"Trace written to '{path}'")
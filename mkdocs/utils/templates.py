@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Sequence, TypedDict
+from typing import TYPE_CHECKING, Sequence, TypedDict, Union
 
 if TYPE_CHECKING:
     import datetime
 
+    import jinja2.runtime
+
 from markupsafe import Markup
 
 try:
@@ -12,13 +14,13 @@ try:
 except ImportError:
     from jinja2 import contextfilter  # type: ignore
 
-from mkdocs.utils import normalize_url
+from mkdocs.utils import _get_norm_url, _norm_parts, normalize_url
 
 if TYPE_CHECKING:
     from mkdocs.config.config_options import ExtraScriptValue
     from mkdocs.config.defaults import MkDocsConfig
     from mkdocs.structure.files import File
-    from mkdocs.structure.nav import Navigation
+    from mkdocs.structure.nav import Link, Navigation, Section
     from mkdocs.structure.pages import Page
 
 
@@ -37,6 +39,10 @@ class TemplateContext(TypedDict):
 @contextfilter
 def url_filter(context: TemplateContext, value: str) -> str:
     """A Template filter to normalize URLs."""
+    fragment = context.get('_nav_fragment')
+    if isinstance(fragment, _FragmentRecorder):
+        # Inside a cached nav fragment: the URL is resolved for each page by `NavFragmentCache`.
+        return fragment.defer(('url', str(value)))
     return normalize_url(str(value), page=context['page'], base=context['base_url'])
 
 
@@ -53,3 +59,164 @@ def script_tag_filter(context: TemplateContext, extra_script: ExtraScriptValue)
             html += ' async'
     html += '></script>'
     return Markup(html).format(url_filter(context, str(extra_script)), extra_script)
+
+
+_FragmentPart = Union[str, tuple]
+
+
+class _FragmentRecorder(list):
+    """Collects the URLs and nested nav fragments of a fragment while it's being rendered."""
+
+    def defer(self, part: tuple) -> str:
+        self.append(part)
+        return f'\x00{len(self) - 1}\x00'
+
+
+class NavFragmentCache:
+    """
+    Renders nav items through a template once, and reuses the output for every page.
+
+    This backs the `nav_fragment` filter: `{{ nav_item|nav_fragment('nav-sub.html') }}` renders
+    the same as `{% include 'nav-sub.html' %}` with `nav_item` set, but each item is rendered
+    only once in each of its two states (active or not). Within the output, the URLs produced by
+    the `url` filter and nested `nav_fragment` calls are left as placeholders, which are filled in
+    for each page. The fully resolved output of inactive items is reused by all the pages in the
+    same location (usually, at the same depth in the same section), so only the active path is
+    put together again for each page.
+
+    So the template may depend only on the item itself, its `active` flag, the `url` filter, and
+    values that are the same for the whole build (such as `config`), not on the current page.
+    """
+
+    def __init__(self) -> None:
+        # (template, id(item), active) -> (item, parts); the item is kept so that its id isn't reused.
+        self._variants: dict[
+            tuple[str, int, bool], tuple[Page | Section | Link, list[_FragmentPart]]
+        ] = {}
+        # (template, id(item), the page's location) -> output, for inactive items.
+        self._inactive: dict[tuple[str, int, tuple], str] = {}
+        # (template, id(item)) -> the path components of its URLs, see `_location`.
+        self._url_parts: dict[tuple[str, int], list[set[str]]] = {}
+
+    @contextfilter
+    def nav_fragment_filter(
+        self, context: jinja2.runtime.Context, nav_item: Page | Section | Link, template_name: str
+    ) -> Markup:
+        """A Template filter to render a nav item through a template, with caching."""
+        fragment = context.get('_nav_fragment')
+        if isinstance(fragment, _FragmentRecorder):
+            return Markup(fragment.defer(('nav', nav_item, template_name)))
+        return Markup(
+            self._render(context, nav_item, template_name, context['page'], context['base_url'])
+        )
+
+    def _render(
+        self,
+        context: jinja2.runtime.Context,
+        nav_item: Page | Section | Link,
+        template_name: str,
+        page: Page | None,
+        base_url: str,
+    ) -> str:
+        active = bool(nav_item.active)
+        if not active:
+            # An inactive item has no active descendants either, so its output only depends on
+            # where the page is.
+            key = (
+                template_name,
+                id(nav_item),
+                self._location(context, nav_item, template_name, page, base_url),
+            )
+            output = self._inactive.get(key)
+            if output is not None:
+                return output
+
+        parts = self._get_variant(context, nav_item, template_name, active)
+        result = []
+        for part in parts:
+            if isinstance(part, str):
+                result.append(part)
+            elif part[0] == 'url':
+                result.append(normalize_url(part[1], page=page, base=base_url))
+            else:
+                result.append(self._render(context, part[1], part[2], page, base_url))
+        output = ''.join(result)
+        if not active:
+            self._inactive[key] = output
+        return output
+
+    def _location(
+        self,
+        context: jinja2.runtime.Context,
+        nav_item: Page | Section | Link,
+        template_name: str,
+        page: Page | None,
+        base_url: str,
+    ) -> tuple:
+        """
+        Return a key for the page's location that determines the URLs in the item's output.
+
+        Like in `utils.get_relative_url`, a URL relative to the page only depends on the depth of
+        the page's directory and on the leading components that it has in common with the URL. So
+        the components from the first one that no URL in the fragment has at that position don't
+        matter, and pages that only differ there share the same output.
+        """
+        if page is None:
+            return (None, base_url)
+        dirname, _, basename = page.url.rpartition('/')
+        parts = _norm_parts(dirname if '.' in basename else page.url)
+        prefix = []
+        for part, url_parts in zip(parts, self._get_url_parts(context, nav_item, template_name)):
+            if part not in url_parts:
+                break
+            prefix.append(part)
+        return len(parts), tuple(prefix)
+
+    def _get_url_parts(
+        self, context: jinja2.runtime.Context, nav_item: Page | Section | Link, template_name: str
+    ) -> list[set[str]]:
+        """For each position, the path components of the relative URLs in the item's inactive output."""
+        key = (template_name, id(nav_item))
+        try:
+            return self._url_parts[key]
+        except KeyError:
+            pass
+        result: list[set[str]] = []
+        for part in self._get_variant(context, nav_item, template_name, False):
+            if isinstance(part, str):
+                continue
+            if part[0] == 'url':
+                path, relative_level = _get_norm_url(part[1])
+                if relative_level == -1:
+                    continue
+                url_parts = [{p} for p in _norm_parts(path)]
+            else:
+                url_parts = self._get_url_parts(context, part[1], part[2])
+            for i, parts in enumerate(url_parts):
+                if i == len(result):
+                    result.append(set())
+                result[i].update(parts)
+        self._url_parts[key] = result
+        return result
+
+    def _get_variant(
+        self,
+        context: jinja2.runtime.Context,
+        nav_item: Page | Section | Link,
+        template_name: str,
+        active: bool,
+    ) -> list[_FragmentPart]:
+        key = (template_name, id(nav_item), active)
+        try:
+            return self._variants[key][1]
+        except KeyError:
+            pass
+        fragment = _FragmentRecorder()
+        template = context.environment.get_template(template_name)
+        output = template.render(context.get_all(), nav_item=nav_item, _nav_fragment=fragment)
+        pieces = output.split('\x00')
+        parts: list[_FragmentPart] = [
+            fragment[int(piece)] if i % 2 else piece for i, piece in enumerate(pieces)
+        ]
+        self._variants[key] = (nav_item, parts)
+        return parts